@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""Bitset availability index: who is free and qualified for a shift?
+
+Per operator the index holds
+  * booked time as one bit per 15-minute slot over the horizon (a year is
+    548 uint64 words per operator),
+  * blackout dates as one bit per day,
+  * skills as a bitmask (bit = SkillDefinition row) plus a level per skill.
+
+A query builds a word mask for the shift's slot range and tests every
+operator at once: `(booked[:, words] & mask).any(axis=1)`, likewise for the
+days it spans, and `(skills & required) == required`, so a query touches a
+few columns of the arrays instead of each operator's bookings.
+"""
+
+import argparse
+import html
+import os
+import time
+
+import numpy as np
+
+from page_helpers import clock, column, write_page
+from page_template import CompiledTemplate, Repeat
+
+SLOT_SECONDS = 15 * 60
+DAY = 86400
+ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _low_bits(n):
+    """uint64 array with the low n bits set (n in 0..64)"""
+    n = np.asarray(n, dtype=np.uint64)
+    return np.where(n >= 64, ALL_BITS, (np.uint64(1) << np.minimum(n, 63)) - np.uint64(1))
+
+
+def set_ranges(bits, rows, starts, stops):
+    """OR bit ranges [start, stop) into rows of a (rows, words) uint64 array, vectorized"""
+    rows, starts, stops = (np.asarray(v, dtype=np.int64) for v in (rows, starts, stops))
+    keep = stops > starts
+    rows, starts, stops = rows[keep], starts[keep], stops[keep]
+    if not len(rows):
+        return
+    first, last = starts >> 6, (stops - 1) >> 6
+    spans = last - first + 1
+    entry = np.repeat(np.arange(len(rows)), spans)
+    word = first[entry] + np.arange(len(entry)) - np.repeat(np.cumsum(spans) - spans, spans)
+    lo = np.maximum(starts[entry], word << 6) - (word << 6)
+    hi = np.minimum(stops[entry], (word + 1) << 6) - (word << 6)
+    np.bitwise_or.at(bits, (rows[entry], word), _low_bits(hi) & ~_low_bits(lo))
+
+
+def range_mask(start, stop):
+    """(first word, uint64 masks) covering bits [start, stop)"""
+    first, last = start >> 6, (stop - 1) >> 6
+    masks = np.full(last - first + 1, ALL_BITS)
+    masks[0] &= ~_low_bits(start & 63)
+    masks[-1] &= _low_bits(((stop - 1) & 63) + 1)
+    return first, masks
+
+
+def any_in_range(bits, start, stop):
+    """Per row: is any bit in [start, stop) set?"""
+    if stop <= start:
+        return np.zeros(len(bits), dtype=bool)
+    first, masks = range_mask(start, stop)
+    return (bits[:, first:first + len(masks)] & masks).any(axis=1)
+
+
+class AvailabilityIndex:
+    def __init__(self, operators, origin, days=366, skills=64):
+        if skills > 64:
+            raise ValueError("skill bitmasks hold at most 64 skills")
+        self.origin = origin - origin % DAY
+        self.days = days
+        self.slots = days * DAY // SLOT_SECONDS
+        self.booked = np.zeros((operators, -(-self.slots // 64)), dtype=np.uint64)
+        self.blackout = np.zeros((operators, -(-days // 64)), dtype=np.uint64)
+        self.skills = np.zeros(operators, dtype=np.uint64)
+        self.levels = np.zeros((operators, skills), dtype=np.uint8)
+        self.active = np.ones(operators, dtype=bool)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _slots(self, starts, ends):
+        starts = (np.asarray(starts, dtype=np.int64) - self.origin) // SLOT_SECONDS
+        stops = -(-(np.asarray(ends, dtype=np.int64) - self.origin) // SLOT_SECONDS)
+        if starts.size and (starts.min() < 0 or stops.max() > self.slots):
+            raise ValueError("time outside the index horizon")
+        return starts, stops
+
+    def _days(self, starts, ends):
+        """Days touched by [start, end) (end exclusive)"""
+        first = (np.asarray(starts, dtype=np.int64) - self.origin) // DAY
+        last = (np.asarray(ends, dtype=np.int64) - 1 - self.origin) // DAY + 1
+        return np.clip(first, 0, self.days), np.clip(last, 0, self.days)
+
+    def book(self, operators, starts, ends):
+        """Mark [start, end) as booked for each operator (arrays or scalars)"""
+        operators, starts, ends = np.broadcast_arrays(operators, starts, ends)
+        first, stop = self._slots(starts, ends)
+        set_ranges(self.booked, operators, first, stop)
+
+    def release(self, operator, start, end):
+        """Clear booked slots; overlapping bookings of the same operator must be re-booked"""
+        first, stop = self._slots(start, end)
+        word, masks = range_mask(int(first), int(stop))
+        self.booked[operator, word:word + len(masks)] &= ~masks
+
+    def block_days(self, operators, starts, ends):
+        """Black out whole days from `starts` through `ends` (dates, end inclusive)"""
+        operators, starts, ends = np.broadcast_arrays(operators, starts, ends)
+        first, _ = self._days(starts, starts + 1)
+        _, stop = self._days(ends, np.asarray(ends, dtype=np.int64) + 1)
+        set_ranges(self.blackout, operators, first, stop)
+
+    def add_skills(self, operators, skills, levels):
+        operators = np.asarray(operators, dtype=np.int64)
+        skills = np.asarray(skills, dtype=np.int64)
+        np.bitwise_or.at(self.skills, operators, np.uint64(1) << skills.astype(np.uint64))
+        self.levels[operators, skills] = levels
+
+    def skill_mask(self, skills):
+        mask = 0
+        for skill in skills:
+            mask |= 1 << skill
+        return np.uint64(mask)
+
+    def query(self, start, end, skills=(), min_level=0):
+        """Boolean masks over all operators: (free, qualified, booked, blacked_out)"""
+        first, stop = self._slots(start, end)
+        booked = any_in_range(self.booked, int(first), int(stop))
+        day, last = self._days(start, end)
+        blacked_out = any_in_range(self.blackout, int(day), int(last))
+        required = self.skill_mask(skills)
+        qualified = ((self.skills & required) == required) & self.active
+        if min_level and skills:
+            qualified &= (self.levels[:, list(skills)] >= min_level).all(axis=1)
+        return qualified & ~booked & ~blacked_out, qualified, booked, blacked_out
+
+    def free(self, start, end, skills=(), min_level=0):
+        """Indexes of operators free and qualified for [start, end)"""
+        return np.nonzero(self.query(start, end, skills, min_level)[0])[0]
+
+    def nbytes(self):
+        return self.booked.nbytes + self.blackout.nbytes + self.skills.nbytes + self.levels.nbytes
+
+
+def from_dataset(ds, days=366, booked=True):
+    """Build the index from fixture operators, skills, blackout dates and (if `booked`) assignments
+
+    The horizon is stretched past `days` when shifts run later than that.
+    """
+    from fixtures import SEASON_START
+
+    operators = ds.table("Operator")
+    shifts = ds.table("Shift")
+    starts, ends = column(shifts, "startTime"), column(shifts, "endTime")
+    if len(ends):
+        days = max(days, -(-(int(ends.max()) - (SEASON_START - SEASON_START % DAY)) // DAY))
+    index = AvailabilityIndex(len(operators), SEASON_START, days, skills=max(1, ds.count("SkillDefinition")))
+    inactive = ds.enums["OperatorStatus"].index("INACTIVE")
+    index.active = np.frombuffer(operators.column("status"), dtype=np.int16) != inactive
+
+    skills = ds.table("OperatorSkill")
+    index.add_skills(column(skills, "operatorId"), column(skills, "skillDefinitionId"),
+                     column(skills, "skillLevel"))
+
+    blackouts = ds.table("OperatorBlackoutDate")
+    index.block_days(column(blackouts, "operatorId"), column(blackouts, "startDate"), column(blackouts, "endDate"))
+    if not booked:
+        return index
+
+    assignments = ds.table("ShiftAssignment")
+    cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    live = np.frombuffer(assignments.column("status"), dtype=np.int16) != cancelled
+    shift_ids = column(assignments, "shiftId")[live]
+    index.book(column(assignments, "operatorId")[live], starts[shift_ids], ends[shift_ids])
+    return index
+
+
+def shift_crew(ds, shift):
+    """{operator: note} for the shift's live (not cancelled) assignments, for render_assignment"""
+    assignments = ds.table("ShiftAssignment")
+    cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    live = np.frombuffer(assignments.column("status"), dtype=np.int16) != cancelled
+    crew = {}
+    for row in np.nonzero(live & (column(assignments, "shiftId") == shift))[0].tolist():
+        a = assignments[row]
+        crew.setdefault(a.operatorId, f"{a.status.title()} as {a.role.title()}")
+    return crew
+
+
+ASSIGN_PAGE = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Assign Operators</h2>
+            <p class="text-gray-600 mt-1">{shift_name} • {when}</p>
+            <p class="text-sm text-gray-500">{event_name} • {venue}</p>
+        </div>
+
+        <div class="grid grid-cols-3 gap-6">
+            <div class="col-span-2">
+                <div class="bg-white rounded-lg shadow">
+                    <div class="p-6 border-b border-gray-200">
+                        <div class="flex justify-between items-center">
+                            <h3 class="text-lg font-semibold text-gray-900">Available Operators</h3>
+                            <input type="text" placeholder="Search operators..." class="px-4 py-2 border border-gray-300 rounded-lg text-sm">
+                        </div>
+                        <div class="flex space-x-2 mt-4">{filters}
+                        </div>
+                    </div>
+
+                    <div class="divide-y divide-gray-200">{rows}
+                        <div class="p-4 text-center text-sm text-gray-500">
+                            Showing {shown} of {total} operators
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="space-y-6">
+                <div class="bg-white rounded-lg shadow p-6">
+                    <h3 class="text-sm font-semibold text-gray-900 mb-4">Shift Summary</h3>
+                    <dl class="space-y-3">
+                        <div>
+                            <dt class="text-xs text-gray-500">Assigned</dt>
+                            <dd class="text-sm font-medium text-gray-900 mt-1">{assigned}</dd>
+                        </div>
+                        <div>
+                            <dt class="text-xs text-gray-500">Free and qualified</dt>
+                            <dd class="text-sm font-medium text-gray-900 mt-1">{free}</dd>
+                        </div>
+                        <div>
+                            <dt class="text-xs text-gray-500">Booked elsewhere</dt>
+                            <dd class="text-sm font-medium text-gray-900 mt-1">{busy}</dd>
+                        </div>
+                        <div>
+                            <dt class="text-xs text-gray-500">Blacked out</dt>
+                            <dd class="text-sm font-medium text-gray-900 mt-1">{blackout}</dd>
+                        </div>
+                        <div>
+                            <dt class="text-xs text-gray-500">Query time</dt>
+                            <dd class="text-sm font-medium text-gray-900 mt-1">{elapsed}</dd>
+                        </div>
+                    </dl>
+                </div>
+
+                <div class="flex flex-col space-y-2">
+                    <button class="w-full px-4 py-2 bg-purple-600 text-white rounded-lg hover:bg-purple-700">Done</button>
+                    <button class="w-full px-4 py-2 border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-50">Cancel</button>
+                </div>
+            </div>
+        </div>
+''')
+OPERATOR_ROW = CompiledTemplate('''
+                        <div class="p-4 {row}">
+                            <div class="flex items-center justify-between">
+                                <div class="flex items-center space-x-4">
+                                    <div class="w-12 h-12 {avatar} rounded-full flex items-center justify-center font-semibold">{initials}</div>
+                                    <div>
+                                        <div class="font-semibold {name_tone}">{name}</div>
+                                        <div class="text-sm text-gray-600">{role} • ${rate}/hr</div>
+                                        <div class="flex items-center space-x-2 mt-1">{badges}
+                                        </div>{note}
+                                    </div>
+                                </div>
+                                <div class="text-right">
+                                    {button}
+                                </div>
+                            </div>
+                        </div>
+''')
+BADGE_STYLES = ["bg-blue-100 text-blue-700", "bg-green-100 text-green-700", "bg-purple-100 text-purple-700"]
+AVATARS = ["bg-purple-200 text-purple-700", "bg-pink-200 text-pink-700", "bg-blue-200 text-blue-700"]
+ASSIGN = (b'<button class="px-4 py-2 bg-purple-600 text-white rounded-lg text-sm hover:bg-purple-700">+ Assign</button>\n'
+          b'                                    <div class="text-xs text-green-600 mt-1">\xe2\x9c\x93 Available</div>')
+ASSIGN_ANYWAY = b'<button class="px-4 py-2 bg-yellow-600 text-white rounded-lg text-sm hover:bg-yellow-700">Assign Anyway</button>'
+REMOVE = b'<button class="px-4 py-2 border border-gray-300 text-gray-700 rounded-lg text-sm hover:bg-gray-50">Remove</button>'
+UNAVAILABLE = (b'<button class="px-4 py-2 bg-gray-300 text-gray-600 rounded-lg text-sm cursor-not-allowed" '
+               b'disabled>Unavailable</button>')
+
+
+def render_assignment(ds, index, shift, path, skills=(), limit=25, flagged=5, assigned=None):
+    """06-shift-assignment for one shift: free operators first, then booked, then blacked out
+
+    Lists up to `limit` free operators and `flagged` of each unavailable kind. `assigned` maps
+    operators already on the shift to a note; they are listed first (and are booked in `index`).
+    """
+    record = ds.table("Shift")[shift]
+    event = ds.table("Event")[record.eventId]
+    start = time.perf_counter()
+    free, qualified, booked, blacked_out = index.query(record.startTime, record.endTime, skills)
+    elapsed = time.perf_counter() - start
+    labels = [d.displayName for d in ds.table("SkillDefinition")]
+    operators = ds.table("Operator")
+
+    assigned = assigned or {}
+    on_shift = np.zeros(len(index), dtype=bool)
+    on_shift[list(assigned)] = True
+
+    def ranked(mask):
+        rows = np.nonzero(mask & ~on_shift)[0]
+        # Strongest in the required skills first (all skills when none are required)
+        columns = list(skills) or slice(None)
+        score = index.levels[rows][:, columns].astype(np.int32).sum(axis=1)
+        return [int(op) for op in rows[np.argsort(-score, kind="stable")]]
+
+    groups = [("assigned", list(assigned)), ("free", ranked(free)), ("busy", ranked(qualified & booked & ~blacked_out)),
+              ("blackout", ranked(qualified & blacked_out))]
+
+    shown = [(kind, members[:limit if kind == "free" else flagged]) for kind, members in groups]
+
+    def rows():
+        for kind, members in shown:
+            for op in members:
+                person = operators[op]
+                held = [s for s in range(len(labels)) if index.levels[op, s]]
+                held.sort(key=lambda s: (s not in skills, -int(index.levels[op, s])))
+                badges = "".join(
+                    f'\n                                            <span class="text-xs {BADGE_STYLES[n % len(BADGE_STYLES)]} '
+                    f'px-2 py-0.5 rounded">{labels[s]}: {index.levels[op, s]}/10</span>'
+                    for n, s in enumerate(held[:3])
+                )
+                note = ""
+                if kind == "assigned":
+                    note = f'\n                                        <div class="text-xs text-purple-700 mt-2">✓ {html.escape(assigned[op])}</div>'
+                elif kind == "busy":
+                    note = ('\n                                        <div class="text-xs text-yellow-700 mt-2">'
+                            '⚠️ Already booked during this shift</div>')
+                elif kind == "blackout":
+                    note = '\n                                        <div class="text-xs text-red-700 mt-2">🚫 BLACKOUT on this date</div>'
+                yield OPERATOR_ROW.bind(
+                    row={"assigned": "bg-purple-50 border-l-4 border-purple-400", "free": "hover:bg-gray-50 cursor-pointer", "busy": "bg-yellow-50 border-l-4 border-yellow-400",
+                         "blackout": "bg-red-50 opacity-60"}[kind],
+                    avatar="bg-gray-300 text-gray-600" if kind == "blackout" else AVATARS[op % len(AVATARS)],
+                    initials="".join(part[0] for part in person.name.split()[:2]),
+                    name_tone="text-gray-700" if kind == "blackout" else "text-gray-900",
+                    name=html.escape(person.name), role=labels[held[0]] if held else "Operator",
+                    rate=f"{person.hourlyRate // 100}", badges=badges, note=note,
+                    button={"assigned": REMOVE, "free": ASSIGN, "busy": ASSIGN_ANYWAY, "blackout": UNAVAILABLE}[kind],
+                )
+
+    filters = "".join(
+        f'\n                            <button class="px-3 py-1 {"bg-purple-100 text-purple-700 rounded text-sm font-medium" if s in skills else "text-gray-600 hover:bg-gray-100 rounded text-sm"}">'
+        f"{labels[s]}</button>"
+        for s in range(min(len(labels), 4))
+    )
+    total = sum(len(members) for _, members in groups[1:])
+    write_page(path, "Shift Assignment", ASSIGN_PAGE.bind(
+        shift_name=html.escape(record.shiftName),
+        when=f"{clock(record.startTime)} - {clock(record.endTime)}",
+        event_name=html.escape(event.eventName), venue=html.escape(event.venueName),
+        filters=filters, rows=Repeat(rows()), shown=str(sum(len(members) for _, members in shown[1:])), total=str(total),
+        assigned=str(len(assigned)), free=str(len(groups[1][1])), busy=str(len(groups[2][1])),
+        blackout=str(len(groups[3][1])),
+        elapsed=f"{elapsed * 1000:.2f} ms",
+    ))
+    return len(groups[1][1])
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Build the availability index and query it for a shift")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N")
+    parser.add_argument("--shift", type=int, default=0, help="shift to query")
+    parser.add_argument("--skill", action="append", default=[], help="required skill name (repeatable)")
+    parser.add_argument("--queries", type=int, default=1000, help="random shift queries to time")
+    parser.add_argument("--render", metavar="DIR", help="write 06-shift-assignment.html for --shift")
+    args = parser.parse_args(argv)
+
+    ds = Dataset(args.seed, dict(args.count))
+    names = [d.skillName for d in ds.table("SkillDefinition")]
+    try:
+        skills = [names.index(name) for name in args.skill]
+    except ValueError:
+        parser.error(f"unknown skill; choose from {', '.join(names)}")
+    start = time.perf_counter()
+    index = from_dataset(ds)
+    built = time.perf_counter() - start
+    print(f"{len(index)} operators x {index.days} days: built in {built:.2f}s, {index.nbytes() / 2 ** 20:.1f} MB")
+
+    shifts = ds.table("Shift")
+    starts, ends = column(shifts, "startTime"), column(shifts, "endTime")
+    picks = np.random.default_rng(args.seed).integers(0, len(shifts), args.queries)
+    start = time.perf_counter()
+    found = 0
+    for shift in picks.tolist():
+        found += len(index.free(int(starts[shift]), int(ends[shift]), skills))
+    elapsed = time.perf_counter() - start
+    print(f"{args.queries} shift queries in {elapsed * 1000:.0f} ms ({elapsed / args.queries * 1000:.2f} ms each), "
+          f"{found / args.queries:.0f} free operators on average")
+
+    if args.render:
+        path = os.path.join(args.render, "06-shift-assignment.html")
+        # The shift's own crew is booked in the index; list them as assigned, not as clashes
+        free = render_assignment(ds, index, args.shift, path, skills, assigned=shift_crew(ds, args.shift))
+        print(f"Created: {path} ({free} free operators)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Benchmarks for mockup generation and conversion at scale
+
+  run      synthesize 10 / 1k / 100k pages from the seed mockups, time the
+           render, write and (stub) rasterize stages, record peak memory,
+           and save the results as JSON
+  compare  diff two saved runs and flag stages that got slower than a threshold
+  pool     time a str.format serial loop against build_pages(), serial and
+           with --jobs workers; both sides write through the same PageWriter
+           options and extract classes, so only the renderer and the pool differ
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import create_remaining_mockups as gen
+from fragment_store import FragmentStore, load_content
+from precompress import PageWriter
+from rasterize import StubRenderer, png_path_for, rasterize_all
+from tailwind_css import class_attribute_tokens
+
+STAGES = ("render", "write", "rasterize")
+
+
+def load_seeds():
+    """The fragment store's mockups with their content loaded inline"""
+    return [dict(m, content=load_content(m)) for m in FragmentStore(gen.FRAGMENTS_DIR)]
+
+
+def synthesize(count):
+    """Make `count` distinct mockup dicts by cycling the seed mockups"""
+    seeds = load_seeds()
+    variants = []
+    for i in range(count):
+        seed = seeds[i % len(seeds)]
+        variants.append(dict(
+            seed,
+            num=i,
+            filename=f"{i:06d}-{seed['filename']}",
+            title=f"{seed['title']} #{i}",
+        ))
+    return variants
+
+
+def serial_loop(pages, **output):
+    """The original str.format loop, doing the same output work as build_pages"""
+    for mockup in pages:
+        html = gen.base_template.format(title=mockup["title"], content=mockup["content"])
+        with PageWriter(mockup["filename"], **output) as f:
+            f.write(html.encode("utf-8"))
+        class_attribute_tokens(mockup["content"])
+
+
+def pooled(pages, jobs, **output):
+    errors = [error for _, _, error in gen.build_pages(pages, jobs, **output) if error]
+    if errors:
+        raise RuntimeError(f"{len(errors)} pages failed, first: {errors[0]}")
+
+
+def timed(fn, *args, **kwargs):
+    workdir = tempfile.mkdtemp(prefix="mockup-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        return time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def stage_render(pages, workdir):
+    """Render every page to bytes in memory (template CPU cost only)"""
+    template = gen.page_template
+    total = 0
+    for mockup in pages:
+        total += len(template.render(title=mockup["title"], content=mockup["content"]))
+    return total
+
+
+def stage_write(pages, workdir):
+    errors = [error for _, _, error in gen.build_pages(pages) if error]
+    if errors:
+        raise RuntimeError(f"{len(errors)} pages failed, first: {errors[0]}")
+
+
+def stage_rasterize(pages, workdir, viewport=(160, 100)):
+    jobs = [
+        (mockup["filename"], png_path_for(mockup["filename"], ".", "png"))
+        for mockup in pages
+    ]
+    results = asyncio.run(rasterize_all(jobs, StubRenderer(), viewport, concurrency=8))
+    errors = [error for _, _, error in results if error]
+    if errors:
+        raise RuntimeError(f"{len(errors)} pages failed, first: {errors[0]}")
+
+
+def measure(stage, pages, workdir, memory):
+    """(wall seconds, peak traced bytes or None) for one stage run inside workdir"""
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        stage(pages, workdir)
+        elapsed = time.perf_counter() - start
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return elapsed, peak
+    finally:
+        os.chdir(cwd)
+
+
+def run_suite(sizes, memory=True, repeat=1):
+    stages = {"render": stage_render, "write": stage_write, "rasterize": stage_rasterize}
+    results = []
+    for count in sizes:
+        pages = synthesize(count)
+        workdir = tempfile.mkdtemp(prefix="mockup-bench-")
+        try:
+            for name in STAGES:
+                seconds = min(measure(stages[name], pages, workdir, memory=False)[0] for _ in range(repeat))
+                peak = None
+                if memory:
+                    # Separate traced pass: tracemalloc would skew the timing above
+                    if name != "render":
+                        shutil.rmtree(workdir, ignore_errors=True)
+                        os.makedirs(workdir)
+                        if name == "rasterize":
+                            measure(stage_write, pages, workdir, memory=False)
+                    _, peak = measure(stages[name], pages, workdir, memory=True)
+                results.append({
+                    "pages": count,
+                    "stage": name,
+                    "seconds": round(seconds, 6),
+                    "pages_per_sec": round(count / seconds, 1) if seconds else None,
+                    "peak_bytes": peak,
+                })
+                print(f"{count:>8} {name:<10} {seconds:>9.3f}s {count / seconds:>11.0f}/s"
+                      + (f" {peak / (1024 * 1024):>9.1f} MB" if peak is not None else ""))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(base, new, threshold, min_seconds=0.005):
+    """Rows of (pages, stage, base s, new s, ratio, regressed) for stages in both runs
+
+    Stages faster than min_seconds in both runs are never flagged; at that
+    scale the ratio is timer noise.
+    """
+    base_rows = {(r["pages"], r["stage"]): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        old = base_rows.get((r["pages"], r["stage"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        regressed = ratio > 1 + threshold and max(old["seconds"], r["seconds"]) >= min_seconds
+        rows.append((r["pages"], r["stage"], old["seconds"], r["seconds"], ratio, regressed))
+    return rows
+
+
+def cmd_run(args):
+    print(f"{'pages':>8} {'stage':<10} {'time':>10} {'throughput':>12} {'peak mem':>12}")
+    results = run_suite(args.sizes, memory=not args.no_memory, repeat=args.repeat)
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved: {args.output}")
+
+
+def cmd_compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows = compare(base, new, args.threshold, args.min_seconds)
+    print(f"{'pages':>8} {'stage':<10} {'base s':>10} {'new s':>10} {'change':>8}")
+    for count, stage, old, cur, ratio, regressed in rows:
+        flag = "  SLOWER" if regressed else ""
+        print(f"{count:>8} {stage:<10} {old:>10.3f} {cur:>10.3f} {(ratio - 1) * 100:>+7.1f}%{flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        print(f"\n{regressions} stage(s) slower than the {args.threshold:.0%} threshold")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+def cmd_pool(args):
+    output = dict(minify=not args.pretty, sidecars=not args.no_sidecars)
+    print(f"{'pages':>8} {'format s':>10} {'compiled s':>11} {f'jobs={args.jobs} s':>12} {'speedup':>8}")
+    for count in args.pages:
+        pages = synthesize(count)
+        serial = timed(serial_loop, pages, **output)
+        compiled = timed(pooled, pages, 1, **output)
+        parallel = timed(pooled, pages, args.jobs, **output)
+        print(f"{count:>8} {serial:>10.3f} {compiled:>11.3f} {parallel:>12.3f} {serial / parallel:>7.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="time each stage at several page counts and save JSON")
+    run.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    run.add_argument("-o", "--output", default="bench-results.json")
+    run.add_argument("--repeat", type=int, default=3, help="best of N timed passes per stage")
+    run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory passes")
+    run.set_defaults(func=cmd_run)
+
+    cmp = sub.add_parser("compare", help="flag stages slower than --threshold between two runs")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 for 10%%")
+    cmp.add_argument("--min-seconds", type=float, default=0.005, help="ignore stages faster than this in both runs")
+    cmp.set_defaults(func=cmd_compare)
+
+    pool = sub.add_parser("pool", help="serial loop vs process pool")
+    pool.add_argument("--pages", type=int, nargs="+", default=[100, 1000, 5000])
+    pool.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    pool.add_argument("--pretty", action="store_true", help="write unminified pages on both sides")
+    pool.add_argument("--no-sidecars", action="store_true", help="skip .gz/.br sidecars on both sides")
+    pool.set_defaults(func=cmd_pool)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""One build entry point: the mockup pipeline as a dependency graph of tasks
+
+    render -> data:<page> -> search -> css -> rasterize:site -> diff:site ------> bundle
+                                             rasterize:<round> -> diff:<round> --^
+
+render writes the static fragment pages; the data tasks then render the
+fixture-backed ones (conflicts, travel, availability, payroll, packing and
+send lists) from their own modules, and render skips those pages so the two
+never write the same file.
+
+A task names the files and directories it reads. It is skipped when a hash
+of their contents and of its command matches its last successful run and
+its outputs are still there, so an edit reruns only what is downstream of
+it. Ready tasks run in parallel on a thread pool, each script in its own
+process, and the task heading the longest remaining chain (by the last
+run's timings) goes first, so a full rebuild takes about as long as the
+slowest chain rather than the sum of every step. The critical path of the
+run is printed at the end.
+
+Everything is written under build/. Screenshot diffs compare against
+build/baseline, which a baseline:<name> task fills on the first build and
+--accept refreshes.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import bundle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUILD_DIR = "build"
+STATE_NAME = ".build-state.json"
+ROUND_DIRS = ("round-*", "working-versions")
+DEFAULT_SECONDS = 1.0  # assumed duration of a task that has never run, for ordering
+
+RENDER_SOURCES = ("create_remaining_mockups.py", "page_template.py", "precompress.py", "fragment_store.py",
+                  "build_manifest.py", "bundle.py", "profiling.py", "tailwind_css.py", "fragments")
+RASTERIZE_SOURCES = ("convert_all.py", "page_index.py", "rasterize.py", "png_cache.py", "png_io.py", "profiling.py")
+DIFF_SOURCES = ("visual_diff.py", "png_io.py")
+SEARCH_SOURCES = ("search_index.py", "page_index.py", "page_template.py", "precompress.py")
+# The data pages import the page chrome from create_remaining_mockups, so its imports count too
+DATA_SOURCES = tuple(name for name in RENDER_SOURCES if name != "fragments") + (
+    "page_helpers.py", "fixtures.py", os.path.join("..", "..", "schema.prisma"))
+# (task, script, other modules it reads, pages it writes, whether it takes --cache-dir)
+DATA_PAGES = (
+    ("conflicts", "conflicts.py", ("travel_time.py",), ("24-conflict-resolution.html",), True),
+    ("travel", "travel_time.py", (), ("25-travel-time-warnings.html", "19-gig-sheet-travel-itinerary.html"), True),
+    ("availability", "availability.py", (), ("06-shift-assignment.html",), False),
+    ("payroll", "payroll.py", (), ("08-shift-pay-negotiation.html", "payroll-report.html"), False),
+    ("fixtures", "fixtures.py", (), ("17-packing-list.html", "20-send-gig-sheets.html"), False),
+)
+
+
+class TaskFailed(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, name, run, deps=(), inputs=(), outputs=()):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.key = None
+        self.status = None  # ran, skipped, failed or blocked
+        self.start = self.end = None
+        self.output = ""
+
+    @property
+    def seconds(self):
+        return self.end - self.start if self.start is not None and self.end is not None else 0.0
+
+
+def script(name):
+    return os.path.join(HERE, name)
+
+
+def command(*argv, cwd=None):
+    """Task body that runs a script from this directory in its own process"""
+    def run():
+        if cwd:
+            os.makedirs(cwd, exist_ok=True)
+        proc = subprocess.run([sys.executable, *argv], cwd=cwd, capture_output=True, text=True)
+        if proc.returncode:
+            raise TaskFailed(proc.stdout + proc.stderr)
+        return proc.stdout + proc.stderr
+    run.signature = f"{cwd or ''}$ {' '.join(argv)}"
+    return run
+
+
+def steps(*runs):
+    """Task body that runs each of `runs` in turn"""
+    def run():
+        return "".join(step() for step in runs)
+    run.signature = " && ".join(step.signature for step in runs)
+    return run
+
+
+def call(func, *args):
+    """Task body that calls func(*args) on the pool thread"""
+    def run():
+        return func(*args)
+    run.signature = f"{func.__name__}{args!r}"
+    return run
+
+
+def _expand(pattern):
+    if os.path.isdir(pattern):
+        return sorted(p for p in glob.glob(os.path.join(pattern, "**", "*"), recursive=True) if os.path.isfile(p))
+    return sorted(glob.glob(pattern))
+
+
+def task_key(task):
+    """Digest of the task's command and the contents of everything it reads"""
+    h = hashlib.sha256(task.run.signature.encode())
+    for pattern in task.inputs:
+        h.update(b"\0" + pattern.encode())
+        for path in _expand(pattern):
+            with open(path, "rb") as f:
+                h.update(path.encode() + hashlib.file_digest(f, "sha256").digest())
+    return h.hexdigest()
+
+
+def outputs_exist(task):
+    return all(_expand(pattern) for pattern in task.outputs)
+
+
+def seed_baseline(current, baseline):
+    """Copy the current PNGs to the baseline if it is empty (the first build)
+
+    Its own task rather than part of diff, so the diff task's key is taken
+    over a baseline that already exists and a no-op rebuild skips it.
+    """
+    if _expand(baseline):
+        return ""
+    shutil.copytree(current, baseline, dirs_exist_ok=True)
+    return f"Baseline created from {current}\n"
+
+
+def diff(current, baseline, out):
+    """visual_diff current PNGs against the baseline"""
+    return command(script("visual_diff.py"), baseline, current, "-o", out, "-j", "1")()
+
+
+def make_bundle(archive, site, png):
+    files = bundle.collect(site, "site/", exclude=("*.gz", "*.br", ".*"))
+    files.update(bundle.collect(png, "png/"))
+    return f"{archive}: {bundle.update(archive, files)}\n"
+
+
+def plan(args):
+    """Every task of the build, dependencies before dependents"""
+    build = os.path.abspath(args.build_dir)
+    site, png = os.path.join(build, "site"), os.path.join(build, "png")
+    rounds = sorted(d for pattern in ROUND_DIRS for d in glob.glob(os.path.join(HERE, pattern)) if os.path.isdir(d))
+    pages = os.path.join(site, "[0-9]*.html")  # the rendered pages, not the search page
+    search_page = os.path.join(site, "index.html")
+    data_pages = [page for *_, written, _ in DATA_PAGES for page in written]
+    tasks = [
+        Task("render", command(script("create_remaining_mockups.py"), "--no-stylesheet", "--skip", *data_pages,
+                               cwd=site),
+             inputs=[script(name) for name in RENDER_SOURCES], outputs=[pages]),
+    ]
+    for name, source, reads, written, cached in DATA_PAGES:
+        paths = [os.path.join(site, page) for page in written]
+        # One cache per task: concurrent processes must not save the same matrix files
+        extra = ["--cache-dir", os.path.join(build, ".travel-cache", name)] if cached else []
+        tasks.append(Task(
+            f"data:{name}",
+            steps(command(script(source), "--render", site, *extra), command(script("precompress.py"), *paths)),
+            deps=["render"], inputs=[script(n) for n in (source, *reads, *DATA_SOURCES)], outputs=paths,
+        ))
+    data = [task.name for task in tasks if task.name.startswith("data:")]
+    tasks += [
+        # Before css, so the stylesheet covers the search page's classes too
+        Task("search", command(script("search_index.py"), "--index", os.path.join(build, ".search-index"),
+                               "update", "--site", site, "--html", search_page),
+             deps=["render", *data], inputs=[script(name) for name in SEARCH_SOURCES] + [pages] + rounds,
+             outputs=[search_page]),
+        Task("css", command(script("tailwind_css.py"), site, "-o", os.path.join(site, "tailwind.css")),
+             deps=["render", *data, "search"], inputs=[script("tailwind_css.py"), os.path.join(site, "*.html")],
+             outputs=[os.path.join(site, "tailwind.css")]),
+    ]
+    targets = [("site", site, ["css"])] + [(os.path.basename(d), d, []) for d in rounds]
+    for name, source, deps in targets:
+        shots = os.path.join(png, name)
+        baseline = os.path.join(build, "baseline", name)
+        out = os.path.join(build, "diff", name)
+        tasks.append(Task(
+            f"rasterize:{name}",
+            command(script("convert_all.py"), source, "-o", shots, "--renderer", args.renderer,
+                    "--cache-dir", os.path.join(build, ".png-cache")),
+            deps=deps, inputs=[script(n) for n in RASTERIZE_SOURCES] + [os.path.join(source, "*.html"),
+                                                                    os.path.join(source, "*.css")],
+            outputs=[os.path.join(shots, "*.png")],
+        ))
+        tasks.append(Task(
+            f"baseline:{name}", call(seed_baseline, shots, baseline), deps=[f"rasterize:{name}"],
+            outputs=[os.path.join(baseline, "*.png")],
+        ))
+        tasks.append(Task(
+            f"diff:{name}", call(diff, shots, baseline, out), deps=[f"baseline:{name}"],
+            inputs=[script(n) for n in DIFF_SOURCES] + [shots, baseline], outputs=[os.path.join(out, "summary.json")],
+        ))
+    archive = os.path.join(build, "mockups.zip")
+    tasks.append(Task(
+        "bundle", call(make_bundle, archive, site, png), deps=[t.name for t in tasks if t.name.startswith("diff:")],
+        inputs=[script("bundle.py"), os.path.join(site, "*.html"), os.path.join(site, "*.css"), png],
+        outputs=[archive],
+    ))
+    return tasks
+
+
+def select(tasks, targets):
+    """Tasks named (or prefixed "name:") by targets, plus everything they depend on"""
+    if not targets:
+        return tasks
+    by_name = {task.name: task for task in tasks}
+    wanted, stack = set(), [t.name for t in tasks if any(t.name == x or t.name.startswith(x + ":") for x in targets)]
+    if not stack:
+        sys.exit(f"no such task: {' '.join(targets)} (see --list)")
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(by_name[name].deps)
+    return [task for task in tasks if task.name in wanted]
+
+
+def execute(tasks, state, jobs=1, force=False, verbose=False):
+    """Run the graph; returns the tasks that failed"""
+    by_name = {task.name: task for task in tasks}
+    dependents = {task.name: [] for task in tasks}
+    for task in tasks:
+        for dep in task.deps:
+            dependents[dep].append(task.name)
+    remaining = {}
+
+    def chain(name):
+        # Longest remaining chain through this task, by last run's timings
+        if name not in remaining:
+            own = state.get(name, {}).get("seconds", DEFAULT_SECONDS)
+            remaining[name] = own + max((chain(d) for d in dependents[name]), default=0.0)
+        return remaining[name]
+
+    waiting = {task.name: set(task.deps) for task in tasks}
+    ready = [name for name, deps in waiting.items() if not deps]
+    running = {}
+    done = 0
+    width = max(len(name) for name in by_name)
+
+    def finish(task, status, output=""):
+        nonlocal done
+        task.status, task.output = status, output
+        done += 1
+        note = {"ran": f"{task.seconds:6.2f}s", "skipped": "up to date", "failed": f"{task.seconds:6.2f}s FAILED",
+                "blocked": "blocked by a failed dependency"}[status]
+        print(f"[{done:{len(str(len(tasks)))}d}/{len(tasks)}] {task.name:<{width}}  {note}", flush=True)
+        if output and (verbose or status == "failed"):
+            print("".join(f"    {line}\n" for line in output.rstrip().splitlines()), end="", flush=True)
+        for name in dependents[task.name]:
+            waiting[name].discard(task.name)
+            if not waiting[name]:
+                if all(by_name[dep].status in ("ran", "skipped") for dep in by_name[name].deps):
+                    ready.append(name)
+                else:
+                    finish(by_name[name], "blocked")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while ready or running:
+            ready.sort(key=chain)
+            while ready and len(running) < jobs:
+                task = by_name[ready.pop()]
+                task.key = task_key(task)
+                task.start = time.perf_counter()
+                if not force and state.get(task.name, {}).get("key") == task.key and outputs_exist(task):
+                    task.end = task.start
+                    finish(task, "skipped")
+                    continue
+                running[pool.submit(task.run)] = task
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                task.end = time.perf_counter()
+                try:
+                    output = future.result()
+                except TaskFailed as e:
+                    state.pop(task.name, None)
+                    finish(task, "failed", str(e))
+                except Exception as e:
+                    state.pop(task.name, None)
+                    finish(task, "failed", f"{type(e).__name__}: {e}")
+                else:
+                    state[task.name] = {"key": task.key, "seconds": round(task.seconds, 3)}
+                    finish(task, "ran", output)
+    return [task for task in tasks if task.status == "failed"]
+
+
+def critical_path(tasks):
+    """The chain of tasks, each waiting on the last to finish, that ended the build"""
+    by_name = {task.name: task for task in tasks}
+    timed = [task for task in tasks if task.end is not None]
+    if not timed:
+        return []
+    path = [max(timed, key=lambda task: task.end)]
+    while path[-1].deps:
+        path.append(max((by_name[dep] for dep in path[-1].deps), key=lambda task: task.end))
+    return path[::-1]
+
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build pages, CSS, screenshots, diffs and the bundle as one task graph")
+    parser.add_argument("targets", nargs="*", help="tasks to build with their dependencies, e.g. css or rasterize")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="tasks run at once")
+    parser.add_argument("--build-dir", default=os.path.join(HERE, BUILD_DIR))
+    parser.add_argument("--renderer", default="playwright", help="screenshot renderer (stub works offline)")
+    parser.add_argument("--force", action="store_true", help="run every task even if its inputs are unchanged")
+    parser.add_argument("--accept", action="store_true", help="make this build's screenshots the diff baseline")
+    parser.add_argument("--list", action="store_true", help="print the task graph and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every task's output")
+    args = parser.parse_args(argv)
+
+    tasks = select(plan(args), args.targets)
+    if args.list:
+        for task in tasks:
+            print(f"{task.name}{'  <- ' + ', '.join(task.deps) if task.deps else ''}")
+        return
+
+    state_path = os.path.join(os.path.abspath(args.build_dir), STATE_NAME)
+    state = load_state(state_path)
+    start = time.perf_counter()
+    try:
+        failed = execute(tasks, state, max(1, args.jobs), args.force, args.verbose)
+    finally:
+        save_state(state_path, state)
+    wall = time.perf_counter() - start
+
+    if all(task.status == "skipped" for task in tasks):
+        print(f"\nAll {len(tasks)} tasks up to date")
+    else:
+        path = critical_path(tasks)
+        busy = sum(task.seconds for task in tasks)
+        print(f"\nCritical path ({sum(task.seconds for task in path):.2f}s of {wall:.2f}s wall, "
+              f"{busy:.2f}s of task time):")
+        print("  " + " -> ".join(f"{task.name} ({task.seconds:.2f}s)" if task.status != "skipped"
+                                 else f"{task.name} (up to date)" for task in path))
+
+    if args.accept and not failed:
+        png = os.path.join(os.path.abspath(args.build_dir), "png")
+        baseline = os.path.join(os.path.abspath(args.build_dir), "baseline")
+        shutil.rmtree(baseline, ignore_errors=True)
+        shutil.copytree(png, baseline)
+        print(f"Accepted: {png} is the new baseline")
+    if failed:
+        sys.exit(f"{len(failed)} tasks failed: {', '.join(task.name for task in failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Persistent build manifest so unchanged mockups are never rewritten"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(*parts):
+    """Hash str/bytes parts; each part is length-prefixed so boundaries count"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """Maps output path -> input digest plus the size/mtime it was written with.
+
+    An output is current when its recorded digest matches and the file on disk
+    still has the size and mtime we left it with, so a no-op build is one
+    stat() per page and never touches the files themselves.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def _output_unchanged(self, output_path, entry):
+        try:
+            st = os.stat(output_path)
+        except OSError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+
+    def is_current(self, output_path, digest):
+        entry = self.entries.get(output_path)
+        if entry is None or entry["digest"] != digest:
+            return False
+        return self._output_unchanged(output_path, entry)
+
+    def source_is_current(self, output_path, source):
+        """Like is_current, but by a stat signature of the inputs so they need not be read"""
+        entry = self.entries.get(output_path)
+        if entry is None or source is None or entry.get("source") != source:
+            return False
+        return self._output_unchanged(output_path, entry)
+
+    def output_digest(self, output_path):
+        """SHA-256 of the bytes last written to output_path, if the file is still as we left it"""
+        entry = self.entries.get(output_path)
+        if entry is None or not self._output_unchanged(output_path, entry):
+            return None
+        return entry.get("output")
+
+    def update_source(self, output_path, source):
+        self.entries[output_path]["source"] = source
+        self.dirty = True
+
+    def record(self, output_path, digest, **extra):
+        """Record a freshly written output; extra keys (e.g. source) are stored with it"""
+        st = os.stat(output_path)
+        self.entries[output_path] = dict(
+            extra,
+            digest=digest,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+        )
+        self.dirty = True
+
+    def prune(self, keep):
+        """Forget outputs that are no longer produced by the build"""
+        keep = set(keep)
+        for output_path in list(self.entries):
+            if output_path not in keep:
+                del self.entries[output_path]
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Incremental zip bundles: recompress only the members that changed
+
+update() brings an archive in line with a set of files without rebuilding
+it. Each member's SHA-256, and the mtime it was hashed at, is kept in its
+central-directory comment, so unchanged files are recognised by a stat and
+never re-read; members of archives that were zipped by hand are matched by
+CRC-32 and size instead. Unchanged members keep their compressed bytes.
+
+The archive is edited in place. Everything before the first changed or
+removed member stays where it is on disk, unchanged members after it are
+moved down as raw bytes, and only new or changed files are compressed,
+streamed from disk in blocks and appended at the end. A one-page edit costs
+one page's compression, and pages that change often settle at the end,
+where there is nothing left to move. If an update is interrupted the next
+run finds the archive unreadable and rebuilds it from scratch.
+
+    python bundle.py round-4-complete-suite.zip round-4-complete-suite --prefix round-4-complete-suite/
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+
+CHUNK = 1 << 20
+SPOOL = 8 << 20  # moved members beyond this are staged in a temp file, not memory
+LEVEL = 9
+
+
+class Stats:
+    __slots__ = ("added", "replaced", "removed", "kept", "moved", "moved_bytes")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def __str__(self):
+        return (f"{self.added} added, {self.replaced} replaced, {self.removed} removed, {self.kept} unchanged "
+                f"({self.moved} moved, {self.moved_bytes / 1024:,.1f} KB)")
+
+
+def file_digest(path):
+    """(sha256 hex, crc32) of a file, read in blocks"""
+    h = hashlib.sha256()
+    crc = 0
+    with open(path, "rb") as f:
+        while block := f.read(CHUNK):
+            h.update(block)
+            crc = zlib.crc32(block, crc)
+    return h.hexdigest(), crc
+
+
+def _stamp(digest, st):
+    return f"sha256={digest} mtime_ns={st.st_mtime_ns}".encode()
+
+
+def _parse_stamp(comment):
+    fields = dict(field.split("=", 1) for field in comment.decode("ascii", "replace").split() if "=" in field)
+    mtime = fields.get("mtime_ns")
+    return fields.get("sha256"), int(mtime) if mtime and mtime.isdigit() else None
+
+
+def _copy(src, dst, length):
+    while length:
+        block = src.read(min(CHUNK, length))
+        if not block:
+            raise zipfile.BadZipFile("member data is truncated")
+        dst.write(block)
+        length -= len(block)
+
+
+def _open(archive, level):
+    try:
+        return zipfile.ZipFile(archive, "a", zipfile.ZIP_DEFLATED, compresslevel=level)
+    except zipfile.BadZipFile:
+        return zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=level)
+
+
+def update(archive, files, level=LEVEL):
+    """Make `archive` hold exactly `files` ({member name: path}) plus its directory entries"""
+    stats = Stats()
+    with _open(archive, level) as zf:
+        keep, write = {}, []
+        for name, path in files.items():
+            st = os.stat(path)
+            info = zf.NameToInfo.get(name)
+            digest, mtime = _parse_stamp(info.comment) if info is not None else (None, None)
+            if info is not None and info.file_size == st.st_size and mtime == st.st_mtime_ns:
+                keep[name] = info.comment
+                continue
+            sha, crc = file_digest(path)
+            if info is not None and info.file_size == st.st_size and (digest == sha if digest else info.CRC == crc):
+                keep[name] = _stamp(sha, st)
+            else:
+                write.append((name, path, _stamp(sha, st)))
+        stats.kept = len(keep)
+        for info in zf.infolist():
+            if info.is_dir():
+                keep[info.filename] = info.comment
+        rewrite = {name for name, _, _ in write}
+        stats.replaced = len(rewrite.intersection(zf.NameToInfo))
+        stats.added = len(write) - stats.replaced
+        stats.removed = len(zf.NameToInfo) - len(keep) - stats.replaced
+        restamped = any(zf.NameToInfo[name].comment != comment for name, comment in keep.items())
+        if not write and not stats.removed and not restamped:
+            return stats
+
+        # Records are contiguous, so each one runs up to the next one (or the central directory)
+        infos = sorted(zf.infolist(), key=lambda i: i.header_offset)
+        ends = [info.header_offset for info in infos[1:]] + [zf.start_dir]
+        spans = {info.filename: (info.header_offset, end) for info, end in zip(infos, ends)}
+        cut = min((info.header_offset for info in infos if info.filename not in keep), default=zf.start_dir)
+        moved = [info for info in infos if info.header_offset >= cut and info.filename in keep]
+
+        fp = zf.fp
+        with tempfile.SpooledTemporaryFile(SPOOL) as spool:
+            for info in moved:
+                start, end = spans[info.filename]
+                fp.seek(start)
+                _copy(fp, spool, end - start)
+            fp.seek(cut)
+            fp.truncate()
+            spool.seek(0)
+            for info in moved:
+                start, end = spans[info.filename]
+                info.header_offset = fp.tell()
+                _copy(spool, fp, end - start)
+                stats.moved_bytes += end - start
+        stats.moved = len(moved)
+
+        # zipfile writes new members and then the central directory at start_dir
+        zf.filelist = [info for info in zf.filelist if info.filename in keep]
+        zf.NameToInfo = {info.filename: info for info in zf.filelist}
+        for info in zf.filelist:
+            info.comment = keep[info.filename]
+        zf.start_dir = fp.tell()
+        zf._didModify = True
+        for name, path, comment in write:
+            zf.write(path, name)  # streams the file through the compressor in blocks
+            zf.NameToInfo[name].comment = comment
+        zf.filelist.sort(key=lambda info: info.filename)
+    return stats
+
+
+def collect(root, prefix="", exclude=()):
+    """{member name: path} for every file under root, skipping `exclude` glob patterns"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            if not any(fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(filename, pattern) for pattern in exclude):
+                files[prefix + rel] = path
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update a zip bundle in place from a directory")
+    parser.add_argument("archive")
+    parser.add_argument("root", help="directory to bundle")
+    parser.add_argument("--prefix", default="", help="prepended to every member name, e.g. round-4-complete-suite/")
+    parser.add_argument("--exclude", action="append", default=["*.gz", "*.br", "*.zip", "*.tar.gz"],
+                        metavar="GLOB", help="skip matching files (sidecars and archives are skipped by default)")
+    parser.add_argument("--level", type=int, default=LEVEL, help="deflate level for new or changed members")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    files = collect(args.root, args.prefix, args.exclude)
+    archive = os.path.abspath(args.archive)
+    files = {name: path for name, path in files.items() if os.path.abspath(path) != archive}
+    stats = update(args.archive, files, args.level)
+    print(f"{args.archive}: {stats} in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
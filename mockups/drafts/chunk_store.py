@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Content-addressed store of mockup pages split into content-defined chunks
+
+Pages are cut into chunks where a rolling gear hash of the last 64 bytes
+hits a pattern, so a boundary depends only on nearby content: the nav and
+head chrome shared by every page, or a card copied from one round to the
+next, come out as the same chunks wherever they sit in the file and are
+stored once. The store is three files:
+
+  chunks.pack   every distinct chunk, zlib-compressed on its own and appended
+  chunks.idx    one fixed-size (digest, offset, stored length, raw length)
+                record per chunk
+  pages.jsonl   one {"path", "size", "sha256", "chunks"} recipe per line;
+                the last line for a path wins
+
+Pages are rebuilt by slicing a memory map of the pack and inflating just the
+chunks they use. Every file is append-only, so an interrupted import leaves
+at most a torn tail, which the next open trims.
+
+The rounds stay committed: git's packfiles already delta-compress them to
+about the size of this store, so it does not shrink the repository. What it
+saves is the working tree. Import once, and a clone that only needs some of
+the rounds can leave the rest out (a sparse checkout) and rebuild any of
+them with `checkout` in milliseconds.
+
+  python chunk_store.py import               # the round directories and working-versions
+  python chunk_store.py checkout round-4-complete-suite /tmp/round-4
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+STORE_DIR = ".chunk-store"
+ROUNDS = ("round-*", "working-versions")
+IMPORT_PATTERNS = ("*.html", "*.css", "*.js", "*.md")
+MIN_CHUNK = 128
+AVG_BITS = 9  # ~512 B average: small enough to isolate shared nav, head and card blocks
+MAX_CHUNK = 8192
+WINDOW = 64
+RECORD = struct.Struct("<16sQII")
+LEVEL = 9  # zlib level; chunks are written once and read many times
+FORMAT = "2"  # format 1 stored chunks raw, with no raw length in the index
+
+# Fixed pseudo-random byte -> 64-bit table; changing it changes every boundary
+_GEAR = np.random.default_rng(0x6D6F636B7570).integers(0, 2 ** 63, 256, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def gear_hashes(data):
+    """Rolling hash after each byte: sum of gear[b[i - k]] << k over the last WINDOW bytes
+
+    The recurrence h = (h << 1) + gear[b] forgets a byte after 64 shifts, so
+    the same value is the 64-term sum, computed here with WINDOW vector passes.
+    """
+    g = _GEAR[np.frombuffer(data, dtype=np.uint8)]
+    h = g.copy()
+    for k in range(1, min(WINDOW, len(g))):
+        h[k:] += g[:-k] << np.uint64(k)
+    return h
+
+
+def chunk_boundaries(data):
+    """End offsets of the chunks of `data` (the last one is len(data))"""
+    size = len(data)
+    if size <= MIN_CHUNK:
+        return [size] if size else []
+    candidates = np.flatnonzero((gear_hashes(data) >> np.uint64(64 - AVG_BITS)) == 0) + 1
+    cuts, start = [], 0
+    for cut in candidates.tolist():
+        while cut - start > MAX_CHUNK:
+            start += MAX_CHUNK
+            cuts.append(start)
+        if cut - start >= MIN_CHUNK:
+            cuts.append(cut)
+            start = cut
+    while size - start > MAX_CHUNK:
+        start += MAX_CHUNK
+        cuts.append(start)
+    if start < size:
+        cuts.append(size)
+    return cuts
+
+
+class ChunkStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.pack_path = os.path.join(root, "chunks.pack")
+        self.idx_path = os.path.join(root, "chunks.idx")
+        self.pages_path = os.path.join(root, "pages.jsonl")
+        self._check_format()
+        self.digests = {}
+        self.spans = []  # chunk number -> (offset, stored length)
+        self.sizes = []  # chunk number -> raw length
+        with open(self.idx_path, "ab+") as f:
+            f.seek(0)
+            data = f.read()
+        count = len(data) // RECORD.size
+        for n, (digest, offset, length, size) in enumerate(RECORD.iter_unpack(data[:count * RECORD.size])):
+            self.digests[digest] = n
+            self.spans.append((offset, length))
+            self.sizes.append(size)
+        self.pack_size = self.spans[-1][0] + self.spans[-1][1] if self.spans else 0
+        # Drop anything past the last complete line or record: an import interrupted mid-write.
+        # Chunks are written before the recipes that use them, so every complete recipe survives.
+        with open(self.pages_path, "ab+") as f:
+            f.seek(0)
+            lines = f.read()
+        kept = lines.rfind(b"\n") + 1
+        for path, size in ((self.idx_path, count * RECORD.size), (self.pack_path, self.pack_size),
+                           (self.pages_path, kept)):
+            with open(path, "ab+") as f:
+                f.truncate(size)
+        self.pages = {}
+        for line in lines[:kept].splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                self.pages[entry["path"]] = entry
+        self._map = None
+
+    def _check_format(self):
+        """Stamp a new store with FORMAT; refuse one written in another format"""
+        path = os.path.join(self.root, "FORMAT")
+        try:
+            with open(path, encoding="utf-8") as f:
+                found = f.read().strip()
+        except OSError:
+            found = "1" if os.path.exists(self.idx_path) and os.path.getsize(self.idx_path) else None
+        if found is None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(FORMAT + "\n")
+        elif found != FORMAT:
+            raise ValueError(f"{self.root} is chunk store format {found}, not {FORMAT}: delete it and import again")
+
+    def _pack(self):
+        """Read-only map of the pack, remapped when it has grown"""
+        if self._map is None or len(self._map) < self.pack_size:
+            # The old map is only dropped, not closed: pages being read may still hold views of it
+            with open(self.pack_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.pack_size else b""
+        return self._map
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put(self, path, data):
+        """Store `data` as page `path`; returns the compressed bytes of new chunks it added"""
+        digest = hashlib.sha256(data).hexdigest()
+        current = self.pages.get(path)
+        if current is not None and current["sha256"] == digest:
+            return 0
+        chunks, records, new, start = [], [], [], 0
+        for end in chunk_boundaries(data):
+            piece = data[start:end]
+            key = hashlib.blake2b(piece, digest_size=16).digest()
+            n = self.digests.get(key)
+            if n is None:
+                packed = zlib.compress(piece, LEVEL)
+                n = self.digests[key] = len(self.spans)
+                self.spans.append((self.pack_size, len(packed)))
+                self.sizes.append(len(piece))
+                records.append(RECORD.pack(key, self.pack_size, len(packed), len(piece)))
+                new.append(packed)
+                self.pack_size += len(packed)
+            chunks.append(n)
+            start = end
+        # Chunks before the recipe that uses them, so a crash never leaves a dangling page
+        if new:
+            with open(self.pack_path, "ab") as f:
+                f.writelines(new)
+            with open(self.idx_path, "ab") as f:
+                f.writelines(records)
+        entry = {"path": path, "size": len(data), "sha256": digest, "chunks": chunks}
+        with open(self.pages_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.pages[path] = entry
+        return sum(map(len, new))
+
+    def segments(self, path, inflated=None):
+        """The page's chunks, each inflated from its slice of the mapped pack
+
+        Pass the same `inflated` dict across pages to inflate a shared chunk
+        only once.
+        """
+        pack = memoryview(self._pack())
+        for n in self.pages[path]["chunks"]:
+            piece = inflated.get(n) if inflated is not None else None
+            if piece is None:
+                offset, length = self.spans[n]
+                piece = zlib.decompress(pack[offset:offset + length])
+                if inflated is not None:
+                    inflated[n] = piece
+            yield piece
+
+    def read(self, path, inflated=None):
+        return b"".join(self.segments(path, inflated))
+
+    def checkout(self, prefix, dest):
+        """Rebuild every page under `prefix` into dest; returns (pages, bytes)"""
+        prefix = prefix.rstrip("/") + "/"
+        count = total = 0
+        inflated = {}
+        for path, entry in self.pages.items():
+            if not path.startswith(prefix):
+                continue
+            target = os.path.join(dest, path[len(prefix):])
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            with open(target, "wb") as f:
+                f.writelines(self.segments(path, inflated))
+            count += 1
+            total += entry["size"]
+        return count, total
+
+    def verify(self):
+        """Paths whose rebuilt bytes no longer match their recorded hash"""
+        inflated = {}
+        return [path for path, entry in self.pages.items()
+                if hashlib.sha256(self.read(path, inflated)).hexdigest() != entry["sha256"]]
+
+    def compact(self):
+        """Rewrite pages.jsonl with only the current recipe per path"""
+        tmp = self.pages_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self.pages.values():
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.pages_path)
+
+    def stats(self, prefix=""):
+        """(pages, logical bytes, raw and compressed bytes of the distinct chunks they use, chunks)"""
+        entries = [entry for path, entry in self.pages.items() if path.startswith(prefix)]
+        used = {n for entry in entries for n in entry["chunks"]}
+        return (len(entries), sum(entry["size"] for entry in entries), sum(self.sizes[n] for n in used),
+                sum(self.spans[n][1] for n in used), len(used))
+
+    def footprint(self):
+        return sum(os.path.getsize(p) for p in (self.pack_path, self.idx_path, self.pages_path) if os.path.exists(p))
+
+
+def _report(label, pages, logical, distinct, stored, chunks):
+    # The ratio is against what is actually stored, so it counts compression as well as dedup
+    ratio = logical / stored if stored else 0
+    print(f"{label:<32} {pages:>5} pages {logical / 1024:>9,.1f} KB -> {distinct / 1024:>8,.1f} KB deduped "
+          f"-> {stored / 1024:>7,.1f} KB compressed in {chunks:>5} chunks ({ratio:.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deduplicating chunk store for the mockup rounds")
+    parser.add_argument("--store", default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("import", help="import round directories and report the dedup ratio")
+    p.add_argument("dirs", nargs="*", help=f"directories to import (default: {' '.join(ROUNDS)})")
+    p = sub.add_parser("checkout", help="rebuild a round's pages from the store")
+    p.add_argument("prefix", help="e.g. round-4-complete-suite")
+    p.add_argument("dest")
+    p = sub.add_parser("cat", help="write one page to stdout")
+    p.add_argument("path")
+    sub.add_parser("stats", help="dedup ratio per directory and overall")
+    sub.add_parser("verify", help="rebuild every page and check its hash")
+    args = parser.parse_args(argv)
+
+    try:
+        store = ChunkStore(args.store)
+    except ValueError as e:
+        sys.exit(str(e))
+    with store:
+        if args.command == "import":
+            dirs = args.dirs or sorted(d for pattern in ROUNDS for d in glob.glob(pattern) if os.path.isdir(d))
+            start = time.perf_counter()
+            added = imported = 0
+            for d in dirs:
+                for pattern in IMPORT_PATTERNS:
+                    for path in sorted(glob.glob(os.path.join(d, "**", pattern), recursive=True)):
+                        with open(path, "rb") as f:
+                            added += store.put(os.path.relpath(path).replace(os.sep, "/"), f.read())
+                        imported += 1
+            store.compact()
+            print(f"Imported {imported} files from {len(dirs)} directories in {time.perf_counter() - start:.2f}s "
+                  f"({added / 1024:,.1f} KB of new chunks, compressed)")
+            args.command = "stats"
+        if args.command == "stats":
+            for prefix in sorted({path.split("/", 1)[0] for path in store.pages}):
+                _report(prefix, *store.stats(prefix + "/"))
+            _report("all", *store.stats())
+            print(f"Store on disk: {store.footprint() / 1024:,.1f} KB in {args.store}/")
+        elif args.command == "checkout":
+            start = time.perf_counter()
+            count, total = store.checkout(args.prefix, args.dest)
+            if not count:
+                sys.exit(f"nothing stored under {args.prefix}")
+            print(f"Checked out {count} pages ({total / 1024:,.1f} KB) to {args.dest} "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        elif args.command == "cat":
+            if args.path not in store.pages:
+                sys.exit(f"not in store: {args.path}")
+            sys.stdout.buffer.writelines(store.segments(args.path))
+        elif args.command == "verify":
+            bad = store.verify()
+            for path in bad:
+                print(f"Corrupt: {path}")
+            print(f"{len(store.pages) - len(bad)}/{len(store.pages)} pages intact")
+            if bad:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
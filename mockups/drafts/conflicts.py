@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""Scheduling conflict detection for operators, equipment and vehicles
+
+Every resource (an operator, a gear item, a vehicle) has a timeline of
+bookings sorted by start time. A full scan sweeps every timeline at once:
+
+  * overlap - two bookings of the same resource overlap      (IMPOSSIBLE)
+  * travel  - consecutive bookings leave less time than the
+              drive between their venues                     (CAUTION)
+
+The bookings are sorted once into numpy columns by (resource, start), so
+one searchsorted finds every overlapping pair and a scan is O(n log n +
+conflicts) with no Python loop per booking. The engine also keeps its
+conflict set up to date incrementally: moving one shift re-checks only that
+booking and its neighbours on its Timeline (see ConflictEngine.move).
+
+On the 100k-shift fixture season (594k bookings, 260k conflicts) finding the
+conflicts takes about 0.1s; a rescan takes 0.8-1.3s, nearly all of it creating
+(and then garbage-collecting) the 260k Conflict objects, and the first scan
+after load() adds about 0.5s to put the Booking objects into columns. So a
+scan is sub-second while conflicts stay in the tens of thousands; past that
+the cost is per conflict, not per booking. `conflicts.py --count Shift=100000`
+prints these timings.
+
+Drive times come from the travel_time cache: a gap is too short when it is
+below the top of the leg's congestion range at the time the first booking
+ends, the same bound the travel warnings page uses. Booking places are
+location IDs registered there ("venue:<name>"), and a scan looks up every
+candidate leg in one batch.
+"""
+
+import argparse
+import gc
+import html
+import os
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import repeat
+from operator import attrgetter
+
+import numpy as np
+
+from page_helpers import clock, write_page
+from page_template import CompiledTemplate, Repeat
+from travel_time import CACHE_DIR, TravelMatrix, hour_slot, register_venues, venue_id
+
+# Gaps longer than this never need a travel-time lookup
+MAX_TRAVEL = 6 * 3600
+LEVELS = {"overlap": "IMPOSSIBLE", "travel": "CAUTION"}
+
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic collector while building many acyclic objects
+
+    A big season creates hundreds of thousands of keys and Conflicts; without the
+    pause every generation-2 collection walks all the bookings again.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def travel_needed(travel, legs, memo=None):
+    """Seconds to allow for each (from, to) booking pair
+
+    The allowance only depends on the two places and the departure's hour_slot(), so
+    results are kept in `memo` and the misses are looked up in one batch.
+    """
+    memo = {} if memo is None else memo
+    keys = [(a.place, b.place, hour_slot(a.end)) for a, b in legs]
+    missing = {}
+    for (a, b), key in zip(legs, keys):
+        if key in memo:
+            continue
+        if a.place == b.place or a.place is None or b.place is None:
+            memo[key] = 0
+        else:
+            missing.setdefault(key, a.end)
+    if missing:
+        seconds = travel.allowance([key[0] for key in missing], [key[1] for key in missing], list(missing.values()))
+        memo.update(zip(missing, seconds.tolist()))
+    return [memo[key] for key in keys]
+
+
+def _bands(start, end):
+    """(base, width) to fold resource and time into one sortable int64, resource * width + (time - base)"""
+    if not len(start):
+        return 0, 1
+    base = int(start.min())
+    return base, int(max(end.max(), start.max())) - base + 1
+
+
+def _codes(values):
+    """(int64 code per value, distinct values in code order)"""
+    names = list(dict.fromkeys(values))
+    index = {name: i for i, name in enumerate(names)}
+    return np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values)), names
+
+
+class Booking:
+    """One resource held for [start, end) at a place; event/shift point back at the fixtures"""
+
+    __slots__ = ("id", "resource", "start", "end", "place", "event", "shift")
+
+    def __init__(self, id, resource, start, end, place=None, event=None, shift=None):
+        self.id = id
+        self.resource = resource
+        self.start = start
+        self.end = end
+        self.place = place
+        self.event = event
+        self.shift = shift
+
+    def __repr__(self):
+        return f"Booking({self.id!r}, {self.resource!r}, {self.start}, {self.end})"
+
+
+class Conflict:
+    """`a` starts first; seconds is the overlap, or the gap left for a travel conflict"""
+
+    __slots__ = ("kind", "resource", "a", "b", "seconds", "travel")
+
+    def __init__(self, kind, resource, a, b, seconds, travel=0):
+        self.kind = kind
+        self.resource = resource
+        self.a = a
+        self.b = b
+        self.seconds = seconds
+        self.travel = travel
+
+    @property
+    def key(self):
+        return (self.kind, self.a.id, self.b.id)
+
+    @property
+    def level(self):
+        return LEVELS[self.kind]
+
+    def __repr__(self):
+        return f"Conflict({self.kind}, {self.resource!r}, {self.a.id!r}, {self.b.id!r}, {self.seconds})"
+
+
+class Timeline:
+    """Bookings of one resource as parallel lists sorted by (start, id)"""
+
+    __slots__ = ("keys", "ends", "bookings", "longest")
+
+    def __init__(self):
+        self.keys = []
+        self.ends = []
+        self.bookings = []
+        self.longest = 0
+
+    def insert(self, booking):
+        key = (booking.start, booking.id)
+        i = bisect_left(self.keys, key)
+        self.keys.insert(i, key)
+        self.ends.insert(i, booking.end)
+        self.bookings.insert(i, booking)
+        # Only ever grows, which keeps look-back windows correct after removals
+        self.longest = max(self.longest, booking.end - booking.start)
+        return i
+
+    def index(self, booking):
+        return bisect_left(self.keys, (booking.start, booking.id))
+
+    def remove(self, booking):
+        i = self.index(booking)
+        del self.keys[i], self.ends[i], self.bookings[i]
+        return i
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class ConflictEngine:
+    """Conflicts across every timeline; `travel` is a travel_time.TravelMatrix holding the places"""
+
+    def __init__(self, travel=None):
+        self.travel = travel if travel is not None else TravelMatrix()
+        self.bookings = {}
+        self.timelines = {}
+        self.conflicts = {}
+        self._columns = None
+        self._touching = None
+        self._journal = None
+        self._allowances = {}
+
+    def load(self, bookings):
+        """Index many bookings, then find every conflict in one scan"""
+        for booking in bookings:
+            self.bookings[booking.id] = booking
+        self._columns = None
+        # Built from the scan's sort order when the first incremental update needs them
+        self.timelines = None
+        return self.scan()
+
+    def _sorted(self):
+        """Every booking as numpy columns sorted by (resource, start, id); kept until the next change
+
+        Returns (bookings, resources, places, resource, start, end, place): the sorted
+        booking objects, the names behind the integer codes in the resource and place
+        columns, and the columns themselves (place -1 is no place).
+        """
+        if self._columns is not None:
+            return self._columns
+        bookings = list(self.bookings.values())
+        n = len(bookings)
+        resource, resources = _codes(list(map(attrgetter("resource"), bookings)))
+        place, places = _codes(list(map(attrgetter("place"), bookings)))
+        if None in places:
+            place[place == places.index(None)] = -1
+        start = np.fromiter(map(attrgetter("start"), bookings), dtype=np.int64, count=n)
+        end = np.fromiter(map(attrgetter("end"), bookings), dtype=np.int64, count=n)
+        base, width = _bands(start, end)
+        key = resource * width + (start - base)
+        order = np.argsort(key)
+        # Equal (resource, start) runs are put in id order, as Timeline keys are
+        tied = np.diff(key[order]) == 0
+        if tied.any():
+            edges = np.diff(tied.astype(np.int8), prepend=0, append=0)
+            for first, last in zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()):
+                order[first:last + 1] = sorted(order[first:last + 1].tolist(), key=lambda i: bookings[i].id)
+        objects = np.fromiter(bookings, dtype=object, count=n)
+        self._columns = (objects[order], resources, places,
+                         resource[order], start[order], end[order], place[order])
+        return self._columns
+
+    def _lines(self):
+        """Per-resource timelines for incremental updates, cut from the sorted columns"""
+        if self.timelines is None:
+            bookings, resources, _, resource, start, end, _ = self._sorted()
+            self.timelines = {}
+            bounds = [0, *(np.flatnonzero(np.diff(resource)) + 1).tolist(), len(bookings)]
+            for lo, hi in zip(bounds, bounds[1:]):
+                line = self.timelines[resources[resource[lo]]] = Timeline()
+                line.bookings = bookings[lo:hi].tolist()
+                line.keys = list(zip(start[lo:hi].tolist(), (b.id for b in line.bookings)))
+                line.ends = end[lo:hi].tolist()
+                line.longest = int((end[lo:hi] - start[lo:hi]).max())
+        return self.timelines
+
+    def scan(self):
+        """Rebuild the conflict set from scratch; returns it as a list"""
+        conflicts = self.conflicts = {}
+        # Only incremental updates need the booking -> conflicts index; it is rebuilt on first use
+        self._touching = None
+        bookings, _, places, resource, start, end, place = self._sorted()
+        n = len(bookings)
+        if n < 2:
+            return []
+        # One searchsorted over every start finds, for each booking, the first one of its
+        # resource starting at or after its end
+        base, width = _bands(start, end)
+        reach = np.searchsorted(resource * width + (start - base), resource * width + (end - base))
+        counts = np.maximum(reach - np.arange(1, n + 1), 0)
+        with gc_paused():
+            if counts.any():
+                # Booking j overlaps exactly the next counts[j] bookings of its timeline
+                first = np.repeat(np.arange(n), counts)
+                second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+                self._add_all("overlap", bookings[first].tolist(), bookings[second].tolist(),
+                              (np.minimum(end[first], end[second]) - start[second]).tolist())
+
+            gaps = start[1:] - end[:-1]
+            legs = np.flatnonzero((resource[1:] == resource[:-1]) & (gaps >= 0) & (gaps < MAX_TRAVEL)
+                                  & (place[1:] != place[:-1]) & (place[1:] >= 0) & (place[:-1] >= 0))
+            needed = self._allowance_columns(places, place[legs], place[legs + 1], end[legs])
+            short = gaps[legs] < needed
+            legs = legs[short]
+            self._add_all("travel", bookings[legs].tolist(), bookings[legs + 1].tolist(), gaps[legs].tolist(),
+                          needed[short].tolist())
+        return list(conflicts.values())
+
+    def _add_all(self, kind, firsts, seconds, spans, travel=None):
+        found = map(Conflict, repeat(kind, len(firsts)), [a.resource for a in firsts], firsts, seconds, spans,
+                    repeat(0) if travel is None else travel)
+        self.conflicts.update(zip(zip(repeat(kind), [a.id for a in firsts], [b.id for b in seconds]), found))
+
+    def _allowance_columns(self, places, origins, destinations, departures):
+        """travel_needed() for legs given as place-code columns: one lookup per distinct (from, to, hour)"""
+        if not len(origins):
+            return np.zeros(0, dtype=np.int64)
+        slots = hour_slot(departures)
+        _, first, inverse = np.unique((origins * len(places) + destinations) * 48 + slots,
+                                         return_index=True, return_inverse=True)
+        memo = self._allowances
+        keys = [(places[origins[i]], places[destinations[i]], int(slots[i])) for i in first.tolist()]
+        missing = [(key, int(departures[i])) for key, i in zip(keys, first.tolist()) if key not in memo]
+        if missing:
+            seconds = self.travel.allowance([key[0] for key, _ in missing], [key[1] for key, _ in missing],
+                                            [when for _, when in missing])
+            memo.update(zip((key for key, _ in missing), seconds.tolist()))
+        return np.array([memo[key] for key in keys], dtype=np.int64)[inverse.ravel()]
+
+    def _touches(self):
+        if self._touching is None:
+            self._touching = {}
+            for key, conflict in self.conflicts.items():
+                self._touching.setdefault(conflict.a.id, set()).add(key)
+                self._touching.setdefault(conflict.b.id, set()).add(key)
+        return self._touching
+
+    def _record(self, conflict):
+        key = conflict.key
+        touching = self._touches()
+        self.conflicts[key] = conflict
+        touching.setdefault(conflict.a.id, set()).add(key)
+        touching.setdefault(conflict.b.id, set()).add(key)
+        if self._journal is not None:
+            self._journal.append((True, conflict))
+
+    def _drop(self, key):
+        conflict = self.conflicts.pop(key, None)
+        if conflict is None:
+            return
+        touching = self._touches()
+        touching[conflict.a.id].discard(key)
+        touching[conflict.b.id].discard(key)
+        if self._journal is not None:
+            self._journal.append((False, conflict))
+
+    def _check_travel(self, line, i):
+        """Travel conflict between timeline positions i and i + 1, if any"""
+        if i < 0 or i + 1 >= len(line):
+            return
+        a, b = line.bookings[i], line.bookings[i + 1]
+        gap = b.start - a.end
+        if 0 <= gap < MAX_TRAVEL:
+            needed, = travel_needed(self.travel, [(a, b)], self._allowances)
+            if gap < needed:
+                self._record(Conflict("travel", a.resource, a, b, gap, needed))
+
+    def _check_overlaps(self, line, i):
+        booking = line.bookings[i]
+        keys, ends, bookings = line.keys, line.ends, line.bookings
+        j = i - 1
+        while j >= 0 and keys[j][0] > booking.start - line.longest:
+            if ends[j] > booking.start:
+                self._record(Conflict("overlap", booking.resource, bookings[j], booking,
+                                      min(ends[j], booking.end) - booking.start))
+            j -= 1
+        j = i + 1
+        while j < len(keys) and keys[j][0] < booking.end:
+            self._record(Conflict("overlap", booking.resource, booking, bookings[j],
+                                  min(ends[j], booking.end) - keys[j][0]))
+            j += 1
+
+    def add(self, booking):
+        """Index one booking and record the conflicts it introduces"""
+        timelines = self._lines()
+        self.bookings[booking.id] = booking
+        self._columns = None
+        line = timelines.get(booking.resource)
+        if line is None:
+            line = timelines[booking.resource] = Timeline()
+        i = line.insert(booking)
+        if 0 < i < len(line) - 1:
+            # The neighbours are no longer consecutive
+            self._drop(("travel", line.bookings[i - 1].id, line.bookings[i + 1].id))
+        self._check_overlaps(line, i)
+        self._check_travel(line, i - 1)
+        self._check_travel(line, i)
+
+    def remove(self, booking_id):
+        timelines = self._lines()
+        booking = self.bookings.pop(booking_id)
+        self._columns = None
+        touching = self._touches()
+        for key in list(touching.get(booking_id, ())):
+            self._drop(key)
+        touching.pop(booking_id, None)
+        line = timelines[booking.resource]
+        i = line.remove(booking)
+        self._check_travel(line, i - 1)
+        return booking
+
+    def move(self, booking_id, start, end):
+        """Reschedule one booking; returns (resolved, introduced) conflicts"""
+        self._journal = []
+        try:
+            booking = self.remove(booking_id)
+            booking.start, booking.end = start, end
+            self.add(booking)
+            dropped = {c.key: c for added, c in self._journal if not added}
+            recorded = {c.key: c for added, c in self._journal if added}
+        finally:
+            self._journal = None
+        resolved = [c for key, c in dropped.items() if key not in recorded]
+        introduced = [c for key, c in recorded.items() if key not in dropped]
+        return resolved, introduced
+
+    def conflicts_for(self, booking_id):
+        return [self.conflicts[key] for key in self._touches().get(booking_id, ())]
+
+
+def bookings_from_dataset(ds):
+    """Operator bookings per shift assignment, gear and vehicle bookings per event they go to
+
+    Places are venue location IDs; travel_time.register_venues(matrix, ds) puts them in the cache.
+    """
+    events, shifts = ds.table("Event"), ds.table("Shift")
+    cancelled = ds.enums["EventStatus"].index("CANCELLED")
+    event_status = events.column("status")
+    places = [venue_id(events.strings[name]) for name in events.column("venueName")]
+    starts, ends, shift_event = shifts.column("startTime"), shifts.column("endTime"), shifts.column("eventId")
+
+    assignments = ds.table("ShiftAssignment")
+    assignment_cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    seen = set()
+    for i, (shift, operator, status) in enumerate(zip(
+        assignments.column("shiftId"), assignments.column("operatorId"), assignments.column("status"),
+    )):
+        event = shift_event[shift]
+        if status == assignment_cancelled or event_status[event] == cancelled or (shift, operator) in seen:
+            continue
+        seen.add((shift, operator))
+        yield Booking(("ShiftAssignment", i), ("operator", operator), starts[shift], ends[shift],
+                      places[event], event, shift)
+
+    load_in, load_out = events.column("loadInTime"), events.column("loadOutTime")
+    gear = ds.table("GearAssignment")
+    seen = set()
+    for i, (event, item, vehicle) in enumerate(zip(
+        gear.column("eventId"), gear.column("gearId"), gear.column("vehicleId"),
+    )):
+        if event_status[event] == cancelled:
+            continue
+        if (event, "gear", item) not in seen:
+            seen.add((event, "gear", item))
+            yield Booking(("GearAssignment", i), ("gear", item), load_in[event], load_out[event], places[event], event)
+        if vehicle >= 0 and (event, "vehicle", vehicle) not in seen:
+            seen.add((event, "vehicle", vehicle))
+            yield Booking(("Vehicle", event, vehicle), ("vehicle", vehicle), load_in[event], load_out[event],
+                          places[event], event)
+
+
+def format_span(start, end):
+    """'Sat, Jun 15 • 8:00 AM - 12:00 PM', or 'Jun 14-16 (3 days)' across days"""
+    first = datetime.fromtimestamp(start, timezone.utc)
+    last = datetime.fromtimestamp(end - 1, timezone.utc)
+    days = (last.date() - first.date()).days + 1
+    if days == 1:
+        return f"{first:%a, %b} {first.day} • {clock(start)} - {clock(end)}"
+    return f"{first:%b} {first.day}-{last.day if last.month == first.month else f'{last:%b} {last.day}'} ({days} days)"
+
+
+def _minutes(seconds):
+    minutes = round(seconds / 60)
+    return f"{minutes} min" if minutes < 120 else f"{round(minutes / 60)} hour"
+
+
+CONFLICT_PAGE = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Scheduling Conflicts</h2>
+            <p class="text-gray-600 mt-1">{summary}</p>
+        </div>
+
+        <div class="space-y-6">{cards}
+        </div>
+''')
+CONFLICT_CARD = CompiledTemplate('''
+            <div class="bg-white rounded-lg shadow border-l-4 {border}">
+                <div class="p-6">
+                    <div class="flex items-start justify-between">
+                        <div class="flex items-start">
+                            <div class="text-3xl mr-4">{icon}</div>
+                            <div>
+                                <h3 class="font-semibold text-gray-900">{title}</h3>
+                                <p class="text-sm text-gray-600 mt-1">{subtitle}</p>
+
+                                <div class="mt-4 space-y-3">{first}
+
+                                    <div class="text-center text-gray-400 text-sm">{relation} ↓</div>
+{second}
+                                </div>{issues}
+                            </div>
+                        </div>
+                        <div class="flex space-x-2">
+                            <button class="px-4 py-2 border border-gray-300 rounded-lg text-sm hover:bg-gray-50">{action}</button>
+                            <button class="px-4 py-2 bg-purple-600 text-white rounded-lg text-sm hover:bg-purple-700">{primary}</button>
+                        </div>
+                    </div>
+                </div>
+            </div>
+''')
+BOOKING_BOX = CompiledTemplate('''
+                                    <div class="p-3 {tint} rounded">
+                                        <div class="font-medium text-sm">{label}</div>
+                                        <div class="text-xs text-gray-600">{when}</div>
+                                        <div class="text-xs text-gray-600">{where}</div>
+                                    </div>''')
+ISSUES = CompiledTemplate('''
+
+                                <div class="mt-3 p-3 bg-red-50 border border-red-200 rounded">
+                                    <div class="text-sm text-red-700">
+                                        <div class="font-medium">Issues:</div>{lines}
+                                    </div>
+                                </div>''')
+ALL_CLEAR = CompiledTemplate('''
+            <div class="bg-white rounded-lg shadow border-l-4 border-green-400">
+                <div class="p-6">
+                    <div class="flex items-start">
+                        <div class="text-3xl mr-4">✅</div>
+                        <div>
+                            <h3 class="font-semibold text-gray-900">No {noun} Conflicts</h3>
+                            <p class="text-sm text-gray-600 mt-1">All {plural} properly scheduled</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+''')
+
+RESOURCE_LABELS = {"operator": ("Operator", "operators"), "gear": ("Equipment", "equipment"),
+                   "vehicle": ("Vehicle", "vehicles")}
+
+
+def _card(ds, conflict, travel):
+    events, shifts = ds.table("Event"), ds.table("Shift")
+    kind, ident = conflict.resource
+    tint = "bg-yellow-50" if kind == "operator" else "bg-orange-50"
+
+    def box(booking):
+        event = events[booking.event]
+        label = event.eventName
+        if booking.shift is not None:
+            label = f"{label} - {shifts[booking.shift].shiftName}"
+        return BOOKING_BOX.bind(tint=tint, label=html.escape(label), when=format_span(booking.start, booking.end),
+                                where=html.escape(event.venueName))
+
+    a, b = conflict.a, conflict.b
+    lines = []
+    if conflict.kind == "overlap":
+        overlap = f"{_minutes(conflict.seconds)} overlap"
+        if conflict.seconds < 86400:
+            overlap += f" ({clock(b.start)}-{clock(min(a.end, b.end))})"
+        lines.append(overlap)
+        if travel:
+            lines.append(f"~{_minutes(travel)} travel time between venues")
+        lines.append("Impossible to attend both" + (" shifts" if kind == "operator" else " events"))
+    else:
+        lines.append(f"Only {_minutes(conflict.seconds)} between bookings")
+        lines.append(f"~{_minutes(travel)} travel time between venues")
+
+    if kind == "operator":
+        name = html.escape(ds.table("Operator")[ident].name)
+        title = "Operator Double-Booking" if conflict.kind == "overlap" else "Not Enough Travel Time"
+        subtitle = f"{name} assigned to {'overlapping' if conflict.kind == 'overlap' else 'back-to-back'} shifts"
+        icon, border, action, primary = "⚠️", "border-yellow-400", "Unassign One", "Find Replacement"
+    elif kind == "gear":
+        item = ds.table("Gear")[ident]
+        title, subtitle = "Equipment Double-Booking", f"{html.escape(item.name)} assigned to 2 events"
+        icon, border, action, primary = "📷", "border-orange-400", "Reassign Equipment", "Allow with Note"
+    else:
+        title, subtitle = "Vehicle Double-Booking", f"{html.escape(ds.table('Vehicle')[ident].name)} booked for 2 events"
+        icon, border, action, primary = "🚐", "border-orange-400", "Reassign Vehicle", "Allow with Note"
+    return CONFLICT_CARD.bind(
+        border=border, icon=icon, title=title, subtitle=subtitle, first=box(a), second=box(b),
+        relation="overlaps with" if conflict.kind == "overlap" else "then travels to",
+        issues=ISSUES.bind(lines="".join(f"\n                                        <div>• {line}</div>" for line in lines)),
+        action=action, primary=primary,
+    )
+
+
+def render_conflicts(ds, conflicts, path, limit=50, travel=None):
+    """24-conflict-resolution from engine output: worst conflicts first, all-clear cards for clean resources
+
+    `travel` is the engine's TravelMatrix (the default cache when not given).
+    """
+    order = list(RESOURCE_LABELS)
+    ranked = sorted(conflicts, key=lambda c: (c.kind != "overlap", order.index(c.resource[0]),
+                                              -c.seconds if c.kind == "overlap" else c.seconds, c.a.start, c.key))
+    counts = Counter(c.resource[0] for c in conflicts)
+    summary = ", ".join(f"{counts[kind]} {RESOURCE_LABELS[kind][0].lower()}" for kind in RESOURCE_LABELS)
+    shown = ranked[:limit]
+    needed = travel_needed(travel if travel is not None else TravelMatrix(), [(c.a, c.b) for c in shown])
+    cards = [_card(ds, c, seconds) for c, seconds in zip(shown, needed)]
+    cards += [ALL_CLEAR.bind(noun=noun, plural=plural) for kind, (noun, plural) in RESOURCE_LABELS.items()
+              if not counts[kind]]
+    write_page(path, "Conflict Resolution", CONFLICT_PAGE.bind(
+        summary=f"{len(conflicts)} conflicts to review ({summary})"
+                + (f" • showing the {limit} most severe" if len(conflicts) > limit else ""),
+        cards=Repeat(cards),
+    ))
+    return min(limit, len(conflicts))
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Find operator, equipment and vehicle conflicts in a fixture season")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="travel-time cache (see travel_time.py)")
+    parser.add_argument("--moves", type=int, default=0, metavar="N",
+                        help="move N random bookings incrementally and check the result against a full rescan")
+    parser.add_argument("--render", metavar="DIR", help="write 24-conflict-resolution.html to DIR")
+    parser.add_argument("--limit", type=int, default=50, help="conflict cards on the rendered page")
+    args = parser.parse_args(argv)
+
+    ds = Dataset(args.seed, dict(args.count))
+    matrix = TravelMatrix(args.cache_dir)
+    if register_venues(matrix, ds):
+        matrix.save()
+    start = time.perf_counter()
+    bookings = list(bookings_from_dataset(ds))
+    loaded = time.perf_counter()
+    engine = ConflictEngine(matrix)
+    conflicts = engine.load(bookings)
+    scanned = time.perf_counter()
+    engine.scan()
+    rescanned = time.perf_counter()
+    by_kind = Counter((c.resource[0], c.kind) for c in conflicts)
+    print(f"{len(bookings)} bookings from {ds.count('Shift')} shifts in {loaded - start:.2f}s; "
+          f"index + scan {scanned - loaded:.3f}s, rescan {rescanned - scanned:.3f}s")
+    for (resource, kind), count in sorted(by_kind.items()):
+        print(f"  {resource:<9} {kind:<8} {LEVELS[kind]:<10} {count:>8}")
+
+    if args.moves:
+        import random
+
+        rng = random.Random(args.seed)
+        ids = sorted(engine.bookings)
+        start = time.perf_counter()
+        for _ in range(args.moves):
+            booking = engine.bookings[rng.choice(ids)]
+            shift = rng.randrange(-3, 4) * 1800
+            engine.move(booking.id, booking.start + shift, booking.end + shift)
+        elapsed = time.perf_counter() - start
+        incremental = set(engine.conflicts)
+        rescan = {c.key for c in engine.scan()}
+        status = "matches" if incremental == rescan else f"DIFFERS ({len(incremental ^ rescan)} conflicts)"
+        print(f"{args.moves} moves in {elapsed * 1000:.1f} ms "
+              f"({elapsed / args.moves * 1e6:.0f} us each); incremental state {status} a full rescan")
+
+    if args.render:
+        path = os.path.join(args.render, "24-conflict-resolution.html")
+        shown = render_conflicts(ds, conflicts, path, args.limit, matrix)
+        print(f"Created: {path} ({shown} of {len(conflicts)} conflicts)")
+
+
+if __name__ == "__main__":
+    main()
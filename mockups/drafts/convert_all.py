@@ -1,43 +1,91 @@
 #!/usr/bin/env python3
 """
 Batch convert HTML mockups to PNG
-This script creates a list of commands to manually convert each mockup
+Screenshots every mockup with one local headless browser (or the offline
+stub renderer) and writes the PNGs under png/
 """
 
-mockups = [
-    "01-login.html",
-    "02-dashboard-home.html",
-    "03-calendar-month-view.html",
-    "04-event-create.html",
-    "05-event-detail-shifts.html",
-    "06-shift-assignment.html",
-    "07-shift-create.html",
-    "08-shift-pay-negotiation.html",
-    "09-operators-list.html",
-    "10-operator-profile.html",
-    "11-operator-personal-equipment.html",
-    "12-operator-skills.html",
-    "13-operator-blackout-dates.html",
-    "14-equipment-list.html",
-    "15-equipment-detail.html",
-    "16-equipment-location-tracking.html",
-    "17-packing-list.html",
-    "18-gig-sheet-preview.html",
-    "19-gig-sheet-travel-itinerary.html",
-    "20-send-gig-sheets.html",
-    "21-training-list.html",
-    "22-training-detail.html",
-    "23-skill-upgrade-approval.html",
-    "24-conflict-resolution.html",
-    "25-travel-time-warnings.html",
-]
-
-print("HTML Mockups to Convert:")
-print("=" * 60)
-for i, mockup in enumerate(mockups, 1):
-    url = f"file:///D:/ClaudeCode/CommandCentered/mockups/{mockup}"
-    png_name = mockup.replace('.html', '.png')
-    print(f"{i:2d}. {mockup:40s} → {png_name}")
-
-print(f"\nTotal: {len(mockups)} mockups")
-print("\nNavigate to each file:// URL and take screenshot with Playwright MCP")
+import argparse
+import os
+import sys
+
+import profiling
+from page_index import discover
+from png_cache import PngCache
+from rasterize import DEFAULT_VIEWPORT, RENDERERS, RendererUnavailable, convert, png_path_for
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(HERE, "round-1-early-exploration")
+
+
+def collect(paths):
+    """Expand files/directories into (html files, common source root)
+
+    Directories are listed through the page index, so what gets converted is
+    whatever is on disk, found with a stat per page once the index is warm.
+    """
+    if not paths:
+        return [page.path for page in discover([DEFAULT_SOURCE], recursive=False)], DEFAULT_SOURCE
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # Only the pages directly in it, as the glob this replaced did: not a nested site/ tree
+            files.extend(page.path for page in discover([os.path.abspath(path)], recursive=False))
+        else:
+            files.append(path)
+    dirs = [os.path.dirname(os.path.abspath(f)) for f in files]
+    root = os.path.commonpath(dirs) if dirs else "."
+    return files, root
+
+
+def parse_viewport(value):
+    width, _, height = value.partition("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch convert HTML mockups to PNG")
+    parser.add_argument("paths", nargs="*", help="HTML files or round directories (default: round-1)")
+    parser.add_argument("-o", "--out-dir", default="png")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="playwright")
+    parser.add_argument("--pages", type=int, default=4, help="browser pages kept open and used concurrently")
+    parser.add_argument("--viewport", type=parse_viewport, default=DEFAULT_VIEWPORT, help="WIDTHxHEIGHT")
+    parser.add_argument("--cache-dir", default=".png-cache", help="reuse PNGs of unchanged pages from here")
+    parser.add_argument("--cache-size", type=int, default=512, help="cache size limit in MB (LRU eviction)")
+    parser.add_argument("--no-cache", action="store_true", help="re-render every page")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of every page to PATH")
+    args = parser.parse_args(argv)
+    if args.trace:
+        profiling.enable()
+
+    files, root = collect(args.paths)
+    jobs = [(f, png_path_for(os.path.abspath(f), root, args.out_dir)) for f in files]
+
+    cache = None if args.no_cache else PngCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    print(f"Converting {len(jobs)} mockups with {args.renderer} ({args.pages} pages)")
+    print("=" * 60)
+    try:
+        results, elapsed = convert(jobs, args.renderer, args.pages, args.viewport, cache)
+    except RendererUnavailable as e:
+        sys.exit(f"error: {e}")
+    failed = 0
+    for i, (html_path, png_path, error) in enumerate(results, 1):
+        name = os.path.relpath(html_path, root)
+        if error:
+            failed += 1
+            print(f"{i:2d}. {name:40s} ✗ {error}")
+        else:
+            print(f"{i:2d}. {name:40s} → {png_path}")
+
+    print(f"\nTotal: {len(results) - failed}/{len(results)} mockups in {elapsed:.2f}s")
+    if cache is not None:
+        print(cache.report())
+    if args.trace:
+        profiling.write_chrome_trace(args.trace)
+        print(f"\n{profiling.summary()}\nTrace: {args.trace}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
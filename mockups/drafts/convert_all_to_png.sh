@@ -1,19 +1,8 @@
 #!/bin/bash
-# Convert all 25 HTML mockups to PNG using Playwright MCP
+# Convert HTML mockups to PNG with a local headless browser
+# Usage: ./convert_all_to_png.sh [round-dir-or-html ...] [--renderer stub]
 
-cd "D:\ClaudeCode\CommandCentered\mockups"
+cd "$(dirname "$0")"
 
-# Create PNG output directory
-mkdir -p png
-
-echo "Converting 25 mockups to PNG..."
-
-for i in {01..25}; do
-    html_file="${i}-*.html"
-    if [ -f $html_file ]; then
-        echo "Converting $html_file..."
-    fi
-done
-
-echo "Done! Screenshots saved to .playwright-mcp directory"
-echo "Moving to mockups/png/ directory..."
+# PNGs land in png/ (mirroring the round directories when several are given)
+python3 convert_all.py "$@"
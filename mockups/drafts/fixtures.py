@@ -0,0 +1,838 @@
+#!/usr/bin/env python3
+"""Seeded synthetic datasets generated from the models in schema.prisma
+
+    ds = Dataset(seed=7, counts={"Shift": 1_000_000})
+    for shift in ds.stream("Shift"):     # one record at a time, O(1) memory
+        ...
+    events = ds.table("Event")           # array-backed columns, cached
+
+Every model's rows are produced in blocks of BLOCK rows, each with its own
+RNG seeded from (seed, model, block), so the same seed always yields the same
+rows and any row range can be generated without replaying the whole table.
+
+Values are stored compactly: ids and foreign keys are row indexes,
+DateTime fields are epoch seconds, Decimal(_, 2) fields are integer cents
+(or hundredths of an hour), enums are small codes and strings are interned.
+Children are laid out contiguously under their parent (an event's shifts,
+a shift's assignments), so child_range() finds them without scanning.
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+
+from page_helpers import write_page
+from page_template import CompiledTemplate, Repeat
+
+try:
+    import resource
+except ImportError:  # Unix only: on Windows --stream reports no peak RSS
+    resource = None
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "schema.prisma")
+BLOCK = 1024
+# Fixtures are single-tenant and skip bookkeeping columns
+SKIPPED_FIELDS = {"id", "tenantId", "createdAt", "updatedAt"}
+SEASON_START = int(datetime(2025, 3, 1, tzinfo=timezone.utc).timestamp())
+DAY = 86400
+HOUR = 3600
+WEEKDAYS = ["Thursday", "Friday", "Saturday", "Sunday", "Monday", "Tuesday", "Wednesday"]  # day 0 of the epoch
+
+DEFAULT_COUNTS = {
+    "Operator": 40,
+    "Event": 12,
+    "Shift": 48,
+    "ShiftAssignment": 144,
+    "Gear": 80,
+    "Vehicle": 4,
+    "GearAssignment": 120,
+    "OperatorBlackoutDate": 30,
+    "SkillDefinition": 8,
+    "OperatorSkill": 120,
+    "OperatorGear": 80,
+    "OperatorGearRequest": 48,
+}
+# (child, parent, children per parent): an explicit count on one side scales the other
+RATIOS = [
+    ("ShiftAssignment", "Shift", 3), ("Shift", "Event", 4), ("GearAssignment", "Event", 10),
+    ("OperatorSkill", "Operator", 3), ("OperatorBlackoutDate", "Operator", 1), ("OperatorGear", "Operator", 2),
+    ("OperatorGearRequest", "Shift", 1),
+]
+# Children generated contiguously under their parent (see child_range)
+NESTED = {
+    "Shift": ("eventId", "Event"), "ShiftAssignment": ("shiftId", "Shift"), "GearAssignment": ("eventId", "Event"),
+    "OperatorSkill": ("operatorId", "Operator"), "OperatorGear": ("operatorId", "Operator"),
+    "OperatorGearRequest": ("shiftId", "Shift"),
+}
+
+FIRST_NAMES = ["John", "Sarah", "Mike", "Emily", "David", "Jessica", "Chris", "Ashley", "Daniel", "Megan",
+               "Ryan", "Lauren", "Kevin", "Rachel", "Jason", "Nicole", "Brian", "Amanda", "Tyler", "Olivia"]
+LAST_NAMES = ["Doe", "Miller", "Thompson", "Garcia", "Nguyen", "Patel", "Johnson", "Kim", "Martinez", "Brown",
+              "Lee", "Davis", "Wilson", "Lopez", "Clark", "Lewis", "Walker", "Young", "Allen", "Scott"]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com", "email.com"]
+STREETS = ["Main St", "Oak Ave", "Sunset Blvd", "Elm St", "Vine St", "Maple Dr", "Ocean Ave", "Hill St"]
+CITIES = [
+    ("Los Angeles", 34.0522, -118.2437), ("Pasadena", 34.1478, -118.1445), ("Long Beach", 33.7701, -118.1937),
+    ("Burbank", 34.1808, -118.3090), ("Santa Monica", 34.0195, -118.4912), ("Anaheim", 33.8366, -117.9143),
+    ("Irvine", 33.6846, -117.8265), ("Glendale", 34.1425, -118.2551),
+]
+VENUES = [
+    ("Downtown Park", "200 N Spring St, Los Angeles, CA", 34.0537, -118.2428),
+    ("Pasadena Civic Auditorium", "300 E Green St, Pasadena, CA", 34.1443, -118.1441),
+    ("Terrace Theater", "300 E Ocean Blvd, Long Beach, CA", 33.7644, -118.1896),
+    ("Alex Theatre", "216 N Brand Blvd, Glendale, CA", 34.1489, -118.2550),
+    ("Santa Monica High School", "601 Pico Blvd, Santa Monica, CA", 34.0115, -118.4865),
+    ("Anaheim Convention Center", "800 W Katella Ave, Anaheim, CA", 33.8003, -117.9190),
+    ("Irvine Barclay Theatre", "4242 Campus Dr, Irvine, CA", 33.6490, -117.8427),
+    ("Burbank Center Stage", "555 N Third St, Burbank, CA", 34.1831, -118.3093),
+]
+EVENT_TITLES = {
+    "DANCE_COMPETITION": ["Regional Dance Championship", "Spring Dance Competition", "StarPower Nationals"],
+    "RECITAL": ["Spring Recital", "Winter Showcase", "Year-End Recital"],
+    "CONCERT": ["Summer Music Festival", "Symphony in the Park", "Jazz Night"],
+    "PLAY": ["Spring Musical", "Community Theater Gala", "Shakespeare Night"],
+    "OTHER": ["Corporate Gala", "Graduation Ceremony", "Charity Auction"],
+}
+GEAR_MODELS = {
+    "CAMERA": ("Sony A7SIII", "CAM"), "LENS": ("Sony 24-70mm GM", "LNS"), "AUDIO": ("Wireless Mic Kit", "AUD"),
+    "COMPUTER": ("MacBook Pro", "CMP"), "RIGGING": ("Manfrotto Tripod", "RIG"), "CABLE": ("SDI Cable 50ft", "CBL"),
+    "LIGHTING": ("Aputure 300d", "LGT"), "ACCESSORIES": ("V-Mount Battery", "ACC"),
+}
+SKILLS = [
+    ("videography", "Video"), ("photography", "Photo"), ("directing", "Directing"), ("drone", "Drone"),
+    ("audio", "Audio"), ("livestream", "Livestream"), ("editing", "Editing"), ("lighting", "Lighting"),
+]
+PERSONAL_GEAR = [
+    ("LENS", "Sony 70-200mm Lens"), ("RIGGING", "Tripod"), ("CAMERA", "Canon R5 Body"), ("AUDIO", "Rode Shotgun Mic"),
+    ("LIGHTING", "LED Panel"), ("ACCESSORIES", "DJI Gimbal"), ("COMPUTER", "Laptop"), ("CABLE", "HDMI Cable Kit"),
+]
+GEAR_ICONS = {"CAMERA": "📷", "LENS": "🔍", "AUDIO": "🎙️", "COMPUTER": "💻", "RIGGING": "🏗️",
+              "CABLE": "🔌", "LIGHTING": "💡", "ACCESSORIES": "🎒"}
+
+_RELATION_RE = re.compile(r"@relation\((?:\"[^\"]*\",\s*)?(?:name:\s*\"[^\"]*\",\s*)?fields:\s*\[(\w+)\]")
+_DECIMAL_RE = re.compile(r"@db\.Decimal\(\d+,\s*(\d+)\)")
+
+
+class Field:
+    __slots__ = ("name", "type", "optional", "is_list", "attrs", "kind", "ref")
+
+    def __init__(self, name, type, optional, is_list, attrs):
+        self.name = name
+        self.type = type
+        self.optional = optional
+        self.is_list = is_list
+        self.attrs = attrs
+        self.kind = None
+        self.ref = None
+
+    def __repr__(self):
+        return f"Field({self.name}: {self.type}{'?' if self.optional else ''} -> {self.kind})"
+
+
+def parse_schema(path=SCHEMA_PATH):
+    """schema.prisma -> ({model: [Field]}, {enum: [values]}), scalar fields only"""
+    models, enums = {}, {}
+    relations = {}
+    block = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("//", 1)[0].strip()
+            if not line:
+                continue
+            if block is None:
+                kind, _, rest = line.partition(" ")
+                if kind in ("model", "enum") and rest.endswith("{"):
+                    name = rest[:-1].strip()
+                    block = (kind, name)
+                    (models if kind == "model" else enums)[name] = []
+                continue
+            if line == "}":
+                block = None
+                continue
+            if line.startswith("@@"):
+                continue
+            kind, name = block
+            if kind == "enum":
+                enums[name].append(line.split()[0])
+                continue
+            parts = line.split(None, 2)
+            field_type = parts[1]
+            attrs = parts[2] if len(parts) > 2 else ""
+            relation = _RELATION_RE.search(attrs)
+            if relation:
+                relations.setdefault(name, {})[relation.group(1)] = field_type.rstrip("?")
+            models[name].append(Field(
+                parts[0], field_type.rstrip("?").removesuffix("[]"),
+                field_type.endswith("?"), field_type.endswith("[]"), attrs,
+            ))
+
+    for name, fields in models.items():
+        refs = relations.get(name, {})
+        scalars = []
+        for field in fields:
+            if field.type in models:
+                continue  # relation navigation field; its foreign key column is kept
+            field.ref = refs.get(field.name)
+            field.kind = _column_kind(field, enums)
+            scalars.append(field)
+        models[name] = scalars
+    return models, enums
+
+
+def _column_kind(field, enums):
+    if field.ref:
+        return "ref"
+    if field.is_list or field.type in ("Json", "Bytes"):
+        return "object"
+    if field.type in enums:
+        return "enum"
+    if field.type == "Decimal":
+        scale = _DECIMAL_RE.search(field.attrs)
+        return "cents" if scale and scale.group(1) == "2" else "float"
+    return {"String": "str", "Boolean": "bool", "Int": "int", "BigInt": "int",
+            "DateTime": "time", "Float": "float"}.get(field.type, "object")
+
+
+class Record:
+    """Base for the per-model __slots__ record classes built by record_type()"""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def _asdict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._asdict() == other._asdict()
+
+
+def record_type(model, names):
+    return type(model, (Record,), {"__slots__": ("id",) + tuple(names)})
+
+
+# Array typecodes per column kind; None is stored as a sentinel
+NULL_INT = -(2 ** 63)
+_TYPECODES = {"ref": "q", "int": "q", "time": "q", "cents": "q", "float": "d", "bool": "b", "enum": "h", "str": "q"}
+
+
+class ColumnTable:
+    """Rows of one model stored column-wise in typed arrays, strings interned"""
+
+    def __init__(self, model, fields, enums, record=None):
+        self.model = model
+        self.fields = fields
+        self.record = record or record_type(model, [field.name for field in fields])
+        self.strings = []
+        self._string_ids = {}
+        self._enum_values = {f.name: enums[f.type] for f in fields if f.kind == "enum"}
+        self._enum_codes = {name: {v: i for i, v in enumerate(values)} for name, values in self._enum_values.items()}
+        self.columns = {
+            f.name: array(_TYPECODES[f.kind]) if f.kind in _TYPECODES else [] for f in fields
+        }
+        self._appenders = [(self.columns[f.name].append, self._encoder(f)) for f in fields]
+        self._decoders = [(self.columns[f.name], self._decoder(f)) for f in fields]
+
+    def _encoder(self, field):
+        kind = field.kind
+        if kind == "str":
+            strings, ids = self.strings, self._string_ids
+
+            def encode(value):
+                if value is None:
+                    return -1
+                sid = ids.get(value)
+                if sid is None:
+                    sid = ids[value] = len(strings)
+                    strings.append(value)
+                return sid
+            return encode
+        if kind == "enum":
+            codes = self._enum_codes[field.name]
+            return lambda value: -1 if value is None else codes[value]
+        if kind == "bool":
+            return lambda value: -1 if value is None else int(value)
+        if kind == "float":
+            return lambda value: float("nan") if value is None else value
+        if kind == "object":
+            return None
+        return lambda value: NULL_INT if value is None else value
+
+    def _decoder(self, field):
+        kind = field.kind
+        if kind == "str":
+            strings = self.strings
+            return lambda sid: None if sid < 0 else strings[sid]
+        if kind == "enum":
+            values = self._enum_values[field.name]
+            return lambda code: None if code < 0 else values[code]
+        if kind == "bool":
+            return lambda value: None if value < 0 else bool(value)
+        if kind == "float":
+            return lambda value: None if value != value else value
+        if kind == "object":
+            return None
+        return lambda value: None if value == NULL_INT else value
+
+    def append(self, row):
+        for (append, encode), value in zip(self._appenders, row):
+            append(value if encode is None else encode(value))
+
+    def __len__(self):
+        return len(self.columns[self.fields[0].name]) if self.fields else 0
+
+    def row(self, i):
+        return tuple(
+            column[i] if decode is None else decode(column[i])
+            for column, decode in self._decoders
+        )
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return self.record(i, *self.row(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name):
+        """The raw column (array of codes/ints) for vectorized scans"""
+        return self.columns[name]
+
+    def nbytes(self):
+        total = sum(
+            column.itemsize * len(column) if isinstance(column, array) else sys.getsizeof(column)
+            for column in self.columns.values()
+        )
+        return total + sum(sys.getsizeof(s) for s in self.strings)
+
+
+def resolve_counts(explicit=None):
+    """Row count per model: defaults, the explicit counts, and parents/children scaled to match"""
+    explicit = dict(explicit or {})
+    counts = dict(DEFAULT_COUNTS)
+    counts.update(explicit)
+    for child, parent, ratio in RATIOS:
+        if child in explicit and parent not in explicit:
+            counts[parent] = explicit[parent] = max(1, -(-explicit[child] // ratio))
+        elif parent in explicit and child not in explicit:
+            counts[child] = explicit[child] = explicit[parent] * ratio
+    return counts
+
+
+def child_bounds(index, parents, children):
+    """First child row of parent `index` when `children` rows are spread over `parents`"""
+    return -(-index * children // parents)
+
+
+RULES = {}
+
+
+def rule(model, *fields):
+    """Register a row generator for `model` that also fills these (optional) fields"""
+    def register(fn):
+        RULES[model] = (fields, fn)
+        return fn
+    return register
+
+
+class Dataset:
+    def __init__(self, seed=0, counts=None, schema=SCHEMA_PATH):
+        self.seed = seed
+        self.models, self.enums = parse_schema(schema)
+        self.counts = resolve_counts(counts)
+        self._fields = {}
+        self._records = {}
+        self._tables = {}
+
+    def count(self, model):
+        return self.counts.get(model, 10)
+
+    def fields(self, model):
+        """Generated fields: required ones without a default plus whatever the model's rule fills"""
+        fields = self._fields.get(model)
+        if fields is None:
+            extra = RULES.get(model, ((), None))[0]
+            fields = self._fields[model] = [
+                f for f in self.models[model]
+                if f.name not in SKIPPED_FIELDS and (
+                    f.name in extra or not (f.optional or f.is_list or "@default" in f.attrs or "@updatedAt" in f.attrs)
+                )
+            ]
+        return fields
+
+    def record_type(self, model):
+        cls = self._records.get(model)
+        if cls is None:
+            cls = self._records[model] = record_type(model, [f.name for f in self.fields(model)])
+        return cls
+
+    def rng(self, model, block):
+        return random.Random(f"{self.seed}:{model}:{block}")
+
+    def uuid(self, model, index):
+        digest = hashlib.blake2b(f"{self.seed}:{model}:{index}".encode(), digest_size=16).digest()
+        return str(uuid.UUID(bytes=digest, version=4))
+
+    def child_range(self, model, parent_index):
+        """Rows of a nested model (see NESTED) that belong to one parent row"""
+        parent = NESTED[model][1]
+        parents, children = self.count(parent), self.count(model)
+        return range(child_bounds(parent_index, parents, children),
+                     child_bounds(parent_index + 1, parents, children))
+
+    def parent_of(self, model, index):
+        return index * self.count(NESTED[model][1]) // self.count(model)
+
+    def rows(self, model, start=0, stop=None):
+        """Value tuples (without id) in fields() order for rows start..stop"""
+        fields = self.fields(model)
+        generate = RULES.get(model, ((), None))[1]
+        total = self.count(model)
+        stop = total if stop is None else min(stop, total)
+        i = start - start % BLOCK
+        while i < stop:
+            rng = self.rng(model, i // BLOCK)
+            for i in range(i, min(i + BLOCK, stop)):
+                values = generate(self, rng, i) if generate else {}
+                row = tuple(
+                    values[f.name] if f.name in values else self._generic(f, rng, i)
+                    for f in fields
+                )
+                if i >= start:
+                    yield row
+            i += 1
+
+    def _generic(self, field, rng, i):
+        kind = field.kind
+        if field.optional:
+            return None
+        if kind == "ref":
+            return rng.randrange(self.count(field.ref))
+        if kind == "str":
+            return f"{field.name} {i + 1}"
+        if kind == "enum":
+            return self.enums[field.type][0]
+        if kind == "bool":
+            return False
+        if kind == "time":
+            return SEASON_START + rng.randrange(180) * DAY
+        if kind in ("int", "cents"):
+            return rng.randrange(100)
+        if kind == "float":
+            return round(rng.random(), 6)
+        return None
+
+    def stream(self, model, start=0, stop=None):
+        """Yield __slots__ records one at a time; nothing is retained"""
+        cls = self.record_type(model)
+        for i, row in enumerate(self.rows(model, start, stop), start):
+            yield cls(i, *row)
+
+    def table(self, model):
+        """All rows of a model in a cached ColumnTable"""
+        table = self._tables.get(model)
+        if table is None:
+            table = ColumnTable(model, self.fields(model), self.enums, self.record_type(model))
+            for row in self.rows(model):
+                table.append(row)
+            self._tables[model] = table
+        return table
+
+
+def _weighted(rng, choices):
+    """choices: [(value, weight), ...]"""
+    return rng.choices([c[0] for c in choices], [c[1] for c in choices])[0]
+
+
+def _coord(rng, base, spread=0.05):
+    return round(base + rng.uniform(-spread, spread), 6)
+
+
+@rule("Operator", "phone", "homeAddress", "homeLat", "homeLng", "hasVehicle", "acceptsFlatRate", "status")
+def _operator(ds, rng, i):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, lat, lng = rng.choice(CITIES)
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first}.{last}{i + 1}@{EMAIL_DOMAINS[i % len(EMAIL_DOMAINS)]}".lower(),
+        "phone": f"(555) {rng.randrange(200, 999)}-{rng.randrange(10000):04d}",
+        "hourlyRate": rng.randrange(35, 96) * 100,
+        "acceptsFlatRate": rng.random() < 0.7,
+        "hasVehicle": rng.random() < 0.6,
+        "homeAddress": f"{rng.randrange(100, 9999)} {rng.choice(STREETS)}, {city}, CA",
+        "homeLat": _coord(rng, lat),
+        "homeLng": _coord(rng, lng),
+        "status": "ACTIVE" if rng.random() < 0.95 else "INACTIVE",
+    }
+
+
+@rule("Event", "venueLat", "venueLng", "clientName", "revenueAmount", "status", "isMultiDay")
+def _event(ds, rng, i):
+    event_type = _weighted(rng, [("DANCE_COMPETITION", 5), ("RECITAL", 3), ("CONCERT", 2), ("PLAY", 1), ("OTHER", 1)])
+    venue, address, lat, lng = rng.choice(VENUES)
+    # About three events a day across the season, so crews get double-booked
+    day = rng.randrange(max(60, ds.count("Event") // 3))
+    load_in = SEASON_START + day * DAY + rng.randrange(14, 21) * HOUR + rng.choice((0, 1800))
+    multi_day = rng.random() < 0.1
+    load_out = load_in + rng.randrange(6, 15) * HOUR + (rng.randrange(1, 3) * DAY if multi_day else 0)
+    return {
+        "eventName": rng.choice(EVENT_TITLES[event_type]),
+        "eventType": event_type,
+        "venueName": venue,
+        "venueAddress": address,
+        "venueLat": lat,
+        "venueLng": lng,
+        "clientName": f"{rng.choice(LAST_NAMES)} {rng.choice(('Dance Studio', 'Academy', 'Productions', 'Arts'))}",
+        "loadInTime": load_in,
+        "loadOutTime": load_out,
+        "revenueAmount": rng.randrange(15, 120) * 10000,
+        "status": _weighted(rng, [("CONFIRMED", 6), ("SCHEDULED", 3), ("PLANNING", 1), ("CANCELLED", 0.3)]),
+        "isMultiDay": multi_day,
+    }
+
+
+@rule("Shift", "isOverlapShift")
+def _shift(ds, rng, i):
+    event = ds.parent_of("Shift", i)
+    events = ds.table("Event")
+    load_in = events.columns["loadInTime"][event]
+    load_out = events.columns["loadOutTime"][event]
+    siblings = ds.child_range("Shift", event)
+    slot = (load_out - load_in) // len(siblings)
+    start = load_in + (i - siblings.start) * slot
+    overlap = i > siblings.start and rng.random() < 0.2
+    if overlap:
+        start -= 1800  # hand-over overlaps the previous shift by 30 minutes
+    start -= start % 900
+    hour = start % DAY // HOUR
+    part = "Morning" if hour < 12 else "Afternoon" if hour < 17 else "Evening"
+    return {
+        "eventId": event,
+        "shiftName": f"{WEEKDAYS[start // DAY % 7]} {part}",
+        "startTime": start,
+        "endTime": load_in + (i - siblings.start + 1) * slot,
+        "isOverlapShift": overlap,
+    }
+
+
+@rule("ShiftAssignment", "hourlyRate", "estimatedHours", "flatRate", "payType", "status")
+def _shift_assignment(ds, rng, i):
+    shift = ds.parent_of("ShiftAssignment", i)
+    shifts = ds.table("Shift")
+    operator = rng.randrange(ds.count("Operator"))
+    rate = ds.table("Operator").columns["hourlyRate"][operator]
+    hundredths = (shifts.columns["endTime"][shift] - shifts.columns["startTime"][shift]) * 100 // HOUR
+    flat = rng.random() < 0.15
+    flat_rate = rng.randrange(2, 9) * 5000 if flat else None
+    return {
+        "shiftId": shift,
+        "operatorId": operator,
+        "role": _weighted(rng, [("VIDEOGRAPHER", 5), ("PHOTOGRAPHER", 2), ("DIRECTOR", 1), ("ASSISTANT", 2)]),
+        "payType": "FLAT" if flat else "HOURLY",
+        "hourlyRate": None if flat else rate,
+        "estimatedHours": hundredths,
+        "flatRate": flat_rate,
+        "calculatedPay": flat_rate if flat else rate * hundredths // 100,
+        "status": _weighted(rng, [("CONFIRMED", 6), ("ASSIGNED", 3), ("CANCELLED", 0.2)]),
+    }
+
+
+@rule("Gear", "serialNumber", "purchasePrice", "status")
+def _gear(ds, rng, i):
+    category = rng.choice(list(GEAR_MODELS))
+    name, prefix = GEAR_MODELS[category]
+    return {
+        "name": f"{name} #{i // len(GEAR_MODELS) + 1}",
+        "category": category,
+        "type": category.title(),
+        "serialNumber": f"{prefix}{i + 1:04d}",
+        "purchasePrice": rng.randrange(5, 400) * 1000,
+        "status": _weighted(rng, [("AVAILABLE", 8), ("IN_USE", 3), ("NEEDS_REPAIR", 0.5), ("IN_REPAIR", 0.3)]),
+    }
+
+
+@rule("Vehicle", "licensePlate", "status")
+def _vehicle(ds, rng, i):
+    return {
+        "name": f"Van #{i + 1}",
+        "vehicleType": rng.choice(("Cargo Van", "Sprinter", "SUV")),
+        "licensePlate": f"{rng.randrange(1, 10)}{''.join(rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ') for _ in range(3))}{rng.randrange(1000):03d}",
+        "status": "AVAILABLE" if rng.random() < 0.9 else "IN_REPAIR",
+    }
+
+
+@rule("GearAssignment", "vehicleId", "packStatus", "shiftId")
+def _gear_assignment(ds, rng, i):
+    event = ds.parent_of("GearAssignment", i)
+    shifts = ds.child_range("Shift", event)
+    # Kit is dealt out across the event's shifts in order (a shift override, no extra draws)
+    shift = shifts[(i - ds.child_range("GearAssignment", event).start) % len(shifts)] if shifts else None
+    return {
+        "eventId": event,
+        "shiftId": shift,
+        "gearId": rng.randrange(ds.count("Gear")),
+        "vehicleId": rng.randrange(ds.count("Vehicle")) if rng.random() < 0.8 else None,
+        "packStatus": _weighted(rng, [("NEEDS_PACKING", 6), ("PACKED", 3), ("AT_EVENT", 1)]),
+    }
+
+
+@rule("OperatorBlackoutDate", "reason")
+def _blackout(ds, rng, i):
+    start = SEASON_START + rng.randrange(max(60, ds.count("Event") // 3)) * DAY
+    return {
+        "operatorId": rng.randrange(ds.count("Operator")),
+        "startDate": start,
+        "endDate": start + rng.randrange(0, 5) * DAY,
+        "reason": rng.choice(("Vacation", "Family event", "Other job", None)),
+    }
+
+
+@rule("OperatorGear", "status")
+def _operator_gear(ds, rng, i):
+    category, name = rng.choice(PERSONAL_GEAR)
+    return {
+        "operatorId": ds.parent_of("OperatorGear", i),
+        "name": name,
+        "category": category,
+        "type": category.title(),
+        "status": "AVAILABLE" if rng.random() < 0.95 else "NEEDS_REPAIR",
+    }
+
+
+@rule("OperatorGearRequest", "requestStatus", "isBorrowing")
+def _operator_gear_request(ds, rng, i):
+    """Asks one operator already on the shift to bring an item they own"""
+    shift = ds.parent_of("OperatorGearRequest", i)
+    assignments = ds.child_range("ShiftAssignment", shift)
+    if assignments:
+        operator = ds.table("ShiftAssignment").columns["operatorId"][rng.choice(assignments)]
+    else:
+        operator = rng.randrange(ds.count("Operator"))
+    owned = ds.child_range("OperatorGear", operator)
+    return {
+        "shiftId": shift,
+        "operatorId": operator,
+        "operatorGearId": rng.choice(owned) if owned else rng.randrange(ds.count("OperatorGear")),
+        "requestStatus": _weighted(rng, [("REQUESTED", 4), ("CONFIRMED", 5), ("DECLINED", 1)]),
+        "isBorrowing": False,
+    }
+
+
+@rule("SkillDefinition", "sortOrder", "isActive")
+def _skill_definition(ds, rng, i):
+    name, label = SKILLS[i] if i < len(SKILLS) else (f"skill{i + 1}", f"Skill {i + 1}")
+    return {"skillName": name, "displayName": label, "sortOrder": i, "isActive": True}
+
+
+@rule("OperatorSkill", "skillLevel")
+def _operator_skill(ds, rng, i):
+    operator = ds.parent_of("OperatorSkill", i)
+    # Consecutive skills from a per-operator offset, so an operator never gets one twice
+    offset = operator * 5 % ds.count("SkillDefinition")
+    position = i - ds.child_range("OperatorSkill", operator).start
+    return {
+        "operatorId": operator,
+        "skillDefinitionId": (offset + position) % ds.count("SkillDefinition"),
+        "skillLevel": rng.randrange(3, 11),
+    }
+
+
+PACKING_LIST = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Packing List</h2>
+            <p class="text-gray-600 mt-1">{event_name} • {venue}</p>
+        </div>
+
+        <div class="grid grid-cols-3 gap-6">
+            <div class="col-span-2">
+                <div class="bg-white rounded-lg shadow">
+                    <div class="p-6 border-b border-gray-200">
+                        <h3 class="text-lg font-semibold">Equipment Checklist ({total} items)</h3>
+                    </div>
+                    <div class="divide-y">{rows}
+                    </div>
+                </div>
+            </div>
+
+            <div>
+                <div class="bg-white rounded-lg shadow p-6">
+                    <h3 class="text-sm font-semibold mb-4">Summary</h3>
+                    <div class="space-y-2 text-sm">
+                        <div class="flex justify-between">
+                            <span class="text-gray-600">Total Items:</span>
+                            <span class="font-medium">{total}</span>
+                        </div>
+                        <div class="flex justify-between">
+                            <span class="text-gray-600">Packed:</span>
+                            <span class="font-medium text-green-600">{packed}</span>
+                        </div>
+                        <div class="flex justify-between">
+                            <span class="text-gray-600">Remaining:</span>
+                            <span class="font-medium text-yellow-600">{remaining}</span>
+                        </div>
+                    </div>
+                    <button class="w-full mt-4 px-4 py-2 bg-purple-600 text-white rounded-lg">Mark All Packed</button>
+                </div>
+            </div>
+        </div>
+''')
+PACKING_ROW = CompiledTemplate('''
+                        <label class="flex items-center p-4 hover:bg-gray-50 cursor-pointer">
+                            <input type="checkbox"{checked} class="w-5 h-5 text-purple-600 rounded">
+                            <div class="ml-4 flex-1">
+                                <div class="font-medium">{icon} {name}</div>
+                                <div class="text-sm text-gray-500">{category} • Serial: {serial}</div>
+                            </div>
+                            {status}
+                        </label>''')
+PACKED = b'<span class="text-sm text-green-600">\xe2\x9c\x93 Packed</span>'
+IN_SHOP = b'<span class="text-sm text-gray-500">In Shop</span>'
+
+SEND_GIG_SHEETS = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Send Gig Sheets</h2>
+            <p class="text-gray-600 mt-1">{event_name}</p>
+        </div>
+
+        <div class="bg-white rounded-lg shadow">
+            <div class="p-6 border-b border-gray-200">
+                <h3 class="text-lg font-semibold">Select Operators ({total})</h3>
+            </div>
+            <div class="divide-y">{rows}
+            </div>
+        </div>
+''')
+OPERATOR_ROW = CompiledTemplate('''
+                <label class="flex items-center p-4 hover:bg-gray-50 cursor-pointer">
+                    <input type="checkbox" checked class="w-5 h-5 text-purple-600 rounded">
+                    <div class="ml-4 flex-1">
+                        <div class="font-medium">{name}</div>
+                        <div class="text-sm text-gray-500">{email} • {shifts}</div>
+                    </div>
+                    <button class="text-sm text-purple-600 hover:underline">Preview</button>
+                </label>''')
+
+
+def render_packing_list(ds, event, path):
+    """17-packing-list for one event, gear rows streamed straight into the file"""
+    events, gear = ds.table("Event"), ds.table("Gear")
+    assignments = ds.child_range("GearAssignment", event)
+    packed_code = ds.enums["PackStatus"].index("PACKED")
+    if ds.count("GearAssignment") <= 1_000_000:
+        pack_status = ds.table("GearAssignment").column("packStatus")
+        packed = sum(pack_status[i] == packed_code for i in assignments)
+    else:
+        # Too big to tabulate: the summary comes before the rows, so count this event's range in its own pass
+        packed = sum(a.packStatus == "PACKED" for a in ds.stream("GearAssignment", assignments.start, assignments.stop))
+
+    def rows():
+        for assignment in ds.stream("GearAssignment", assignments.start, assignments.stop):
+            item = gear[assignment.gearId]
+            done = assignment.packStatus == "PACKED"
+            yield PACKING_ROW.bind(
+                checked=" checked" if done else "",
+                icon=GEAR_ICONS[item.category],
+                name=html.escape(item.name),
+                category=item.type,
+                serial=html.escape(item.serialNumber or "-"),
+                status=PACKED if done else IN_SHOP,
+            )
+
+    row = events[event]
+    write_page(path, "Packing List", PACKING_LIST.bind(
+        event_name=html.escape(row.eventName), venue=html.escape(row.venueName),
+        total=str(len(assignments)), packed=str(packed), remaining=str(len(assignments) - packed),
+        rows=Repeat(rows()),
+    ))
+    return len(assignments)
+
+
+def render_send_gig_sheets(ds, event, path):
+    """20-send-gig-sheets listing every operator booked on the event's shifts"""
+    shifts = ds.child_range("Shift", event)
+    first = ds.child_range("ShiftAssignment", shifts.start).start
+    last = ds.child_range("ShiftAssignment", shifts.stop - 1).stop if shifts else first
+    booked = Counter(a.operatorId for a in ds.stream("ShiftAssignment", first, last))
+    operators = ds.table("Operator")
+
+    def rows():
+        for operator, count in sorted(booked.items()):
+            person = operators[operator]
+            yield OPERATOR_ROW.bind(
+                name=html.escape(person.name), email=html.escape(person.email),
+                shifts=f"{count} shift{'s' if count != 1 else ''}",
+            )
+
+    write_page(path, "Send Gig Sheets", SEND_GIG_SHEETS.bind(
+        event_name=html.escape(ds.table("Event")[event].eventName),
+        total=str(len(booked)), rows=Repeat(rows()),
+    ))
+    return len(booked)
+
+
+def parse_count(text):
+    model, _, value = text.partition("=")
+    if not value.isdigit():
+        raise argparse.ArgumentTypeError(f"expected MODEL=N, got {text!r}")
+    return model, int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic fixtures from schema.prisma")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N",
+                        help="rows for a model, e.g. Shift=1000000 (parents/children scale to match)")
+    parser.add_argument("--schema", default=SCHEMA_PATH)
+    parser.add_argument("--stream", metavar="MODEL", help="generate every row of MODEL and report speed, memory and digest")
+    parser.add_argument("--show", type=int, default=0, metavar="N", help="print the first N records of each model")
+    parser.add_argument("--render", metavar="DIR", help="write packing list and send-gig-sheets pages for --event")
+    parser.add_argument("--event", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ds = Dataset(args.seed, dict(args.count), args.schema)
+    if args.stream:
+        start = time.perf_counter()
+        digest = hashlib.blake2b(digest_size=16)
+        rows = 0
+        for record in ds.stream(args.stream):
+            digest.update(repr(record).encode())
+            rows += 1
+        elapsed = time.perf_counter() - start
+        peak = f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB" if resource else "n/a"  # KiB on Linux
+        print(f"{args.stream}: {rows} rows in {elapsed:.2f}s ({rows / (elapsed or 1):,.0f}/s), "
+              f"peak RSS {peak}, digest {digest.hexdigest()}")
+        for model, table in ds._tables.items():
+            print(f"  {model} table: {len(table)} rows, {table.nbytes() / 2 ** 20:.1f} MB")
+    for model in DEFAULT_COUNTS:
+        if args.show:
+            for record in ds.stream(model, 0, args.show):
+                print(record)
+    if args.render:
+        items = render_packing_list(ds, args.event, os.path.join(args.render, "17-packing-list.html"))
+        people = render_send_gig_sheets(ds, args.event, os.path.join(args.render, "20-send-gig-sheets.html"))
+        print(f"Created: {args.render}/17-packing-list.html ({items} items)")
+        print(f"Created: {args.render}/20-send-gig-sheets.html ({people} operators)")
+    if not (args.stream or args.show or args.render):
+        for model in DEFAULT_COUNTS:
+            print(f"{model:<22} {ds.count(model):>10} rows  {len(ds.fields(model))} fields")
+
+
+if __name__ == "__main__":
+    main()
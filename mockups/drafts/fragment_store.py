@@ -0,0 +1,63 @@
+"""On-disk store of mockup page fragments with a small streaming index
+
+fragments/index.jsonl holds one {"num", "filename", "title", "fragment"} entry
+per line; each fragment file holds the page's <main> content. Iterating the
+store reads only the index, one line at a time, and content is loaded only
+for the pages that actually get rendered.
+"""
+
+import json
+import os
+
+INDEX_NAME = "index.jsonl"
+
+
+class FragmentStore:
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_NAME)
+
+    def __iter__(self):
+        """Yield index entries as mockup dicts whose "fragment" is a full path"""
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entry["fragment"] = os.path.join(self.root, entry["fragment"])
+                    yield entry
+
+    def select(self, only=None, skip=()):
+        """Entries whose num or filename is in `only` (all entries when empty) and not in `skip`"""
+        wanted = {str(key) for key in only} if only else None
+        skipped = {str(key) for key in skip}
+        for entry in self:
+            keys = {str(entry["num"]), entry["filename"]}
+            if (wanted is None or keys & wanted) and not keys & skipped:
+                yield entry
+
+    def add(self, num, filename, title, content):
+        """Append a new page to the store"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+        entry = {"num": num, "filename": filename, "title": title, "fragment": filename}
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def load_content(mockup):
+    """Page content from an inline "content" key or, lazily, its fragment file"""
+    content = mockup.get("content")
+    if content is None:
+        with open(mockup["fragment"], encoding="utf-8") as f:
+            content = f.read()
+    return content
+
+
+def source_signature(mockup):
+    """Cheap stat-based identity of a page's fragment, used to skip reading it"""
+    path = mockup.get("fragment")
+    if path is None:
+        return None
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
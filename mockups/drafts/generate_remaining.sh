@@ -1,4 +1,8 @@
-# Script to track mockup progress
-# Created: 1-5 (done)
-# Remaining: 6-25
-echo "Mockups completed: 5/25"
+#!/bin/bash
+# Build every mockup artefact: pages, CSS, screenshots, diffs and the bundle
+# Usage: ./generate_remaining.sh [task ...] [-j N] [--renderer stub] [--accept]
+
+cd "$(dirname "$0")"
+
+# Progress ([n/N] per task) and the critical path are printed by build.py
+python3 build.py "$@"
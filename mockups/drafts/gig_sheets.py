@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Stream one personalized gig sheet per operator of an event
+
+The parent walks the event's assignments once and reduces each operator's
+shifts, pay math, travel itinerary, company kit and bring-your-own requests
+to a tuple of ready-escaped strings. Chunks of those go to a process pool
+that renders them through the precompiled page chrome; pages are written to
+a directory (by the workers) or into one zip archive (by the parent) as
+chunks finish. Only a few chunks are in flight at once, so memory stays flat
+however many operators the event has.
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+import payroll
+from page_helpers import chrome, clock
+from page_template import CompiledTemplate, Repeat
+from travel_time import CACHE_DIR, TravelMatrix, format_range, home_id, home_locations, traffic_label, venue_id
+
+try:
+    import resource
+except ImportError:  # Unix only: on Windows no peak RSS is reported
+    resource = None
+
+BUFFER_MINUTES = 5  # arrive this long before the first shift, on top of the worst-case drive
+
+GIG_SHEET = CompiledTemplate('''
+        <div class="max-w-4xl mx-auto">
+            <div class="bg-white rounded-lg shadow p-8">
+                <div class="text-center mb-6">
+                    <h1 class="text-3xl font-bold text-gray-900">GIG SHEET</h1>
+                    <p class="text-gray-600 mt-2">{event_name}</p>
+                </div>
+
+                <div class="space-y-6">
+                    <div class="border-l-4 border-purple-500 pl-4">
+                        <h2 class="font-semibold text-gray-900">OPERATOR</h2>
+                        <p class="text-gray-700">{name}</p>
+                        <p class="text-sm text-gray-600">{contact}</p>
+                    </div>
+
+                    <div class="border-l-4 border-blue-500 pl-4">
+                        <h2 class="font-semibold text-gray-900">EVENT DETAILS</h2>
+                        <p class="text-gray-700">Client: {client}</p>
+                        <p class="text-gray-700">Venue: {venue}</p>
+                        <p class="text-sm text-gray-600">{address}</p>
+                    </div>
+
+                    <div class="border-l-4 border-green-500 pl-4">
+                        <h2 class="font-semibold text-gray-900 mb-3">YOUR SHIFTS</h2>
+                        <div class="space-y-3">{shifts}
+                        </div>
+                        <div class="text-sm font-semibold text-gray-900 mt-3">Total: {total}</div>
+                    </div>
+
+                    <div class="border-l-4 border-yellow-500 pl-4">
+                        <h2 class="font-semibold text-gray-900 mb-2">TRAVEL ITINERARY</h2>
+                        <div class="text-sm space-y-2">{itinerary}
+                        </div>
+                    </div>
+
+                    <div class="border-l-4 border-red-500 pl-4">
+                        <h2 class="font-semibold text-gray-900 mb-2">COMPANY EQUIPMENT</h2>
+                        <ul class="text-sm space-y-1">{equipment}
+                        </ul>
+                    </div>
+
+                    <div class="border-l-4 border-purple-500 pl-4">
+                        <h2 class="font-semibold text-gray-900 mb-2">🎒 BRING YOUR OWN</h2>
+                        <ul class="text-sm space-y-1 text-gray-700">{byo}
+                        </ul>
+                    </div>
+                </div>
+            </div>
+        </div>
+''')
+SHIFT_BOX = CompiledTemplate('''
+                            <div class="bg-gray-50 p-3 rounded">
+                                <div class="font-medium">{title}</div>
+                                <div class="text-sm text-gray-600">{when}</div>
+                                <div class="text-sm text-gray-600">Pay: {pay}</div>
+                            </div>''')
+STOP = CompiledTemplate('''
+                            <div>{text}</div>''')
+NOTE = CompiledTemplate('''
+                            <div class="ml-4 text-gray-600">{text}</div>''')
+ITEM = CompiledTemplate('''
+                            <li>• {text}</li>''')
+NONE = ITEM.bind(text="None")
+
+
+def _duration(seconds):
+    hours, minutes = divmod(seconds // 60, 60)
+    if not minutes:
+        return f"{hours} hour{'s' if hours != 1 else ''}"
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes} min"
+
+
+def _money(cents):
+    return f"${cents / 100:,.2f}"
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _home_legs(ds, travel, operators, event, arrivals):
+    """(leave time, 'low-high min', traffic note, has home) per operator for the drive to the venue
+
+    Drive times come from the travel_time cache; the venue and any homes it has not
+    seen yet are added to it first.
+    """
+    venue = venue_id(event.venueName)
+    homes = home_locations(ds, operators)
+    if travel.add([(venue, event.venueLat, event.venueLng)] + homes):
+        travel.save()
+    known = {location for location, _, _ in homes}
+    has_home = np.array([home_id(op) in known for op in operators], dtype=bool)
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    low = np.zeros(len(arrivals), dtype=np.int64)
+    high = np.zeros(len(arrivals), dtype=np.int64)
+    if known:
+        low[has_home], high[has_home] = travel.ranges([location for location, _, _ in homes],
+                                                      [venue] * len(homes), arrivals[has_home])
+    leave = arrivals - (high + BUFFER_MINUTES) * 60
+    leave -= leave % 300
+    return [
+        (int(t), format_range(int(lo), int(hi)), traffic_label(int(t)) or "light traffic", bool(home))
+        for t, lo, hi, home in zip(leave, low, high, has_home)
+    ]
+
+
+def prepare(ds, event, pay=None, travel=None):
+    """Yield one sheet per operator on the event: (operator, filename, title, content values)
+
+    Pay comes from `pay` (a payroll.Payroll over the whole season, so overtime counts shifts
+    worked at other events the same day); it is computed when not given. Drive times come
+    from `travel`, a travel_time.TravelMatrix (the default cache when not given).
+    """
+    events, shifts, operators = ds.table("Event"), ds.table("Shift"), ds.table("Operator")
+    record = events[event]
+    shift_range = ds.child_range("Shift", event)
+    if not shift_range:
+        return
+    first = ds.child_range("ShiftAssignment", shift_range.start).start
+    last = ds.child_range("ShiftAssignment", shift_range.stop - 1).stop
+    assignments = ds.table("ShiftAssignment")
+    cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    columns = [assignments.columns[name] for name in ("shiftId", "operatorId", "status")]
+
+    # Operator -> their assignment rows; shift -> operators on it in row order (for dealing out kit)
+    booked, crew = {}, {}
+    for i in range(first, last):
+        shift, op, status = (column[i] for column in columns)
+        if status == cancelled:
+            continue
+        booked.setdefault(op, []).append(i)
+        crew.setdefault(shift, []).append(op)
+
+    gear, gear_rows = ds.table("Gear"), ds.table("GearAssignment")
+    kit, dealt = {}, Counter()
+    for i in ds.child_range("GearAssignment", event):
+        shift = gear_rows.columns["shiftId"][i]
+        on_shift = crew.get(shift)
+        if on_shift:
+            op = on_shift[dealt[shift] % len(on_shift)]
+            dealt[shift] += 1
+            kit.setdefault(op, []).append(gear[gear_rows.columns["gearId"][i]].name)
+
+    owned, requests = ds.table("OperatorGear"), ds.table("OperatorGearRequest")
+    declined = {ds.enums["RequestStatus"].index(s) for s in ("DECLINED", "CANCELLED")}
+    confirmed = ds.enums["RequestStatus"].index("CONFIRMED")
+    byo = {}
+    for shift in shift_range:
+        for i in ds.child_range("OperatorGearRequest", shift):
+            status = requests.columns["requestStatus"][i]
+            if status in declined:
+                continue
+            item = owned[requests.columns["operatorGearId"][i]].name
+            line = f"✓ {item} (confirmed)" if status == confirmed else f"⚠️ {item} (requested)"
+            byo.setdefault(requests.columns["operatorId"][i], set()).add(line)
+
+    starts, ends = shifts.columns["startTime"], shifts.columns["endTime"]
+    order = sorted(booked, key=lambda op: (min(starts[assignments.columns["shiftId"][i]] for i in booked[op]), op))
+    arrivals = [min(starts[assignments.columns["shiftId"][i]] for i in booked[op]) for op in order]
+    if travel is None:
+        travel = TravelMatrix()
+    legs = _home_legs(ds, travel, order, record, arrivals)
+    if pay is None:
+        pay = payroll.from_dataset(ds)
+    venue = html.escape(record.venueName)
+
+    for op, (leave, drive, traffic, has_home) in zip(order, legs):
+        person = operators[op]
+        rows = sorted((assignments[i] for i in booked[op]), key=lambda a: starts[a.shiftId])
+        shift_boxes, stops, total, previous = [], [], 0, None
+        if has_home and person.homeAddress:
+            stops.append(STOP.bind(text=f"🏠 {clock(leave)} - Leave Home ({html.escape(person.homeAddress)})"))
+            stops.append(NOTE.bind(text=f"↓ {drive} ({traffic})"))
+        for n, a in enumerate(rows, 1):
+            start, end = starts[a.shiftId], ends[a.shiftId]
+            line = payroll.row_of(pay, a.id)
+            total += int(pay.total[line])
+            shift_boxes.append(SHIFT_BOX.bind(
+                title=f"{html.escape(shifts[a.shiftId].shiftName)} - {a.role.title()}",
+                when=f"{clock(start)} - {clock(end)} ({_duration(end - start)})", pay=pay.line(line),
+            ))
+            if previous is None:
+                stops.append(STOP.bind(text=f"📍 {clock(start)} - Arrive {venue}"))
+            else:
+                if start > previous:
+                    stops.append(NOTE.bind(text=f"({_duration(start - previous)} break)"))
+                stops.append(STOP.bind(text=f"📍 {clock(start)} - Shift {n} (same venue)"))
+            previous = end
+        stops.append(STOP.bind(text=f"🏁 {clock(previous)} - Wrap"))
+        contact = " • ".join(html.escape(v) for v in (person.email, person.phone) if v)
+        yield (
+            op,
+            f"{op:05d}-{_slug(person.name)}.html",
+            f"Gig Sheet - {person.name}",
+            dict(
+                event_name=html.escape(record.eventName), name=html.escape(person.name), contact=contact,
+                client=html.escape(record.clientName or "-"), venue=venue,
+                address=html.escape(record.venueAddress or ""),
+                shifts=shift_boxes, total=_money(total), itinerary=stops,
+                equipment=[ITEM.bind(text=html.escape(name)) for name in kit.get(op, ())],
+                byo=[ITEM.bind(text=html.escape(line)) for line in sorted(byo.get(op, ()))],
+            ),
+        )
+
+
+def render_sheet(title, values):
+    values = dict(values, shifts=Repeat(values["shifts"]), itinerary=Repeat(values["itinerary"]),
+                  equipment=Repeat(values["equipment"] or [NONE]), byo=Repeat(values["byo"] or [NONE]))
+    return chrome().render_bytes(title=html.escape(title), content=GIG_SHEET.bind(**values))
+
+
+def render_chunk(chunk, out_dir=None):
+    """Worker: render a chunk of sheets; writes them under out_dir, else returns (name, bytes) pairs"""
+    done = []
+    for _, filename, title, values in chunk:
+        data = render_sheet(title, values)
+        if out_dir is None:
+            done.append((filename, data))
+        else:
+            with open(os.path.join(out_dir, filename), "wb") as f:
+                f.write(data)
+            done.append((filename, len(data)))
+    return done
+
+
+def _chunks(sheets, size):
+    sheets = iter(sheets)
+    while True:
+        chunk = list(islice(sheets, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate(ds, event, out_dir=None, archive=None, jobs=1, chunk=64, travel=None):
+    """Write every sheet of an event to out_dir or into the zip at `archive`; returns (sheets, bytes)"""
+    if (out_dir is None) == (archive is None):
+        raise ValueError("give exactly one of out_dir and archive")
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    target = None if archive is not None else out_dir
+    chunks = _chunks(prepare(ds, event, travel=travel), chunk)
+
+    def results():
+        if jobs <= 1:
+            for c in chunks:
+                yield render_chunk(c, target)
+            return
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque()
+            for c in chunks:
+                pending.append(pool.submit(render_chunk, c, target))
+                # Bounded look-ahead keeps memory flat and every worker busy
+                if len(pending) >= jobs * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    count = size = 0
+    if archive is None:
+        for done in results():
+            count += len(done)
+            size += sum(n for _, n in done)
+        return count, size
+    os.makedirs(os.path.dirname(archive) or ".", exist_ok=True)
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for done in results():
+            for filename, data in done:
+                zf.writestr(filename, data)
+                count += 1
+                size += len(data)
+    return count, size
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Generate a gig sheet for every operator of an event")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N")
+    parser.add_argument("--festival", type=int, metavar="OPERATORS",
+                        help="one event with 12 shifts crewed from this many operators (overrides --count)")
+    parser.add_argument("--event", type=int, default=0)
+    parser.add_argument("-o", "--out-dir", default="gig-sheets")
+    parser.add_argument("--archive", metavar="ZIP", help="write the sheets into one zip instead of --out-dir")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=64, help="sheets per worker task")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="travel-time cache (see travel_time.py)")
+    args = parser.parse_args(argv)
+
+    counts = dict(args.count)
+    if args.festival:
+        n = args.festival
+        counts = {"Event": 1, "Shift": 12, "ShiftAssignment": 3 * n, "Operator": n,
+                  "GearAssignment": n, "OperatorGearRequest": n // 2}
+        args.event = 0
+    ds = Dataset(args.seed, counts)
+    start = time.perf_counter()
+    count, size = generate(ds, args.event, None if args.archive else args.out_dir, args.archive, args.jobs, args.chunk,
+                           TravelMatrix(args.cache_dir))
+    elapsed = time.perf_counter() - start
+    where = args.archive or args.out_dir
+    peak = "n/a"
+    if resource is not None:
+        rss = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+        peak = f"{rss / 1024:.0f} MB"
+    print(f"{count} gig sheets ({size / 2 ** 20:.1f} MB of HTML) -> {where} in {elapsed:.2f}s "
+          f"({count / max(elapsed, 1e-9):,.0f} sheets/s, peak RSS {peak})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Helpers shared by the data-driven page renderers
+
+The fixture-backed pages (availability, conflicts, travel, payroll, gig
+sheets, packing lists, search) all wrap their content in the same chrome as
+the static mockups, format times the same way and read int64 fixture columns
+as numpy arrays; those pieces live here instead of in each module.
+"""
+
+import os
+
+
+def chrome():
+    """The shared page template from create_remaining_mockups (imported on first use)"""
+    from create_remaining_mockups import page_template
+
+    return page_template
+
+
+def write_page(path, title, content):
+    """Stream `content` wrapped in the page chrome to `path`, creating its directory"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        chrome().write(f, title=title, content=content)
+
+
+def column(table, name):
+    """An int64 fixture column as a zero-copy numpy array"""
+    # Local so fixtures, which only needs write_page, stays numpy-free
+    import numpy as np
+
+    return np.frombuffer(table.column(name), dtype=np.int64)
+
+
+def clock(ts):
+    """'8:05 PM' for epoch seconds (UTC)"""
+    hour, minute = ts % 86400 // 3600, ts % 3600 // 60
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Mockup pages discovered on disk, with a stat-keyed cache of their titles
+
+Round directories are walked with os.scandir. A page's number comes from
+its filename ("07-operators.html" -> 7) and its title from the <title> in
+the first kilobyte of the file, which is all that is read. Results are
+cached in .page-index.json keyed by path, size and mtime, so later runs
+only stat the files and a thousand-page listing takes a few milliseconds.
+Nothing is hard-coded: a page added, renamed or deleted on disk shows up
+(or disappears) on the next run.
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(HERE, ".page-index.json")
+CACHE_VERSION = 1
+ROUND_PREFIXES = ("round-", "working-versions")
+HEAD_BYTES = 1024
+MAX_HEAD_BYTES = 8192
+
+_NUM = re.compile(r"(?:^|-)(\d{1,3})-")
+_TITLE = re.compile(rb"<title[^>]*>(.*?)</title", re.S | re.I)
+_SUFFIX = " - CommandCentered"
+
+
+class Page:
+    __slots__ = ("path", "num", "title")
+
+    def __init__(self, path, num, title):
+        self.path = path
+        self.num = num
+        self.title = title
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def __repr__(self):
+        return f"Page({self.path!r}, {self.num!r}, {self.title!r})"
+
+
+def page_number(filename):
+    """Leading (or after a "streamlined-" style prefix) page number, else None"""
+    m = _NUM.search(filename)
+    return int(m.group(1)) if m else None
+
+
+def read_title(path):
+    """<title> text from the head of the file only ("" if there is none)"""
+    with open(path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+        m = _TITLE.search(head)
+        if m is None and len(head) == HEAD_BYTES and b"</head" not in head.lower():
+            # Title not in the first kilobyte and the head goes on: look a little further
+            head += f.read(MAX_HEAD_BYTES - HEAD_BYTES)
+            m = _TITLE.search(head)
+    if m is None:
+        return ""
+    title = " ".join(html.unescape(m.group(1).decode("utf-8", "replace")).split())
+    return title[:-len(_SUFFIX)] if title.endswith(_SUFFIX) else title
+
+
+def round_dirs(root=HERE):
+    """The round directories (and working-versions) directly under root"""
+    with os.scandir(root) as it:
+        return sorted(e.path for e in it if e.is_dir() and e.name.startswith(ROUND_PREFIXES))
+
+
+class PageIndex:
+    """{path: [size, mtime_ns, num, title]} persisted between runs"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.parsed = 0
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _scan(self, directory, found, recursive=True):
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if recursive:
+                        self._scan(entry.path, found)
+                elif entry.name.endswith(".html") and entry.is_file():
+                    st = entry.stat()
+                    cached = self.entries.get(entry.path)
+                    if cached is None or cached[0] != st.st_size or cached[1] != st.st_mtime_ns:
+                        cached = [st.st_size, st.st_mtime_ns, page_number(entry.name), read_title(entry.path)]
+                        self.entries[entry.path] = cached
+                        self.parsed += 1
+                        self.dirty = True
+                    found.append(Page(entry.path, cached[2], cached[3]))
+
+    def pages(self, directories, recursive=True):
+        """Every .html page under the directories (or directly in them), sorted by path"""
+        found = []
+        for directory in directories:
+            self._scan(directory, found, recursive)
+        # Forget deleted pages that were under the directories just scanned
+        scanned = tuple(os.path.join(d, "") for d in directories)
+        seen = {page.path for page in found}
+        stale = [p for p in self.entries if p.startswith(scanned) and p not in seen
+                 and (recursive or os.path.dirname(p) in directories)]
+        for path in stale:
+            del self.entries[path]
+            self.dirty = True
+        found.sort(key=lambda page: page.path)
+        return found
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"  # build.py runs several converters at once
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def discover(directories=None, cache_path=CACHE_PATH, recursive=True):
+    """Pages under the directories (default: every round directory), using and refreshing the cache"""
+    index = PageIndex(cache_path)
+    pages = index.pages(directories if directories is not None else round_dirs(), recursive)
+    index.save()
+    return pages
+
+
+def bench(count):
+    """Time cold and warm listings of `count` synthetic pages; returns (cold, warm) seconds"""
+    with tempfile.TemporaryDirectory() as tmp:
+        per_round = max(1, count // 5)
+        for n in range(count):
+            d = os.path.join(tmp, f"round-{n // per_round + 1}")
+            os.makedirs(d, exist_ok=True)
+            with open(os.path.join(d, f"{n % per_round + 1:02d}-page.html"), "w", encoding="utf-8") as f:
+                f.write(f"<!DOCTYPE html>\n<html><head><title>Page {n} - CommandCentered</title></head>"
+                        f"<body>{'x' * 20000}</body></html>")
+        cache = os.path.join(tmp, "index.json")
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            pages = discover(round_dirs(tmp), cache)
+            timings.append(time.perf_counter() - start)
+        assert len(pages) == count
+        return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List mockup pages found on disk with their numbers and titles")
+    parser.add_argument("dirs", nargs="*", help="directories to scan (default: every round directory)")
+    parser.add_argument("--json", action="store_true", help="print the listing as JSON lines")
+    parser.add_argument("--bench", type=int, metavar="N", help="time cold and warm listings of N synthetic pages")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        cold, warm = bench(args.bench)
+        print(f"{args.bench:,} pages: cold {cold * 1000:.1f} ms (reads every head), warm {warm * 1000:.1f} ms (stat only)")
+        return
+
+    start = time.perf_counter()
+    index = PageIndex()
+    pages = index.pages([os.path.abspath(d) for d in args.dirs] if args.dirs else round_dirs())
+    index.save()
+    elapsed = time.perf_counter() - start
+    for page in pages:
+        rel = os.path.relpath(page.path)
+        if args.json:
+            print(json.dumps({"path": rel, "num": page.num, "title": page.title}, ensure_ascii=False))
+        else:
+            print(f"{page.num if page.num is not None else '-':>3}  {rel:<60} {page.title}")
+    print(f"{len(pages)} pages in {elapsed * 1000:.1f} ms ({index.parsed} heads read)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
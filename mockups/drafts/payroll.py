@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Vectorized payroll: pay for whole columns of shift assignments at once
+
+All money is int64 cents and all hours int64 hundredths of an hour, as in
+the fixtures, so every figure is exact and totals add up to the cent.
+
+Hourly assignments are paid at the assignment's rate (a rate that differs
+from the operator's profile rate was negotiated), with California-style
+daily overtime: hours past 8 in a day at 1.5x, past 12 at 2x, counted per
+operator per day across all their hourly shifts in start order. Flat-rate
+assignments pay the agreed amount and never earn or count toward overtime.
+Each component is rounded half up to the cent before summing.
+"""
+
+import argparse
+import html
+import os
+import time
+
+import numpy as np
+
+from page_helpers import column, write_page
+from page_template import CompiledTemplate, Repeat
+
+DAY = 86400
+OVERTIME_AFTER = 800  # hundredths of an hour in a day before time and a half
+DOUBLE_AFTER = 1200  # ... before double time
+NULL = -(2 ** 63)
+
+
+class Payroll:
+    """Pay columns for a set of assignments; every array is aligned with the input rows"""
+
+    def __init__(self, operator, event, start, hours, rate, flat_rate, profile_rate=None):
+        self.operator = np.asarray(operator, dtype=np.int64)
+        self.event = np.asarray(event, dtype=np.int64)
+        self.start = np.asarray(start, dtype=np.int64)
+        self.hours = np.asarray(hours, dtype=np.int64)
+        self.flat = np.asarray(flat_rate, dtype=np.int64) != NULL
+        self.flat_rate = np.where(self.flat, flat_rate, 0)
+        rate = np.asarray(rate, dtype=np.int64)
+        if profile_rate is not None:
+            profile_rate = np.asarray(profile_rate, dtype=np.int64)
+            rate = np.where(rate == NULL, profile_rate, rate)
+            self.negotiated = ~self.flat & (rate != profile_rate)
+        else:
+            self.negotiated = np.zeros(len(rate), dtype=bool)
+        self.rate = np.where(self.flat, 0, rate)
+        self.regular, self.overtime, self.double = self._split_hours()
+        self.regular_pay = (self.rate * self.regular + 50) // 100
+        self.overtime_pay = (self.rate * self.overtime * 3 + 100) // 200
+        self.double_pay = (self.rate * self.double * 2 + 50) // 100
+        self.total = self.regular_pay + self.overtime_pay + self.double_pay + self.flat_rate
+
+    def __len__(self):
+        return len(self.total)
+
+    def _split_hours(self):
+        """(regular, overtime, double) hundredths per row from hours worked earlier the same day"""
+        hours = np.where(self.flat, 0, self.hours)
+        day = self.start // DAY
+        # One int64 key sorts by operator then start, which also groups each operator-day
+        # (day is monotonic in start); a single argsort is several times faster than lexsort
+        offset = self.start - self.start.min(initial=0)
+        order = np.argsort(self.operator * (int(offset.max(initial=0)) + 1) + offset)
+        h = hours[order]
+        op, d = self.operator[order], day[order]
+        first = np.ones(len(h), dtype=bool)
+        first[1:] = (op[1:] != op[:-1]) | (d[1:] != d[:-1])
+        # Segmented cumsum: running total minus the total where this operator-day began
+        running = np.cumsum(h)
+        begins = np.maximum.accumulate(np.where(first, np.arange(len(h)), 0))
+        # Only `before` goes back to input order (scatters are the slow part); the split is elementwise
+        before = np.empty_like(h)
+        before[order] = running - h - (running - h)[begins]
+        after = before + hours
+        regular = np.clip(np.minimum(after, OVERTIME_AFTER) - before, 0, None)
+        overtime = np.clip(np.minimum(after, DOUBLE_AFTER) - np.maximum(before, OVERTIME_AFTER), 0, None)
+        double = np.clip(after - np.maximum(before, DOUBLE_AFTER), 0, None)
+        return regular, overtime, double
+
+    def _totals(self, keys, size):
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, keys, self.total)
+        return totals
+
+    def per_operator(self, operators=None):
+        """Total cents per operator index"""
+        size = operators if operators is not None else int(self.operator.max(initial=-1)) + 1
+        return self._totals(self.operator, size)
+
+    def per_event(self, events=None):
+        size = events if events is not None else int(self.event.max(initial=-1)) + 1
+        return self._totals(self.event, size)
+
+    def line(self, i):
+        """Pay math for one row, e.g. '$50/hr × 4h = $200.00'"""
+        if self.flat[i]:
+            return f"Flat Rate {money(self.flat_rate[i])}"
+        rate = int(self.rate[i])
+        parts = [f"{rate_label(rate)} × {hours_label(self.regular[i])}"] if self.regular[i] or not (
+            self.overtime[i] or self.double[i]) else []
+        if self.overtime[i]:
+            parts.append(f"OT {rate_label(rate * 3 // 2)} × {hours_label(self.overtime[i])}")
+        if self.double[i]:
+            parts.append(f"DT {rate_label(rate * 2)} × {hours_label(self.double[i])}")
+        return f"{' + '.join(parts)} = {money(self.total[i])}"
+
+
+def money(cents):
+    return f"${int(cents) / 100:,.2f}"
+
+
+def rate_label(cents):
+    cents = int(cents)
+    return f"${cents // 100}/hr" if cents % 100 == 0 else f"${cents / 100:.2f}/hr"
+
+
+def hours_label(hundredths):
+    return f"{int(hundredths) / 100:g}h"
+
+
+def from_dataset(ds):
+    """Payroll for every live (not cancelled) ShiftAssignment; `rows` maps back to table rows"""
+    assignments, shifts = ds.table("ShiftAssignment"), ds.table("Shift")
+    cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    rows = np.nonzero(np.frombuffer(assignments.column("status"), dtype=np.int16) != cancelled)[0]
+    shift = column(assignments, "shiftId")[rows]
+    hours = column(assignments, "estimatedHours")[rows]
+    if "actualHours" in assignments.columns:
+        actual = column(assignments, "actualHours")[rows]
+        hours = np.where(actual != NULL, actual, hours)
+    operator = column(assignments, "operatorId")[rows]
+    pay = Payroll(
+        operator, column(shifts, "eventId")[shift], column(shifts, "startTime")[shift], hours,
+        column(assignments, "hourlyRate")[rows], column(assignments, "flatRate")[rows],
+        profile_rate=column(ds.table("Operator"), "hourlyRate")[operator],
+    )
+    pay.rows = rows
+    pay.position = {int(row): i for i, row in enumerate(rows)} if len(rows) <= 1_000_000 else None
+    return pay
+
+
+def row_of(pay, assignment):
+    """Payroll position of a ShiftAssignment row (None if it was cancelled)"""
+    if pay.position is not None:
+        return pay.position.get(assignment)
+    i = int(np.searchsorted(pay.rows, assignment))
+    return i if i < len(pay.rows) and pay.rows[i] == assignment else None
+
+
+NEGOTIATION_PAGE = CompiledTemplate('''
+        <div class="max-w-2xl mx-auto">
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Payment Details</h2>
+            <p class="text-gray-600 mt-1">{name} • {shift_name} Shift</p>
+        </div>
+
+        <div class="space-y-6">
+            <div class="bg-white rounded-lg shadow p-6 border-2 {hourly_border}">
+                <div class="flex items-start justify-between">
+                    <div class="flex items-start">
+                        <input type="radio" name="pay_type"{hourly_checked} class="mt-1 w-5 h-5 text-purple-600">
+                        <div class="ml-3">
+                            <h3 class="text-lg font-semibold text-gray-900">Hourly Rate</h3>
+                            <p class="text-sm text-gray-600 mt-1">{rate_source}</p>
+                        </div>
+                    </div>
+                    <div class="text-right">
+                        <div class="text-2xl font-bold text-gray-900">{hourly_total}</div>
+                        <div class="text-sm text-gray-500">{hourly_math}</div>
+                    </div>
+                </div>
+
+                <div class="mt-4 pt-4 border-t border-gray-200">
+                    <div class="space-y-2 text-sm">{hourly_rows}
+                    </div>
+                </div>
+
+                <div class="mt-4 bg-blue-50 border border-blue-200 rounded p-3">
+                    <p class="text-sm text-blue-700">✓ Actual hours will be tracked after shift completion</p>
+                </div>
+            </div>
+
+            <div class="bg-white rounded-lg shadow p-6 border-2 {flat_border}">
+                <div class="flex items-start justify-between">
+                    <div class="flex items-start">
+                        <input type="radio" name="pay_type"{flat_checked} class="mt-1 w-5 h-5 text-purple-600">
+                        <div class="ml-3">
+                            <h3 class="text-lg font-semibold text-gray-900">Flat Rate</h3>
+                            <p class="text-sm text-gray-600 mt-1">Negotiated fixed amount</p>
+                        </div>
+                    </div>
+                    <div class="text-right">
+                        <div class="text-sm text-gray-500 mb-2">Enter amount:</div>
+                        <input type="number" class="w-32 px-3 py-2 border border-gray-300 rounded text-right font-semibold" placeholder="{flat_amount}"{flat_disabled}>
+                    </div>
+                </div>
+
+                <div class="mt-4 bg-yellow-50 border border-yellow-200 rounded p-3">
+                    <p class="text-sm text-yellow-700">⚠️ Flat rate = no overtime tracking. Fixed price regardless of actual hours.</p>
+                </div>
+            </div>
+
+            <div class="bg-white rounded-lg shadow p-6">
+                <h3 class="text-lg font-semibold text-gray-900 mb-4">Payroll Totals</h3>
+                <div class="space-y-2 text-sm">{totals}
+                </div>
+            </div>
+
+            <div class="flex justify-end space-x-4">
+                <button type="button" class="px-6 py-2 border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50">Cancel</button>
+                <button type="submit" class="px-6 py-2 bg-purple-600 text-white rounded-lg hover:bg-purple-700">Save Assignment</button>
+            </div>
+        </div>
+        </div>
+''')
+DETAIL_ROW = CompiledTemplate('''
+                        <div class="flex justify-between">
+                            <span class="text-gray-600">{label}:</span>
+                            <span class="font-medium text-gray-900">{value}</span>
+                        </div>''')
+REPORT_PAGE = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Payroll Report</h2>
+            <p class="text-gray-600 mt-1">{summary}</p>
+        </div>
+
+        <div class="grid grid-cols-4 gap-4 mb-6">{stats}
+        </div>
+
+        <div class="grid grid-cols-2 gap-6">
+            <div class="bg-white rounded-lg shadow">
+                <div class="p-4 border-b border-gray-200"><h3 class="font-semibold text-gray-900">Top Events by Payroll</h3></div>
+                <table class="w-full text-sm">
+                    <thead class="bg-gray-50 text-gray-500"><tr><th class="text-left p-3">Event</th><th class="text-right p-3">Payroll</th><th class="text-right p-3">Revenue</th><th class="text-right p-3">Margin</th></tr></thead>
+                    <tbody class="divide-y divide-gray-200">{events}
+                    </tbody>
+                </table>
+            </div>
+            <div class="bg-white rounded-lg shadow">
+                <div class="p-4 border-b border-gray-200"><h3 class="font-semibold text-gray-900">Top Earning Operators</h3></div>
+                <table class="w-full text-sm">
+                    <thead class="bg-gray-50 text-gray-500"><tr><th class="text-left p-3">Operator</th><th class="text-right p-3">Shifts</th><th class="text-right p-3">Overtime</th><th class="text-right p-3">Total</th></tr></thead>
+                    <tbody class="divide-y divide-gray-200">{operators}
+                    </tbody>
+                </table>
+            </div>
+        </div>
+''')
+STAT = CompiledTemplate('''
+            <div class="bg-white rounded-lg shadow p-4">
+                <div class="text-sm text-gray-500">{label}</div>
+                <div class="text-2xl font-bold text-gray-900 mt-1">{value}</div>
+            </div>''')
+TABLE_ROW = CompiledTemplate('''
+                        <tr><td class="p-3 text-gray-900">{name}</td><td class="p-3 text-right">{a}</td><td class="p-3 text-right">{b}</td><td class="p-3 text-right font-medium {tone}">{c}</td></tr>''')
+
+
+def render_pay_negotiation(ds, pay, assignment, path):
+    """08-shift-pay-negotiation for one ShiftAssignment row"""
+    i = row_of(pay, assignment)
+    if i is None:
+        raise ValueError(f"assignment {assignment} is cancelled")
+    record = ds.table("ShiftAssignment")[assignment]
+    person = ds.table("Operator")[record.operatorId]
+    shift = ds.table("Shift")[record.shiftId]
+    # What the hourly option would come to, even when the flat option was chosen
+    rate = int(pay.rate[i]) or person.hourlyRate
+    if pay.flat[i]:
+        hourly = Payroll([0], [0], [shift.startTime], [pay.hours[i]], [rate], [NULL])
+        j = 0
+    else:
+        hourly, j = pay, i
+    if pay.negotiated[i]:
+        source = f"Negotiated rate (profile {rate_label(person.hourlyRate)})"
+    else:
+        source = "Standard rate from operator profile"
+    rows = [("Hourly Rate", money(rate)), ("Estimated Hours", f"{pay.hours[i] / 100:g} hours"),
+            ("Overtime (if any)", f"{rate_label(rate * 3 // 2)} (time and half)")]
+    if hourly.overtime[j] or hourly.double[j]:
+        rows.append(("Overtime this shift", hours_label(hourly.overtime[j] + hourly.double[j])))
+    operator_total = pay.per_operator(ds.count("Operator"))[record.operatorId]
+    event = int(pay.event[i])
+    mask = (pay.operator == record.operatorId) & (pay.event == event)
+    totals = [
+        ("This shift", money(pay.total[i])),
+        (f"{html.escape(person.name)} on this event", money(pay.total[mask].sum())),
+        (f"{html.escape(person.name)} this season ({int((pay.operator == record.operatorId).sum())} shifts)",
+         money(operator_total)),
+        ("Event payroll", money(pay.total[pay.event == event].sum())),
+    ]
+    detail = lambda pairs: Repeat(DETAIL_ROW.bind(label=label, value=value) for label, value in pairs)
+    flat = bool(pay.flat[i])
+    write_page(path, "Shift Pay Negotiation", NEGOTIATION_PAGE.bind(
+        name=html.escape(person.name), shift_name=html.escape(shift.shiftName),
+        hourly_border="border-gray-200 hover:border-purple-300" if flat else "border-purple-500",
+        flat_border="border-purple-500" if flat else "border-gray-200 hover:border-purple-300",
+        hourly_checked="" if flat else " checked", flat_checked=" checked" if flat else "",
+        rate_source=source, hourly_total=money(hourly.total[j]),
+        hourly_math=f"{rate_label(rate)} × {pay.hours[i] / 100:g} hours", hourly_rows=detail(rows),
+        flat_amount=f"{pay.flat_rate[i] / 100:.2f}" if flat else f"{hourly.total[j] / 100:.2f}",
+        flat_disabled="" if flat else " disabled", totals=detail(totals),
+    ))
+
+
+def render_payroll_report(ds, pay, path, limit=10):
+    """Season payroll: headline figures, then the costliest events and best-paid operators"""
+    events, operators = ds.table("Event"), ds.table("Operator")
+    per_event = pay.per_event(ds.count("Event"))
+    per_operator = pay.per_operator(ds.count("Operator"))
+    shifts = np.bincount(pay.operator, minlength=ds.count("Operator"))
+    overtime = np.zeros(ds.count("Operator"), dtype=np.int64)
+    np.add.at(overtime, pay.operator, pay.overtime_pay + pay.double_pay)
+    revenue = np.frombuffer(events.column("revenueAmount"), dtype=np.int64)
+
+    def event_rows():
+        for e in np.argsort(-per_event, kind="stable")[:limit].tolist():
+            margin = revenue[e] - per_event[e] if revenue[e] != NULL else None
+            yield TABLE_ROW.bind(
+                name=html.escape(events[e].eventName), a=money(per_event[e]),
+                b=money(revenue[e]) if margin is not None else "-",
+                c=money(margin) if margin is not None else "-",
+                tone="text-red-600" if margin is not None and margin < 0 else "text-green-700",
+            )
+
+    def operator_rows():
+        for op in np.argsort(-per_operator, kind="stable")[:limit].tolist():
+            yield TABLE_ROW.bind(name=html.escape(operators[op].name), a=str(shifts[op]), b=money(overtime[op]),
+                                 c=money(per_operator[op]), tone="text-gray-900")
+
+    stats = [("Total payroll", money(pay.total.sum())), ("Overtime", money((pay.overtime_pay + pay.double_pay).sum())),
+             ("Flat-rate share", f"{pay.flat_rate.sum() / max(1, pay.total.sum()):.1%}"),
+             ("Negotiated rates", f"{int(pay.negotiated.sum()):,} shifts")]
+    write_page(path, "Payroll Report", REPORT_PAGE.bind(
+        summary=f"{len(pay):,} paid assignments • {int(np.count_nonzero(per_event))} events • "
+                f"{int(np.count_nonzero(per_operator))} operators",
+        stats=Repeat(STAT.bind(label=label, value=value) for label, value in stats),
+        events=Repeat(event_rows()), operators=Repeat(operator_rows()),
+    ))
+
+
+def bench(count, seed=0):
+    """Payroll for `count` synthetic assignments; returns seconds taken"""
+    rng = np.random.default_rng(seed)
+    operators = max(1, count // 25)
+    start = 1_740_787_200 + rng.integers(0, 365, count) * DAY + rng.integers(6, 20, count) * 3600
+    rate = rng.integers(35, 96, count) * 100
+    flat = np.where(rng.random(count) < 0.15, rng.integers(2, 9, count) * 5000, NULL)
+    args = (rng.integers(0, operators, count), rng.integers(0, count // 12 + 1, count), start,
+            rng.integers(2, 11, count) * 100 + rng.integers(0, 4, count) * 25, rate, flat)
+    began = time.perf_counter()
+    pay = Payroll(*args, profile_rate=rate)
+    pay.per_operator()
+    pay.per_event()
+    return time.perf_counter() - began, pay
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Compute a season's payroll from the fixtures")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N")
+    parser.add_argument("--render", metavar="DIR", help="write 08-shift-pay-negotiation and payroll-report to DIR")
+    parser.add_argument("--assignment", type=int, help="assignment for the negotiation page (default: one with overtime)")
+    parser.add_argument("--bench", type=int, metavar="N", help="time N synthetic assignments instead")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        elapsed, pay = bench(args.bench, args.seed)
+        print(f"{len(pay):,} assignments in {elapsed * 1000:.0f} ms; total {money(pay.total.sum())}, "
+              f"overtime {money((pay.overtime_pay + pay.double_pay).sum())}")
+        return
+
+    ds = Dataset(args.seed, dict(args.count))
+    ds.table("ShiftAssignment")
+    start = time.perf_counter()
+    pay = from_dataset(ds)
+    per_operator, per_event = pay.per_operator(ds.count("Operator")), pay.per_event(ds.count("Event"))
+    elapsed = time.perf_counter() - start
+    print(f"{len(pay):,} paid assignments in {elapsed * 1000:.1f} ms: total {money(pay.total.sum())} "
+          f"(overtime {money((pay.overtime_pay + pay.double_pay).sum())}, flat {money(pay.flat_rate.sum())}) "
+          f"across {np.count_nonzero(per_operator)} operators and {np.count_nonzero(per_event)} events")
+
+    if args.render:
+        assignment = args.assignment
+        if assignment is None:
+            with_overtime = np.nonzero(pay.overtime + pay.double)[0]
+            assignment = int(pay.rows[with_overtime[0] if len(with_overtime) else 0])
+        path = os.path.join(args.render, "08-shift-pay-negotiation.html")
+        render_pay_negotiation(ds, pay, assignment, path)
+        print(f"Created: {path} (assignment {assignment}: {pay.line(row_of(pay, assignment))})")
+        path = os.path.join(args.render, "payroll-report.html")
+        render_payroll_report(ds, pay, path)
+        print(f"Created: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Size-bounded LRU cache of rendered PNGs keyed by what produced them"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from build_manifest import content_hash
+
+INDEX_NAME = "index.json"
+# What a screenshot depends on besides the page itself: stylesheets, scripts and images
+_ASSET_RE = re.compile(rb"""<(?:link|script|img)\b[^>]*?\b(?:href|src)\s*=\s*["']([^"'#?]+)""", re.IGNORECASE)
+_digests = {}
+
+
+def linked_assets(html, base_dir):
+    """Local files `html` loads, resolved against base_dir; URLs with a scheme or host are left out"""
+    paths = []
+    for match in _ASSET_RE.finditer(html):
+        ref = match.group(1).decode("utf-8", "replace").strip()
+        if ref and ":" not in ref and not ref.startswith("//"):
+            paths.append(os.path.normpath(os.path.join(base_dir, ref)))
+    return sorted(set(paths))
+
+
+def asset_digests(html, base_dir):
+    """'name:sha256' per linked local asset ('name:missing' if absent), for cache_key
+
+    Digests are reused while a file's inode, size and mtime are unchanged, so the shared
+    stylesheet is read once per run rather than once per page.
+    """
+    parts = []
+    for path in linked_assets(html, base_dir):
+        name = os.path.relpath(path, base_dir)
+        try:
+            st = os.stat(path)
+        except OSError:
+            parts.append(f"{name}:missing")
+            continue
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached = _digests.get(path)
+        if cached is None or cached[0] != stamp:
+            with open(path, "rb") as f:
+                cached = _digests[path] = (stamp, hashlib.file_digest(f, "sha256").hexdigest())
+        parts.append(f"{name}:{cached[1]}")
+    return parts
+
+
+def cache_key(html, viewport, renderer_version, assets=()):
+    """Key for the PNG of `html`; `assets` (see asset_digests) make a changed stylesheet a miss"""
+    width, height = viewport
+    return content_hash(html, f"{width}x{height}", renderer_version, *assets)
+
+
+class PngCache:
+    """PNG files stored as <key>.png with an index of size and last-use tick.
+
+    Ticks are a persistent counter rather than timestamps so eviction order
+    is exact even when many entries are touched within one clock tick.
+    """
+
+    def __init__(self, root, max_bytes=512 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.tick = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(root, exist_ok=True)
+        try:
+            with open(os.path.join(root, INDEX_NAME), encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data["entries"]
+            self.tick = data["tick"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".png")
+
+    def _touch(self, key):
+        self.tick += 1
+        self.entries[key][1] = self.tick
+
+    def fetch(self, key, dest):
+        """Copy a cached PNG to dest; False on a miss"""
+        if key in self.entries:
+            try:
+                shutil.copyfile(self._path(key), dest)
+            except OSError:
+                del self.entries[key]
+            else:
+                self._touch(key)
+                self.hits += 1
+                return True
+        self.misses += 1
+        return False
+
+    def store(self, key, src):
+        tmp = self._path(key) + ".tmp"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, self._path(key))
+        self.entries[key] = [os.path.getsize(self._path(key)), 0]
+        self._touch(key)
+        self.evict()
+
+    def total_bytes(self):
+        return sum(size for size, _ in self.entries.values())
+
+    def evict(self):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k][1]):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries.pop(key)[0]
+            self.evicted += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def save(self):
+        tmp = os.path.join(self.root, INDEX_NAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tick": self.tick, "entries": self.entries}, f)
+        os.replace(tmp, os.path.join(self.root, INDEX_NAME))
+
+    def report(self):
+        lookups = self.hits + self.misses
+        rate = f"{100 * self.hits / lookups:.0f}%" if lookups else "n/a"
+        return (
+            f"PNG cache: {self.hits} hits, {self.misses} misses ({rate} hit rate), "
+            f"{self.evicted} evicted, {len(self.entries)} entries / "
+            f"{self.total_bytes() / (1024 * 1024):.1f} MB"
+        )
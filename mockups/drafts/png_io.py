@@ -0,0 +1,104 @@
+"""Minimal PNG encoding with only the standard library"""
+
+import struct
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(kind, data):
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    )
+
+
+def encode_png(width, height, rows, level=6):
+    """Encode 8-bit RGB rows (each `width * 3` bytes) as PNG bytes"""
+    raw = bytearray()
+    for row in rows:
+        raw.append(0)  # filter type: none
+        raw += row
+    if len(raw) != height * (width * 3 + 1):
+        raise ValueError("row data does not match image size")
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        PNG_SIGNATURE
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(bytes(raw), level))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(kind, line, prev, bpp):
+    """Undo one scanline's filter in place (line and prev are bytearrays)"""
+    n = len(line)
+    if kind == 0:
+        return
+    if kind == 1:
+        for i in range(bpp, n):
+            line[i] = (line[i] + line[i - bpp]) & 0xFF
+    elif kind == 2:
+        for i in range(n):
+            line[i] = (line[i] + prev[i]) & 0xFF
+    elif kind == 3:
+        for i in range(n):
+            left = line[i - bpp] if i >= bpp else 0
+            line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+    elif kind == 4:
+        for i in range(n):
+            left = line[i - bpp] if i >= bpp else 0
+            up_left = prev[i - bpp] if i >= bpp else 0
+            line[i] = (line[i] + _paeth(left, prev[i], up_left)) & 0xFF
+    else:
+        raise ValueError(f"bad PNG filter type {kind}")
+
+
+def decode_png(data):
+    """Decode an 8-bit, non-interlaced RGB/RGBA/grey PNG to (width, height, channels, pixels)
+
+    Pure Python and slow on filtered scanlines; callers that care about speed
+    should prefer Pillow when it is installed.
+    """
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+    pos = 8
+    idat = []
+    header = None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise ValueError("PNG has no IHDR chunk")
+    width, height, depth, colour, _, _, interlace = header
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(colour)
+    if depth != 8 or channels is None or interlace:
+        raise ValueError(f"unsupported PNG: depth={depth} colour={colour} interlace={interlace}")
+    raw = zlib.decompress(b"".join(idat))
+    stride = width * channels
+    pixels = bytearray(height * stride)
+    prev = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        line = bytearray(raw[start + 1:start + 1 + stride])
+        _unfilter(raw[start], line, prev, channels)
+        pixels[y * stride:(y + 1) * stride] = line
+        prev = line
+    return width, height, channels, bytes(pixels)
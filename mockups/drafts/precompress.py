@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Minified pages with precompressed .gz/.br sidecars, written in one pass
+
+A PageWriter is the binary file object a page renders into. It minifies the
+segments as they stream past and feeds each one straight to the page's temp
+file and to a gzip compressor and, when the optional brotli package is
+installed, a brotli one, each writing its own sidecar temp file. On close
+the temp files replace the outputs, so the whole page is never held in
+memory and nothing is read back from disk. A static host can serve the
+sidecars as-is.
+
+Callers that know the SHA-256 of what they last wrote (the build manifest
+keeps it) pass it as `previous`; when the new bytes hash the same and the
+sidecars are in place, the temp files are dropped and the outputs keep
+their mtimes.
+
+Minification is conservative so pages render exactly as before: comments
+are dropped and every whitespace run containing a newline becomes a single
+newline. The insides of <pre>, <textarea>, <script> and <style> are kept
+verbatim.
+
+Run directly to minify and precompress existing pages in place:
+
+    python precompress.py round-5-complete-suite
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz sidecars are written
+    brotli = None
+
+GZIP_LEVEL = 6  # level 9 costs 3x the CPU on these pages for sidecars 2% smaller
+BROTLI_QUALITY = 11
+SUFFIXES = (".gz", ".br")
+SIDECARS = SUFFIXES if brotli is not None else (".gz",)
+TMP_SUFFIX = ".tmp"
+
+_KEEP = re.compile(rb"<!--(?!\[if).*?-->|<(pre|textarea|script|style)\b.*?</\1\s*>", re.S | re.I)
+_BLANKS = b" \t\r\f"  # whitespace before a newline that joins its run (\s minus \n and \v)
+_OPENS = re.compile(rb"<!--(?!\[if)|<(pre|textarea|script|style)\b", re.I)
+_CLOSES = {tag: re.compile(rb"</" + tag + rb"\s*>", re.I) for tag in (b"pre", b"textarea", b"script", b"style")}
+_COMMENT_END = re.compile(rb"-->")
+
+
+def _safe_cut(buf):
+    """Length of the prefix of buf that can be minified without seeing more input"""
+    pos = 0
+    while True:
+        m = _OPENS.search(buf, pos)
+        if m is None:
+            break
+        end = (_CLOSES[m.group(1).lower()] if m.group(1) else _COMMENT_END).search(buf, m.end())
+        if end is None:
+            return m.start()
+        pos = end.end()
+    cut = len(buf.rstrip())  # a trailing whitespace run may continue in the next segment
+    tag = buf.rfind(b"<", 0, cut)
+    if tag >= 0 and buf.find(b">", tag, cut) < 0:
+        cut = tag  # an unfinished tag may turn out to be <script, <!-- ...
+    return cut
+
+
+def _collapse(data):
+    """Every whitespace run containing a newline -> one newline
+
+    Done line by line rather than with re.sub: a run is the blanks ending
+    one line, any blank lines, and the blanks starting the next.
+    """
+    lines = data.split(b"\n")
+    if len(lines) == 1:
+        return data
+    out = [lines[0].rstrip(_BLANKS)]
+    out += [line for line in (line.lstrip().rstrip(_BLANKS) for line in lines[1:-1]) if line]
+    out.append(lines[-1].lstrip())
+    return b"\n".join(out)
+
+
+def minify(data):
+    out, pos = [], 0
+    for m in _KEEP.finditer(data):
+        out.append(_collapse(data[pos:m.start()]))
+        if m.group(1):
+            out.append(m.group(0))
+        pos = m.end()
+    if not pos:
+        return _collapse(data)
+    out.append(_collapse(data[pos:]))
+    return b"".join(out)
+
+
+class Minifier:
+    """Incremental minify(): feed() bytes split anywhere, get minified bytes back"""
+
+    def __init__(self):
+        self._pending = b""
+
+    def feed(self, data):
+        buf = self._pending + data if self._pending else data
+        cut = _safe_cut(buf)
+        self._pending = buf[cut:]
+        return minify(buf[:cut])
+
+    def flush(self):
+        buf, self._pending = self._pending, b""
+        return minify(buf)
+
+
+def compressor(suffix):
+    """(feed, finish) functions of a streaming compressor for `suffix`
+
+    The gzip header carries no timestamp, so output is reproducible.
+    """
+    if suffix == ".br":
+        c = brotli.Compressor(quality=BROTLI_QUALITY)
+        return c.process, c.finish
+    c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip framing, mtime 0
+    return c.compress, c.flush
+
+
+def compress(data, suffix):
+    """Sidecar bytes for `suffix` in one call"""
+    feed, finish = compressor(suffix)
+    return feed(data) + finish()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class PageWriter:
+    """Binary file object for one output; the page and its sidecars appear on close()
+
+    After close, `size` is the bytes written, `digest` their SHA-256 and
+    `changed` whether anything on disk was replaced. Nothing is replaced if
+    the block raises.
+    """
+
+    def __init__(self, path, minify=True, sidecars=True, previous=None):
+        self.path = path
+        self.sidecars = SIDECARS if sidecars else ()
+        self.previous = previous
+        self._minifier = Minifier() if minify else None
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.digest = None
+        self.changed = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._out = open(path + TMP_SUFFIX, "wb")
+        self._streams = []
+        for suffix in self.sidecars:
+            feed, finish = compressor(suffix)
+            self._streams.append((suffix, feed, finish, open(path + suffix + TMP_SUFFIX, "wb")))
+
+    def _emit(self, data):
+        self._out.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+        for _, feed, _, f in self._streams:
+            f.write(feed(data))
+
+    def write(self, data):
+        out = self._minifier.feed(data) if self._minifier is not None else data
+        if out:
+            self._emit(out)
+        return len(data)
+
+    def writelines(self, segments):
+        for data in segments:
+            self.write(data)
+
+    def _unchanged(self):
+        if self.digest != self.previous or not os.path.exists(self.path):
+            return False
+        # Required sidecars present and no stale ones left from other options
+        return all(os.path.exists(self.path + s) == (s in self.sidecars) for s in SUFFIXES)
+
+    def _discard(self):
+        self._out.close()
+        _remove(self.path + TMP_SUFFIX)
+        for suffix, _, _, f in self._streams:
+            f.close()
+            _remove(self.path + suffix + TMP_SUFFIX)
+        self._out = None
+
+    def close(self):
+        if self._out is None:
+            return
+        if self._minifier is not None:
+            tail = self._minifier.flush()
+            if tail:
+                self._emit(tail)
+        for _, _, finish, f in self._streams:
+            f.write(finish())
+        self.digest = self._hash.hexdigest()
+        self.changed = not self._unchanged()
+        if not self.changed:
+            self._discard()
+            return
+        self._out.close()
+        for _, _, _, f in self._streams:
+            f.close()
+        self._out = None
+        # Sidecars first: if we die part-way the page is stale and the next build redoes all three
+        for suffix in SUFFIXES:
+            if suffix in self.sidecars:
+                os.replace(self.path + suffix + TMP_SUFFIX, self.path + suffix)
+            else:
+                _remove(self.path + suffix)  # stale: options changed or brotli went away
+        os.replace(self.path + TMP_SUFFIX, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._out is not None:
+            self._discard()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minify pages in place and write .gz/.br sidecars")
+    parser.add_argument("paths", nargs="+", help="HTML/CSS files or directories of them")
+    parser.add_argument("--pretty", action="store_true", help="keep whitespace; only write sidecars")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "**", "*.html"), recursive=True))
+            files += sorted(glob.glob(os.path.join(path, "**", "*.css"), recursive=True))
+        else:
+            files.append(path)
+    if not files:
+        sys.exit("no pages found")
+
+    before = after = written = 0
+    packed = dict.fromkeys(SIDECARS, 0)
+    for path in files:
+        with open(path, "rb") as f:
+            data = f.read()
+        # The file being replaced is the one just read, so its hash is what "unchanged" means
+        with PageWriter(path, minify=not args.pretty and path.endswith(".html"),
+                        previous=hashlib.sha256(data).hexdigest()) as out:
+            out.write(data)
+        before += len(data)
+        after += out.size
+        written += out.changed
+        for suffix in SIDECARS:
+            packed[suffix] += os.path.getsize(path + suffix)
+    sizes = ", ".join(f"{suffix} {n / 1024:,.1f} KB" for suffix, n in packed.items())
+    print(f"{len(files)} files ({written} rewritten): {before / 1024:,.1f} KB -> "
+          f"{after / 1024:,.1f} KB minified; {sizes}")
+    if brotli is None:
+        print("brotli not installed: pip install brotli for .br sidecars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Opt-in per-stage instrumentation with Chrome trace output
+
+    with span("render", page=filename) as s:
+        data = render(...)
+        s.bytes = len(data)
+
+Each span records wall time, CPU time, bytes written and the net number of
+allocated memory blocks. When tracing is off, span() returns one shared
+no-op object, so instrumented code pays a global lookup and a call per stage.
+Traces load in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+_tracer = None
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "page", "tid", "bytes", "_wall", "_cpu", "_blocks")
+
+    def __init__(self, tracer, name, cat, page, tid):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.page = page
+        self.tid = tid
+        self.bytes = 0
+
+    def __enter__(self):
+        self._blocks = sys.getallocatedblocks()
+        self._cpu = time.thread_time_ns()
+        self._wall = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter_ns()
+        cpu = time.thread_time_ns()
+        self.tracer.events.append({
+            "name": self.name,
+            "cat": self.cat,
+            "ph": "X",
+            "ts": (self._wall - self.tracer.origin) / 1000,
+            "dur": (wall - self._wall) / 1000,
+            "pid": self.tracer.pid,
+            "tid": self.tid if self.tid is not None else threading.get_ident(),
+            "args": {
+                "page": self.page,
+                "cpu_us": (cpu - self._cpu) / 1000,
+                "bytes": self.bytes,
+                "alloc_blocks": sys.getallocatedblocks() - self._blocks,
+            },
+        })
+        return False
+
+
+class _NullSpan:
+    __slots__ = ("bytes",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, origin=None):
+        self.pid = os.getpid()
+        self.origin = origin if origin is not None else time.perf_counter_ns()
+        self.events = []
+
+
+def enable(origin=None):
+    """Turn tracing on for this process (also used as a pool worker initializer)"""
+    global _tracer
+    _tracer = Tracer(origin)
+    return _tracer
+
+
+def enabled():
+    return _tracer is not None
+
+
+def origin():
+    """Trace start time, shared with workers so all processes use one timeline"""
+    return _tracer.origin if _tracer is not None else None
+
+
+def span(name, cat="stage", page=None, tid=None):
+    if _tracer is None:
+        return NULL_SPAN
+    return Span(_tracer, name, cat, page, tid)
+
+
+def drain():
+    """Take the events recorded so far (e.g. to ship them back from a worker)"""
+    if _tracer is None:
+        return []
+    events, _tracer.events = _tracer.events, []
+    return events
+
+
+def absorb(events):
+    """Merge events recorded in another process into this process's trace"""
+    if _tracer is not None and events:
+        _tracer.events.extend(events)
+
+
+def write_chrome_trace(path):
+    events = _tracer.events if _tracer is not None else []
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def summary(top=10):
+    """Per-stage totals and the slowest pages, as printable text"""
+    events = _tracer.events if _tracer is not None else []
+    stages = {}
+    pages = {}
+    for e in events:
+        args = e["args"]
+        stage = stages.setdefault(e["name"], [0, 0.0, 0.0, 0, 0])
+        stage[0] += 1
+        stage[1] += e["dur"]
+        stage[2] += args["cpu_us"]
+        stage[3] += args["bytes"]
+        stage[4] += args["alloc_blocks"]
+        if args["page"] and e["cat"] == "page":
+            page = pages.setdefault(args["page"], {"wall": 0.0, "cpu": 0.0, "bytes": 0, "stages": {}})
+            page["wall"] += e["dur"]
+            page["cpu"] += args["cpu_us"]
+            page["bytes"] += args["bytes"]
+            page["stages"][e["name"]] = page["stages"].get(e["name"], 0.0) + e["dur"]
+
+    lines = [f"{'stage':<14} {'count':>7} {'wall ms':>10} {'cpu ms':>10} {'bytes':>12} {'blocks':>9}"]
+    for name, (count, wall, cpu, nbytes, blocks) in sorted(stages.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{name:<14} {count:>7} {wall / 1000:>10.2f} {cpu / 1000:>10.2f} {nbytes:>12} {blocks:>9}")
+    if pages:
+        lines.append("")
+        lines.append(f"Slowest {min(top, len(pages))} of {len(pages)} pages:")
+        lines.append(f"{'page':<40} {'wall ms':>9} {'cpu ms':>9} {'bytes':>9}  slowest stage")
+        for name, page in sorted(pages.items(), key=lambda kv: -kv[1]["wall"])[:top]:
+            worst = max(page["stages"], key=page["stages"].get)
+            lines.append(f"{name:<40} {page['wall'] / 1000:>9.2f} {page['cpu'] / 1000:>9.2f} "
+                         f"{page['bytes']:>9}  {worst}")
+    return "\n".join(lines)
@@ -0,0 +1,215 @@
+"""Batch HTML -> PNG rasterizing behind a pluggable renderer interface
+
+Renderers are async context managers with a render(html_path, png_path,
+viewport) coroutine. PlaywrightRenderer drives one local headless browser
+with a pool of reusable pages; StubRenderer draws a deterministic image from
+the HTML bytes so the pipeline can run offline and without a browser.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from png_cache import asset_digests, cache_key
+from profiling import span
+from png_io import encode_png
+
+DEFAULT_VIEWPORT = (1440, 900)
+
+
+class RendererUnavailable(RuntimeError):
+    """The renderer cannot start at all; fails the whole run rather than each page"""
+
+
+class Renderer:
+    name = "base"
+    version = "0"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def render(self, html_path, png_path, viewport):
+        raise NotImplementedError
+
+
+class PlaywrightRenderer(Renderer):
+    """One headless Chromium, `pages` tabs reused across all screenshots.
+
+    The browser is launched on the first render, so a run served entirely
+    from the PNG cache never starts it.
+    """
+
+    name = "playwright"
+
+    def __init__(self, pages=4, full_page=True):
+        self.pool_size = pages
+        self.full_page = full_page
+        self.version = _playwright_version()
+        self._playwright = None
+        self._browser = None
+        self._pages = None
+        self._launch_error = None
+        self._launch_lock = asyncio.Lock()
+
+    async def _launch(self):
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError:
+            raise RendererUnavailable(
+                "playwright is not installed: pip install playwright && playwright install chromium"
+            ) from None
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        pages = asyncio.Queue()
+        for _ in range(self.pool_size):
+            await pages.put(await self._browser.new_page())
+        self._pages = pages
+
+    async def __aexit__(self, *exc):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        return False
+
+    async def render(self, html_path, png_path, viewport):
+        if self._pages is None:
+            async with self._launch_lock:
+                if self._launch_error is not None:
+                    raise self._launch_error
+                if self._pages is None:
+                    try:
+                        await self._launch()
+                    except Exception as e:
+                        # Fail every queued page fast instead of relaunching per page
+                        if not isinstance(e, RendererUnavailable):
+                            first_line = (str(e).strip().splitlines() or [type(e).__name__])[0]
+                            e = RendererUnavailable(f"cannot launch chromium: {first_line}")
+                        self._launch_error = e
+                        raise e
+        page = await self._pages.get()
+        try:
+            width, height = viewport
+            await page.set_viewport_size({"width": width, "height": height})
+            await page.goto(Path(html_path).resolve().as_uri(), wait_until="load")
+            await page.screenshot(path=str(png_path), full_page=self.full_page)
+        finally:
+            self._pages.put_nowait(page)
+
+
+def _playwright_version():
+    # Each playwright release pins its browser builds, so the package version
+    # identifies the renderer without having to launch it.
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        return f"playwright-{version('playwright')}-chromium"
+    except PackageNotFoundError:
+        return "playwright-unknown"
+
+
+class StubRenderer(Renderer):
+    """Offline stand-in: one colour band per slice of the HTML, viewport-sized.
+
+    Editing part of a page changes only the matching bands, which is close
+    enough to a real screenshot for exercising caches, diffs and benchmarks.
+    """
+
+    name = "stub"
+    version = "stub-1"
+
+    def __init__(self, pages=4, bands=30):
+        self.pool_size = pages
+        self.bands = bands
+
+    async def render(self, html_path, png_path, viewport):
+        with open(html_path, "rb") as f:
+            html = f.read()
+        data = await asyncio.to_thread(self.draw, html, viewport)
+        with open(png_path, "wb") as f:
+            f.write(data)
+
+    def draw(self, html, viewport):
+        width, height = viewport
+        step = max(1, -(-len(html) // self.bands))
+        band_height = max(1, -(-height // self.bands))
+        rows = []
+        for y in range(height):
+            start = (y // band_height) * step
+            colour = hashlib.blake2b(html[start:start + step], digest_size=3).digest()
+            rows.append(colour * width)
+        return encode_png(width, height, rows, level=1)
+
+
+RENDERERS = {
+    PlaywrightRenderer.name: PlaywrightRenderer,
+    StubRenderer.name: StubRenderer,
+}
+
+
+def png_path_for(html_path, src_root, out_dir):
+    rel = os.path.relpath(html_path, src_root)
+    return os.path.join(out_dir, os.path.splitext(rel)[0] + ".png")
+
+
+async def rasterize_all(jobs, renderer, viewport=DEFAULT_VIEWPORT, concurrency=4, cache=None):
+    """Render [(html_path, png_path), ...]; returns [(html_path, png_path, error)] in order
+
+    A page that fails gets its error in the results; a renderer that cannot
+    start raises RendererUnavailable instead. With a PngCache, pages whose HTML bytes,
+    linked local assets (tailwind.css), viewport and renderer version were seen before
+    are copied from the cache instead of re-rendered.
+    """
+    # Lanes double as a concurrency limit and as trace "threads" for overlapping pages
+    lanes = asyncio.Queue()
+    for lane in range(concurrency):
+        lanes.put_nowait(lane)
+
+    async def one(html_path, png_path):
+        lane = await lanes.get()
+        try:
+            os.makedirs(os.path.dirname(png_path) or ".", exist_ok=True)
+            key = None
+            if cache is not None:
+                with span("cache", "page", html_path, lane):
+                    with open(html_path, "rb") as f:
+                        html = f.read()
+                    assets = asset_digests(html, os.path.dirname(html_path) or ".")
+                    key = cache_key(html, viewport, renderer.version, assets)
+                    if cache.fetch(key, png_path):
+                        return html_path, png_path, None
+            with span("rasterize", "page", html_path, lane) as s:
+                await renderer.render(html_path, png_path, viewport)
+                s.bytes = os.path.getsize(png_path)
+            if key is not None:
+                with span("cache-store", "page", html_path, lane):
+                    cache.store(key, png_path)
+        except RendererUnavailable:
+            raise
+        except Exception as e:
+            return html_path, png_path, f"{type(e).__name__}: {e}"
+        finally:
+            lanes.put_nowait(lane)
+        return html_path, png_path, None
+
+    return await asyncio.gather(*(one(h, p) for h, p in jobs))
+
+
+async def _convert(jobs, renderer_name, pages, viewport, cache):
+    async with RENDERERS[renderer_name](pages=pages) as renderer:
+        return await rasterize_all(jobs, renderer, viewport, concurrency=pages, cache=cache)
+
+
+def convert(jobs, renderer="playwright", pages=4, viewport=DEFAULT_VIEWPORT, cache=None):
+    """Blocking wrapper: returns (results, elapsed seconds)"""
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(_convert(jobs, renderer, pages, viewport, cache))
+    finally:
+        if cache is not None:
+            cache.save()
+    return results, time.perf_counter() - start
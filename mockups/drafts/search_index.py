@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""Full-text search over every mockup page, backed by an on-disk inverted index
+
+Pages come from page_index (the round directories, plus the pages
+create_remaining_mockups.py writes). Each page's visible text, with
+<head>, <script>, <style> and comments removed and the <title> in front,
+is split into case-folded words, and every word position goes into the index:
+
+  meta.json        the document table ([path, title, size, mtime_ns, words]
+                   per document id; null once a page has changed or gone) and
+                   the list of live segments
+  seg-N.terms      {term: [offset, length, document count]} for one segment
+  seg-N.post       that segment's postings: per term, for each document the
+                   id gap, the number of positions and the position gaps, all
+                   as LEB128 varints
+
+An update stats every page and only reads the new or changed ones. Their
+postings go into a new small segment and their old document ids are marked
+dead, so editing one page costs one page's tokenizing. Once there are too
+many segments or too many dead ids, the segments are merged into one,
+straight from their postings, without re-reading any page.
+
+Queries match every word; "quoted phrases" must appear in that order and
+a trailing * matches a prefix. Results are ranked by BM25.
+
+    python search_index.py update
+    python search_index.py query '"travel time"' operator
+    python search_index.py html -o index.html
+"""
+
+import argparse
+import bisect
+import html
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+import page_index
+from page_helpers import chrome
+from page_template import CompiledTemplate, Repeat
+from precompress import PageWriter
+
+HERE = page_index.HERE
+INDEX_DIR = os.path.join(HERE, ".search-index")
+HTML_PATH = os.path.join(HERE, "index.html")
+INDEX_VERSION = 1
+MAX_SEGMENTS = 8
+MAX_DEAD = 0.25  # merge once this share of document ids belongs to changed or deleted pages
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_WORDS = 8
+SEARCH_TITLE = "Mockup Search"
+
+_INVISIBLE = re.compile(r"<(head|script|style|template|noscript)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+_TAG = re.compile(r"<[^>]*>")
+_WORD = re.compile(r"\w+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def visible_text(source):
+    """Text a reader sees: markup, head, scripts, styles and comments removed, entities decoded"""
+    return html.unescape(_TAG.sub(" ", _INVISIBLE.sub(" ", source)))
+
+
+def words(text):
+    return [w.casefold() for w in _WORD.findall(text)]
+
+
+def display_path(path):
+    """Path relative to this directory, or absolute for pages outside it"""
+    rel = os.path.relpath(path, HERE)
+    return os.path.abspath(path) if rel.startswith(os.pardir) else rel
+
+
+def page_words(path, title):
+    """Title words, a gap (None) so phrases never span it, then the body's words"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return words(title) + [None] + words(visible_text(f.read()))
+
+
+def encode_postings(postings, out):
+    """Append [(doc, positions)] (ascending docs) to the bytearray `out` as varints"""
+    prev_doc = 0
+    for doc, positions in postings:
+        values = [doc - prev_doc, len(positions)]
+        prev = 0
+        for pos in positions:
+            values.append(pos - prev)
+            prev = pos
+        prev_doc = doc
+        for v in values:
+            while v > 0x7F:
+                out.append(v & 0x7F | 0x80)
+                v >>= 7
+            out.append(v)
+
+
+def decode_postings(data):
+    """[(doc, positions)] from bytes written by encode_postings"""
+    values, v, shift = [], 0, 0
+    for b in data:
+        v |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+        else:
+            values.append(v)
+            v = shift = 0
+    postings, i, doc = [], 0, 0
+    while i < len(values):
+        doc += values[i]
+        count = values[i + 1]
+        positions, pos = [], 0
+        for gap in values[i + 2:i + 2 + count]:
+            pos += gap
+            positions.append(pos)
+        postings.append((doc, positions))
+        i += 2 + count
+    return postings
+
+
+class Segment:
+    """One immutable .terms/.post pair"""
+
+    def __init__(self, root, name):
+        self.name = name
+        self.post_path = os.path.join(root, name + ".post")
+        with open(os.path.join(root, name + ".terms"), encoding="utf-8") as f:
+            self.terms = json.load(f)
+        self._sorted = None
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if entry is None:
+            return []
+        with open(self.post_path, "rb") as f:
+            f.seek(entry[0])
+            return decode_postings(f.read(entry[1]))
+
+    def prefixed(self, prefix):
+        """Terms starting with prefix"""
+        if self._sorted is None:
+            self._sorted = sorted(self.terms)
+        i = bisect.bisect_left(self._sorted, prefix)
+        found = []
+        while i < len(self._sorted) and self._sorted[i].startswith(prefix):
+            found.append(self._sorted[i])
+            i += 1
+        return found
+
+    def items(self):
+        """(term, [(doc, positions)]) for every term, reading the postings file once"""
+        with open(self.post_path, "rb") as f:
+            data = f.read()
+        for term, (offset, length, _) in self.terms.items():
+            yield term, decode_postings(data[offset:offset + length])
+
+    def files(self):
+        return [self.post_path, self.post_path[:-len(".post")] + ".terms"]
+
+
+def write_segment(root, name, inverted):
+    """Write {term: {doc: positions}} as segment `name`; returns its size in bytes"""
+    terms, out = {}, bytearray()
+    for term in sorted(inverted):
+        docs = inverted[term]
+        offset = len(out)
+        encode_postings(sorted(docs.items()), out)
+        terms[term] = [offset, len(out) - offset, len(docs)]
+    with open(os.path.join(root, name + ".post"), "wb") as f:
+        f.write(out)
+    with open(os.path.join(root, name + ".terms"), "w", encoding="utf-8") as f:
+        json.dump(terms, f, ensure_ascii=False, separators=(",", ":"))
+    return len(out) + os.path.getsize(os.path.join(root, name + ".terms"))
+
+
+class SearchIndex:
+    def __init__(self, root=INDEX_DIR):
+        self.root = root
+        self.meta_path = os.path.join(root, "meta.json")
+        self.docs = []
+        self.segments = []
+        self.next_segment = 1
+        self.pages = {}  # search page path -> [size, mtime_ns, sha256] as last written
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") == INDEX_VERSION:
+                self.docs = meta["docs"]
+                self.next_segment = meta["next_segment"]
+                self.pages = meta.get("pages", {})
+                self.segments = [Segment(root, name) for name in meta["segments"]]
+        except (OSError, ValueError, KeyError):
+            self.docs, self.segments = [], []
+        self.by_path = {entry[0]: doc for doc, entry in enumerate(self.docs) if entry is not None}
+
+    def live(self):
+        return len(self.by_path)
+
+    def dead(self):
+        return len(self.docs) - len(self.by_path)
+
+    def update(self, pages):
+        """Make the index cover exactly `pages`, reading only new and changed ones; returns (indexed, removed)"""
+        inverted = defaultdict(dict)
+        seen = set()
+        indexed = 0
+        for page in pages:
+            path = display_path(page.path)
+            seen.add(path)
+            st = os.stat(page.path)
+            doc = self.by_path.get(path)
+            if doc is not None:
+                if self.docs[doc][2] == st.st_size and self.docs[doc][3] == st.st_mtime_ns:
+                    continue
+                self.docs[doc] = None
+            tokens = page_words(page.path, page.title)
+            doc = self.by_path[path] = len(self.docs)
+            self.docs.append([path, page.title, st.st_size, st.st_mtime_ns, len(tokens) - 1])
+            for pos, term in enumerate(tokens):
+                if term is not None:
+                    inverted[term].setdefault(doc, []).append(pos)
+            indexed += 1
+        removed = [path for path in self.by_path if path not in seen]
+        for path in removed:
+            self.docs[self.by_path.pop(path)] = None
+        if not indexed and not removed:
+            return 0, 0
+
+        os.makedirs(self.root, exist_ok=True)
+        if inverted:
+            name = f"seg-{self.next_segment:06d}"
+            self.next_segment += 1
+            write_segment(self.root, name, inverted)  # before meta.json, which is what makes it live
+            self.segments.append(Segment(self.root, name))
+        if len(self.segments) > MAX_SEGMENTS or self.dead() > MAX_DEAD * len(self.docs):
+            self.merge()
+        else:
+            self.save()
+        return indexed, len(removed)
+
+    def merge(self):
+        """Fold every segment into one, dropping dead documents and renumbering the rest"""
+        remap, docs = {}, []
+        for doc, entry in enumerate(self.docs):
+            if entry is not None:
+                remap[doc] = len(docs)
+                docs.append(entry)
+        inverted = defaultdict(dict)
+        for segment in self.segments:
+            for term, postings in segment.items():
+                for doc, positions in postings:
+                    new = remap.get(doc)
+                    if new is not None:
+                        inverted[term][new] = positions
+        old = self.segments
+        name = f"seg-{self.next_segment:06d}"
+        self.next_segment += 1
+        write_segment(self.root, name, inverted)
+        self.docs = docs
+        self.by_path = {entry[0]: doc for doc, entry in enumerate(docs)}
+        self.segments = [Segment(self.root, name)]
+        self.save()
+        for segment in old:
+            for path in segment.files():
+                os.remove(path)
+
+    def save(self):
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "docs": self.docs, "next_segment": self.next_segment,
+                       "segments": [segment.name for segment in self.segments], "pages": self.pages},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.meta_path)
+
+    def postings(self, term):
+        """{doc: positions} over every segment, live documents only"""
+        found = {}
+        for segment in self.segments:
+            for doc, positions in segment.postings(term):
+                if self.docs[doc] is not None:
+                    found[doc] = positions
+        return found
+
+    def _matches(self, terms, prefix=False):
+        """{doc: start positions} where the terms occur in a row (the last one as a prefix)"""
+        if prefix:
+            last = {}
+            for term in sorted({t for segment in self.segments for t in segment.prefixed(terms[-1])}):
+                for doc, positions in self.postings(term).items():
+                    last.setdefault(doc, set()).update(positions)
+        else:
+            last = None
+        found = None
+        for offset, term in enumerate(terms):
+            postings = last if offset == len(terms) - 1 and last is not None else self.postings(term)
+            if found is None:
+                found = {doc: set(p - offset for p in positions) for doc, positions in postings.items()}
+            else:
+                found = {doc: starts.intersection(p - offset for p in postings[doc])
+                         for doc, starts in found.items() if doc in postings}
+                found = {doc: starts for doc, starts in found.items() if starts}
+            if not found:
+                break
+        return {doc: sorted(starts) for doc, starts in (found or {}).items()}
+
+    def search(self, query, limit=10):
+        """[(score, path, title, first hit, hit length)] for pages matching all of query, best first"""
+        clauses = []
+        for phrase, word in _QUERY.findall(query):
+            terms = words(phrase or word)
+            if terms:
+                clauses.append((terms, bool(word) and word.endswith("*")))
+        if not clauses or not self.by_path:
+            return []
+        matches = [self._matches(terms, prefix) for terms, prefix in clauses]
+        docs = set(matches[0]).intersection(*matches[1:])
+        live = self.live()
+        average = sum(entry[4] for entry in self.docs if entry is not None) / live
+        results = []
+        for doc in docs:
+            length = self.docs[doc][4]
+            score = 0.0
+            for found in matches:
+                tf = len(found[doc])
+                idf = math.log(1 + (live - len(found) + 0.5) / (len(found) + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average))
+            first, size = min((found[doc][0], len(terms)) for found, (terms, _) in zip(matches, clauses))
+            path, title = self.docs[doc][:2]
+            results.append((score, path, title, first, size))
+        results.sort(key=lambda r: (-r[0], r[1]))
+        return results[:limit]
+
+    def terms(self):
+        """{term: [live doc ids]} across every segment"""
+        found = defaultdict(set)
+        for segment in self.segments:
+            for term, postings in segment.items():
+                found[term].update(doc for doc, _ in postings if self.docs[doc] is not None)
+        return {term: sorted(docs) for term, docs in found.items() if docs}
+
+    def footprint(self):
+        return sum(os.path.getsize(p) for segment in self.segments for p in segment.files()) + (
+            os.path.getsize(self.meta_path) if os.path.exists(self.meta_path) else 0)
+
+
+def snippet(path, title, position, size, width=SNIPPET_WORDS):
+    """The words around a hit, the hit itself in [brackets]; the title if the hit is in it"""
+    title_words = len(words(title))
+    if position <= title_words:
+        return title
+    try:
+        with open(os.path.join(HERE, path), encoding="utf-8", errors="replace") as f:
+            text = visible_text(f.read())
+    except OSError:
+        return ""
+    spans = [m.span() for m in _WORD.finditer(text)]
+    i = position - title_words - 1
+    if i + size > len(spans):
+        return ""  # changed since it was indexed
+    lo, hi = max(0, i - width), min(len(spans), i + size + width)
+    before = text[spans[lo][0]:spans[i][0]]
+    hit = text[spans[i][0]:spans[i + size - 1][1]]
+    after = text[spans[i + size - 1][1]:spans[hi - 1][1]]
+    clip = " ".join(f"{before}[{hit}]{after}".split())
+    return ("... " if lo else "") + clip + (" ..." if hi < len(spans) else "")
+
+
+def default_pages(sites=(HERE,)):
+    """Every round directory's pages, plus pages generated directly in `sites` (but not search pages)"""
+    pages = page_index.discover()
+    pages += page_index.discover([os.path.abspath(d) for d in sites], recursive=False)
+    return [page for page in pages if page.title != SEARCH_TITLE]
+
+
+SEARCH_PAGE = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Mockup Search</h2>
+            <p class="text-sm text-gray-500 mt-1">{summary}</p>
+        </div>
+        <input id="q" type="search" autofocus placeholder="Search every screen, e.g. kits, telegram, travel time"
+               class="w-full px-4 py-3 border border-gray-300 rounded-lg mb-2">
+        <p id="count" class="text-sm text-gray-500 mb-6">{count} pages</p>
+        {groups}
+        <script id="search-data" type="application/json">{data}</script>
+        <script>{script}</script>''')
+GROUP = CompiledTemplate('''
+        <div class="bg-white rounded-lg shadow p-4 mb-4" data-group>
+            <h3 class="font-semibold text-gray-900 mb-2">{name}</h3>
+            <ul class="space-y-1 text-sm">{items}
+            </ul>
+        </div>''')
+ITEM = CompiledTemplate('''
+                <li data-doc="{doc}"><a href="{href}" class="text-purple-600 hover:text-purple-700">{title}</a> <span class="text-gray-400">{name}</span></li>''')
+
+# Every word must match; the last one may be a prefix of an indexed word (search as you type)
+SEARCH_SCRIPT = '''
+const index = JSON.parse(document.getElementById("search-data").textContent);
+const terms = Object.keys(index.terms).sort();
+const items = [...document.querySelectorAll("[data-doc]")];
+function lookup(word, prefix) {
+  if (!prefix) return new Set(index.terms[word] || []);
+  const found = new Set();
+  for (const term of terms) if (term.startsWith(word)) index.terms[term].forEach(d => found.add(d));
+  return found;
+}
+function run() {
+  const words = (document.getElementById("q").value.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []);
+  let docs = null;
+  words.forEach((word, i) => {
+    const found = lookup(word, i === words.length - 1);
+    docs = docs === null ? found : new Set([...docs].filter(d => found.has(d)));
+  });
+  let shown = 0;
+  for (const item of items) {
+    const hit = docs === null || docs.has(+item.dataset.doc);
+    item.hidden = !hit;
+    shown += hit;
+  }
+  for (const group of document.querySelectorAll("[data-group]")) {
+    group.hidden = ![...group.querySelectorAll("[data-doc]")].some(item => !item.hidden);
+  }
+  document.getElementById("count").textContent = `${shown} of ${items.length} pages`;
+}
+document.getElementById("q").addEventListener("input", run);
+run();
+'''
+
+
+def write_html(index, path, minify=True):
+    """Searchable listing of every indexed page, with the word -> page table embedded; True if (re)written"""
+    base = os.path.dirname(os.path.abspath(path))
+    # Dense ids in path order keep the embedded table small and the page stable across updates
+    live = sorted((doc for doc, entry in enumerate(index.docs) if entry is not None), key=lambda d: index.docs[d][0])
+    number = {doc: n for n, doc in enumerate(live)}
+    terms = {term: sorted(number[doc] for doc in docs) for term, docs in sorted(index.terms().items())}
+    groups = defaultdict(list)
+    for doc in live:
+        rel, title = index.docs[doc][:2]
+        groups[os.path.dirname(rel) or "."].append(ITEM.bind(
+            doc=str(number[doc]), href=html.escape(os.path.relpath(os.path.join(HERE, rel), base).replace(os.sep, "/")),
+            title=html.escape(title or os.path.basename(rel)), name=html.escape(os.path.basename(rel)),
+        ))
+    # "</" would end the <script> element early
+    data = json.dumps({"terms": terms}, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    content = SEARCH_PAGE.bind(
+        summary=f"{len(live)} pages, {len(terms):,} distinct words. Phrases and ranking: python search_index.py query",
+        count=str(len(live)), data=data, script=SEARCH_SCRIPT,
+        groups=Repeat(GROUP.bind(name=html.escape(name), items=Repeat(items)) for name, items in sorted(groups.items())),
+    )
+    key = os.path.abspath(path)
+    last = index.pages.get(key)
+    try:
+        st = os.stat(path)
+        previous = last[2] if last and last[:2] == [st.st_size, st.st_mtime_ns] else None
+    except OSError:
+        previous = None
+    with PageWriter(path, minify=minify, sidecars=False, previous=previous) as f:
+        chrome().write(f, title=SEARCH_TITLE, content=content)
+    if f.changed:
+        st = os.stat(path)
+        index.pages[key] = [st.st_size, st.st_mtime_ns, f.digest]
+        os.makedirs(index.root, exist_ok=True)
+        index.save()
+    return f.changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search over the mockup pages")
+    parser.add_argument("--index", default=INDEX_DIR, help="index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("update", help="index new and changed pages")
+    p.add_argument("--site", action="append", metavar="DIR",
+                   help="directory create_remaining_mockups.py wrote pages to (default: this one)")
+    p.add_argument("--html", metavar="PATH", help="also write the searchable page here")
+    p = sub.add_parser("query", help="pages containing every word (\"quoted phrase\", prefix*)")
+    p.add_argument("words", nargs="+")
+    p.add_argument("-n", "--limit", type=int, default=10)
+    p = sub.add_parser("html", help="write the searchable page")
+    p.add_argument("-o", "--output", default=HTML_PATH)
+    sub.add_parser("stats", help="documents, segments and size on disk")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.index)
+    if args.command == "update":
+        start = time.perf_counter()
+        pages = default_pages(args.site or (HERE,))
+        indexed, removed = index.update(pages)
+        print(f"{len(pages)} pages: {indexed} indexed, {removed} removed in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms ({len(index.segments)} segments, "
+              f"{index.footprint() / 1024:,.1f} KB)")
+        if args.html:
+            written = write_html(index, args.html)
+            print(f"{args.html}: {'written' if written else 'unchanged'}")
+    elif args.command == "query":
+        if not index.segments:
+            sys.exit(f"no index in {args.index}: run `python search_index.py update` first")
+        start = time.perf_counter()
+        results = index.search(" ".join(args.words), args.limit)
+        elapsed = time.perf_counter() - start
+        for score, path, title, position, size in results:
+            print(f"{score:6.2f}  {path}  {title}")
+            print(f"        {snippet(path, title, position, size)}")
+        print(f"{len(results)} results in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    elif args.command == "html":
+        written = write_html(index, args.output)
+        print(f"{args.output}: {index.live()} pages, {'written' if written else 'unchanged'}")
+    elif args.command == "stats":
+        print(f"{index.live()} pages ({index.dead()} dead ids) in {len(index.segments)} segments, "
+              f"{sum(len(s.terms) for s in index.segments):,} terms, {index.footprint() / 1024:,.1f} KB in {args.index}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Batch auto-assignment of operators to open shift seats
+
+Every live ShiftAssignment row of the fixtures is a seat (shift + role + pay
+terms) to fill; the fixture's own operator pick is ignored. A seat can go to
+an active operator who holds the role's skill, is not blacked out that day,
+accepts flat rates when the seat pays flat, and can reach the venue from
+their previous shift (and the next one in time). Drive times and mileage
+come from the travel_time cache, with the same per-hour allowance the
+conflict engine checks.
+
+Cost is pay + mileage from home - a credit per skill level, plus a large
+penalty per unfilled seat. A greedy pass fills seats in start order from
+per-(role, venue) candidate lists sorted by cost; local search then fills
+leftover seats by moving one blocking shift to someone else and swaps seats
+to cheaper operators until the time budget runs out.
+"""
+
+import argparse
+import os
+import random
+import time
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+
+from availability import DAY, from_dataset
+from conflicts import ConflictEngine, Booking, bookings_from_dataset, render_conflicts
+from travel_time import CACHE_DIR, TravelMatrix, home_id, hour_slot, register_fixtures, venue_id
+
+ROLE_SKILLS = {"VIDEOGRAPHER": "videography", "PHOTOGRAPHER": "photography", "DIRECTOR": "directing"}
+MILEAGE_CENTS = 60  # per minute driven, home to venue and back
+LEVEL_CREDIT_CENTS = 400  # per skill level, so stronger operators win close calls
+UNFILLED_CENTS = 1_000_000
+TYPICAL_SECONDS = 4 * 3600  # shift length used to pre-sort hourly candidates
+MAX_SCAN = 256  # candidates tried per seat
+EJECT_SCAN = 24  # blocked candidates tried per unfilled seat in local search
+
+
+class Solver:
+    def __init__(self, ds, seed=0, travel=None):
+        self.ds = ds
+        self.travel = travel if travel is not None else TravelMatrix()
+        if register_fixtures(self.travel, ds):
+            self.travel.save()
+        self.rng = random.Random(seed)
+        self.index = index = from_dataset(ds, booked=False)
+        operators, events, shifts = ds.table("Operator"), ds.table("Event"), ds.table("Shift")
+        self.rates = list(operators.column("hourlyRate"))
+        accepts_flat = list(operators.column("acceptsFlatRate"))
+
+        # Venues, not events, decide travel, and a season only has a handful of them:
+        # gap[hour_slot(leaving)][from venue][to venue] is the drive time to allow
+        venues = {}
+        event_place = [venues.setdefault(venue_id(events.strings[name]), len(venues))
+                       for name in events.column("venueName")]
+        self.places = list(venues)
+        self.gap = self.travel.allowance_table(self.places)
+        home_minutes = np.zeros((len(self.rates), len(self.places)), dtype=np.int64)
+        homes = [op for op, lat in enumerate(operators.column("homeLat")) if lat == lat]
+        if homes:
+            home_minutes[homes] = self.travel.block([home_id(op) for op in homes], self.places)
+        self.mileage = (home_minutes * 2 * MILEAGE_CENTS).tolist()
+
+        skill_names = [d.skillName for d in ds.table("SkillDefinition")]
+        roles = ds.enums["OperatorRole"]
+        role_skill = [skill_names.index(ROLE_SKILLS[r]) if ROLE_SKILLS.get(r) in skill_names else None for r in roles]
+
+        # Seats as parallel lists, indexed by seat number
+        assignments = ds.table("ShiftAssignment")
+        cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+        event_cancelled = ds.enums["EventStatus"].index("CANCELLED")
+        starts, ends, shift_event = shifts.column("startTime"), shifts.column("endTime"), shifts.column("eventId")
+        event_status = events.column("status")
+        self.rows, self.shift, self.start, self.end, self.place, self.role, self.flat = ([] for _ in range(7))
+        for row, (shift, role, status, flat) in enumerate(zip(
+            assignments.column("shiftId"), assignments.column("role"), assignments.column("status"),
+            assignments.column("flatRate"),
+        )):
+            event = shift_event[shift]
+            if status == cancelled or event_status[event] == event_cancelled:
+                continue
+            self.rows.append(row)
+            self.shift.append(shift)
+            self.start.append(starts[shift])
+            self.end.append(ends[shift])
+            self.place.append(event_place[event])
+            self.role.append(role)
+            self.flat.append(None if flat < 0 else flat)
+        self.leave = [hour_slot(end) for end in self.end]
+        self.days = [range((s - index.origin) // DAY, (e - 1 - index.origin) // DAY + 1)
+                     for s, e in zip(self.start, self.end)]
+        self.level = [[0] * len(self.rates) if skill is None else index.levels[:, skill].tolist()
+                      for skill in role_skill]
+
+        # Candidate operators per (role, venue, flat), cheapest first for a typical shift
+        active = index.active.tolist()
+        self.candidates = {}
+        for role, place, flat in set(zip(self.role, self.place, (f is not None for f in self.flat))):
+            level, skill = self.level[role], role_skill[role]
+            ops = [op for op in range(len(self.rates))
+                   if active[op] and (skill is None or level[op]) and (accepts_flat[op] or not flat)]
+            ops.sort(key=lambda op: (0 if flat else self.rates[op] * TYPICAL_SECONDS // 3600)
+                     + self.mileage[op][place] - level[op] * LEVEL_CREDIT_CENTS)
+            self.candidates[role, place, flat] = ops
+        self.blackout = index.blackout.tolist()
+
+        self.assigned = [-1] * len(self.rows)
+        self.starts = [[] for _ in self.rates]  # per operator, sorted
+        self.booked = [[] for _ in self.rates]  # seats parallel to starts
+        self.moves = Counter()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def cost(self, op, seat):
+        flat = self.flat[seat]
+        pay = flat if flat is not None else self.rates[op] * (self.end[seat] - self.start[seat]) // 3600
+        return pay + self.mileage[op][self.place[seat]] - self.level[self.role[seat]][op] * LEVEL_CREDIT_CENTS
+
+    def total_cost(self):
+        return sum(self.cost(op, seat) if op >= 0 else UNFILLED_CENTS for seat, op in enumerate(self.assigned))
+
+    def filled(self):
+        return sum(op >= 0 for op in self.assigned)
+
+    def _candidates(self, seat):
+        return self.candidates[self.role[seat], self.place[seat], self.flat[seat] is not None]
+
+    def _blacked_out(self, op, seat):
+        words = self.blackout[op]
+        return any(words[day >> 6] >> (day & 63) & 1 for day in self.days[seat])
+
+    def _blockers(self, op, seat, limit=0):
+        """Seats of `op` that clash with `seat` (overlap or too little travel time); None past `limit`"""
+        start, end, place = self.start[seat], self.end[seat], self.place[seat]
+        gap, leave = self.gap, self.leave
+        starts, booked = self.starts[op], self.booked[op]
+        i = bisect_left(starts, start)
+        found = []
+        j = i - 1
+        while j >= 0 and self.end[booked[j]] + gap[leave[booked[j]]][self.place[booked[j]]][place] > start:
+            found.append(booked[j])
+            if len(found) > limit:
+                return None
+            j -= 1
+        j = i
+        while j < len(booked) and end + gap[leave[seat]][place][self.place[booked[j]]] > starts[j]:
+            found.append(booked[j])
+            if len(found) > limit:
+                return None
+            j += 1
+        return found
+
+    def fits(self, op, seat):
+        return not self._blacked_out(op, seat) and self._blockers(op, seat) == []
+
+    def assign(self, op, seat):
+        i = bisect_left(self.starts[op], self.start[seat])
+        self.starts[op].insert(i, self.start[seat])
+        self.booked[op].insert(i, seat)
+        self.assigned[seat] = op
+
+    def unassign(self, seat):
+        op = self.assigned[seat]
+        i = self.booked[op].index(seat)
+        del self.starts[op][i], self.booked[op][i]
+        self.assigned[seat] = -1
+
+    def greedy(self):
+        """Fill seats in start order with the cheapest operator that fits"""
+        for seat in sorted(range(len(self.rows)), key=self.start.__getitem__):
+            for op in self._candidates(seat)[:MAX_SCAN]:
+                if self.fits(op, seat):
+                    self.assign(op, seat)
+                    break
+
+    def _fill(self, seat):
+        """Fill an empty seat, moving one of the candidate's other seats elsewhere if that frees them"""
+        candidates = self._candidates(seat)[:MAX_SCAN]
+        blocked = []
+        for op in candidates:
+            if self._blacked_out(op, seat):
+                continue
+            clash = self._blockers(op, seat, 1)
+            if clash == []:
+                self.assign(op, seat)
+                self.moves["fill"] += 1
+                return True
+            if clash is not None and len(blocked) < EJECT_SCAN:
+                blocked.append((op, clash[0]))
+        for op, other in blocked:
+            for alternative in self._candidates(other)[:MAX_SCAN]:
+                if alternative != op and self.fits(alternative, other):
+                    self.unassign(other)
+                    self.assign(alternative, other)
+                    self.assign(op, seat)
+                    self.moves["eject"] += 1
+                    return True
+        return False
+
+    def _improve(self, seat):
+        """Hand a seat to a cheaper operator who fits"""
+        current = self.assigned[seat]
+        cost = self.cost(current, seat)
+        for op in self._candidates(seat)[:MAX_SCAN]:
+            if op == current:
+                continue
+            if self.cost(op, seat) < cost and self.fits(op, seat):
+                self.unassign(seat)
+                self.assign(op, seat)
+                self.moves["cheaper"] += 1
+                return True
+        return False
+
+    def local_search(self, budget):
+        """Improve the assignment until nothing changes or `budget` seconds pass; True if it converged"""
+        deadline = time.perf_counter() + budget
+        while True:
+            changed = False
+            open_seats = [seat for seat, op in enumerate(self.assigned) if op < 0]
+            taken = [seat for seat, op in enumerate(self.assigned) if op >= 0]
+            self.rng.shuffle(taken)
+            for n, (step, seat) in enumerate([(self._fill, s) for s in open_seats] + [(self._improve, s) for s in taken]):
+                if n % 64 == 0 and time.perf_counter() > deadline:
+                    return False
+                if step is self._improve and self.assigned[seat] < 0:
+                    continue
+                changed |= step(seat)
+            if not changed:
+                return True
+
+    def solve(self, budget=5.0):
+        """Greedy then local search; returns timings and quality at both stages"""
+        start = time.perf_counter()
+        self.greedy()
+        greedy = time.perf_counter()
+        stats = {"seats": len(self), "greedy_seconds": greedy - start,
+                 "greedy_filled": self.filled(), "greedy_cost": self.total_cost()}
+        converged = self.local_search(budget)
+        stats.update(search_seconds=time.perf_counter() - greedy, converged=converged,
+                     filled=self.filled(), cost=self.total_cost(), moves=dict(self.moves))
+        return stats
+
+    def bookings(self):
+        """Operator bookings for the solution, with ids matching the fixture ShiftAssignment rows"""
+        event_of = self.ds.table("Shift").column("eventId")
+        for seat, op in enumerate(self.assigned):
+            if op >= 0:
+                shift = self.shift[seat]
+                yield Booking(("ShiftAssignment", self.rows[seat]), ("operator", op), self.start[seat],
+                              self.end[seat], self.places[self.place[seat]], event_of[shift], shift)
+
+    def violations(self):
+        """Hard-constraint breaches in the solution (should always be empty)"""
+        found = ConflictEngine(self.travel).load(self.bookings())
+        found += [("blackout", seat) for seat, op in enumerate(self.assigned) if op >= 0 and self._blacked_out(op, seat)]
+        return found
+
+
+def render(solver, out_dir, shift=None):
+    """Write the solution into 06-shift-assignment (one shift) and 24-conflict-resolution"""
+    from availability import render_assignment
+
+    ds = solver.ds
+    labels = {r: r.title() for r in ds.enums["OperatorRole"]}
+    seats = [seat for seat, op in enumerate(solver.assigned) if op >= 0]
+    if shift is None:
+        # The shift with the most auto-assigned seats makes the fullest page
+        shift = Counter(solver.shift[seat] for seat in seats).most_common(1)[0][0] if seats else 0
+    index = solver.index
+    index.book([solver.assigned[s] for s in seats], [solver.start[s] for s in seats], [solver.end[s] for s in seats])
+    roles = ds.enums["OperatorRole"]
+    assigned = {
+        solver.assigned[seat]: f"Auto-assigned as {labels[roles[solver.role[seat]]]} • "
+                               f"${solver.cost(solver.assigned[seat], seat) / 100:,.0f} est."
+        for seat in seats if solver.shift[seat] == shift
+    }
+    path = os.path.join(out_dir, "06-shift-assignment.html")
+    render_assignment(ds, index, shift, path, assigned=assigned)
+    print(f"Created: {path} (shift {shift}, {len(assigned)} auto-assigned)")
+
+    others = [b for b in bookings_from_dataset(ds) if b.resource[0] != "operator"]
+    conflicts = ConflictEngine(solver.travel).load(list(solver.bookings()) + others)
+    path = os.path.join(out_dir, "24-conflict-resolution.html")
+    render_conflicts(ds, conflicts, path, travel=solver.travel)
+    print(f"Created: {path} ({len(conflicts)} conflicts)")
+
+
+def _report(stats, setup):
+    seats = stats["seats"] or 1
+    return (f"{stats['seats']:>8} {setup:>7.2f}s {stats['greedy_seconds']:>7.2f}s "
+            f"{stats['seats'] / max(stats['greedy_seconds'], 1e-9):>9,.0f} "
+            f"{stats['greedy_filled'] / seats:>7.1%} {stats['search_seconds']:>7.2f}s "
+            f"{stats['filled'] / seats:>7.1%} {1 - stats['cost'] / max(stats['greedy_cost'], 1):>8.2%}"
+            f"{'' if stats['converged'] else '  (budget)'}")
+
+
+def bench(sizes, budget, seed=0, cache_dir=CACHE_DIR):
+    """Solve seasons of growing size; operators scale with shifts (1 per 10, at least 40)"""
+    from fixtures import Dataset
+
+    travel = TravelMatrix(cache_dir)
+
+    print(f"{'shifts':>8} {'operators':>9} {'seats':>8} {'setup':>8} {'greedy':>8} {'seats/s':>9} "
+          f"{'filled':>7} {'search':>8} {'filled':>7} {'saved':>8}")
+    for shifts in sizes:
+        ds = Dataset(seed, {"Shift": shifts, "Operator": max(40, shifts // 10)})
+        for model in ("Operator", "Event", "Shift", "ShiftAssignment", "OperatorSkill", "OperatorBlackoutDate"):
+            ds.table(model)  # fixture generation is not the solver's time
+        if register_fixtures(travel, ds):  # nor is filling the travel cache
+            travel.save()
+        start = time.perf_counter()
+        solver = Solver(ds, seed, travel)
+        setup = time.perf_counter() - start
+        stats = solver.solve(budget)
+        print(f"{shifts:>8} {ds.count('Operator'):>9} " + _report(stats, setup))
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Auto-assign operators to the shifts of a fixture season")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="travel-time cache (see travel_time.py)")
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds of local search after the greedy pass")
+    parser.add_argument("--render", metavar="DIR", help="write 06-shift-assignment and 24-conflict-resolution to DIR")
+    parser.add_argument("--shift", type=int, help="shift shown on the assignment page (default: the fullest)")
+    parser.add_argument("--bench", metavar="SIZES", help="comma-separated shift counts to benchmark, e.g. 100,1000,10000")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench([int(n) for n in args.bench.split(",")], args.budget, args.seed, args.cache_dir)
+        return
+
+    ds = Dataset(args.seed, dict(args.count))
+    travel = TravelMatrix(args.cache_dir)
+    start = time.perf_counter()
+    solver = Solver(ds, args.seed, travel)
+    setup = time.perf_counter() - start
+    stats = solver.solve(args.budget)
+    print(f"{ds.count('Shift')} shifts, {ds.count('Operator')} operators")
+    print(f"{'seats':>8} {'setup':>8} {'greedy':>8} {'seats/s':>9} {'filled':>7} {'search':>8} {'filled':>7} {'saved':>8}")
+    print(_report(stats, setup))
+    print(f"Local search moves: {', '.join(f'{k} {v}' for k, v in sorted(stats['moves'].items())) or 'none'}; "
+          f"pay + mileage ${(stats['cost'] - (len(solver) - stats['filled']) * UNFILLED_CENTS) / 100:,.0f}")
+    broken = solver.violations()
+    print(f"Hard constraints: {'all satisfied' if not broken else f'{len(broken)} VIOLATED'}")
+    if args.render:
+        render(solver, args.render, args.shift)
+
+
+if __name__ == "__main__":
+    main()
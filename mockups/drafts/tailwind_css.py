@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""Offline, purged Tailwind stylesheet for the mockups
+
+Scans pages for the utility classes they actually use, indexes them, and
+emits one small pre-generated stylesheet (Tailwind v3 default theme) that
+pages link to locally instead of loading the cdn.tailwindcss.com runtime.
+Only the utilities the mockups use are supported; anything else found in a
+class attribute is listed as unsupported so it can be added here.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+
+CDN_SCRIPT = '<script src="https://cdn.tailwindcss.com"></script>'
+STYLESHEET_NAME = "tailwind.css"
+
+PALETTE = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+}
+SHADES = ("50", "100", "200", "300", "400", "500", "600", "700", "800", "900", "950")
+
+COLORS = {"white": "#fff", "black": "#000", "transparent": "transparent", "current": "currentColor"}
+for _family, _hexes in PALETTE.items():
+    for _shade, _hex in zip(SHADES, _hexes.split()):
+        COLORS[f"{_family}-{_shade}"] = "#" + _hex
+
+SPACING = {"0": "0px", "px": "1px"}
+for _n in (0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 20, 24,
+           28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 72, 80, 96):
+    SPACING[f"{_n:g}"] = f"{_n / 4:g}rem"
+
+SIZES = dict(SPACING, auto="auto", full="100%")
+for _num, _den in ((1, 2), (1, 3), (2, 3), (1, 4), (3, 4)):
+    SIZES[f"{_num}/{_den}"] = f"{100 * _num / _den:g}%"
+
+MAX_WIDTHS = {
+    "none": "none", "xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem",
+    "xl": "36rem", "2xl": "42rem", "3xl": "48rem", "4xl": "56rem", "5xl": "64rem",
+    "6xl": "72rem", "7xl": "80rem", "full": "100%",
+}
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"),
+}
+FONT_WEIGHTS = {
+    "thin": "100", "light": "300", "normal": "400", "medium": "500",
+    "semibold": "600", "bold": "700", "extrabold": "800", "black": "900",
+}
+LEADING = {"none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625", "loose": "2"}
+for _n in range(3, 11):
+    LEADING[str(_n)] = f"{_n / 4:g}rem"
+TRACKING = {"tighter": "-0.05em", "tight": "-0.025em", "normal": "0em", "wide": "0.025em", "wider": "0.05em", "widest": "0.1em"}
+RADII = {
+    "none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem",
+    "xl": "0.75rem", "2xl": "1rem", "3xl": "1.5rem", "full": "9999px",
+}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "xl": "0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)",
+    "2xl": "0 25px 50px -12px rgb(0 0 0 / 0.25)",
+    "none": "0 0 #0000",
+}
+GRADIENT_DIRECTIONS = {
+    "t": "top", "tr": "top right", "r": "right", "br": "bottom right",
+    "b": "bottom", "bl": "bottom left", "l": "left", "tl": "top left",
+}
+SIDES = {"t": ("top",), "r": ("right",), "b": ("bottom",), "l": ("left",), "x": ("left", "right"), "y": ("top", "bottom")}
+BREAKPOINTS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px", "2xl": "1536px"}
+PSEUDO_VARIANTS = {"hover": ":hover", "focus": ":focus", "active": ":active", "disabled": ":disabled",
+                   "first": ":first-child", "last": ":last-child"}
+LATE_PREFIXES = ("leading-", "tracking-")
+TRANSITION = "transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); transition-duration: 150ms"
+
+STATIC = {
+    "block": "display: block", "inline-block": "display: inline-block", "inline": "display: inline",
+    "flex": "display: flex", "inline-flex": "display: inline-flex", "grid": "display: grid",
+    "table": "display: table", "hidden": "display: none",
+    "flex-row": "flex-direction: row", "flex-col": "flex-direction: column",
+    "flex-wrap": "flex-wrap: wrap", "flex-1": "flex: 1 1 0%", "flex-auto": "flex: 1 1 auto",
+    "flex-none": "flex: none", "flex-shrink-0": "flex-shrink: 0", "shrink-0": "flex-shrink: 0",
+    "flex-grow": "flex-grow: 1", "grow": "flex-grow: 1",
+    "items-start": "align-items: flex-start", "items-center": "align-items: center",
+    "items-end": "align-items: flex-end", "items-baseline": "align-items: baseline",
+    "items-stretch": "align-items: stretch",
+    "justify-start": "justify-content: flex-start", "justify-center": "justify-content: center",
+    "justify-end": "justify-content: flex-end", "justify-between": "justify-content: space-between",
+    "justify-around": "justify-content: space-around",
+    "self-start": "align-self: flex-start", "self-center": "align-self: center", "self-end": "align-self: flex-end",
+    "static": "position: static", "relative": "position: relative", "absolute": "position: absolute",
+    "fixed": "position: fixed", "sticky": "position: sticky",
+    "inset-0": "inset: 0px", "fill-current": "fill: currentColor",
+    "overflow-hidden": "overflow: hidden", "overflow-auto": "overflow: auto",
+    "overflow-x-auto": "overflow-x: auto", "overflow-y-auto": "overflow-y: auto",
+    "truncate": "overflow: hidden; text-overflow: ellipsis; white-space: nowrap",
+    "whitespace-nowrap": "white-space: nowrap", "whitespace-pre-wrap": "white-space: pre-wrap",
+    "break-words": "overflow-wrap: break-word",
+    "uppercase": "text-transform: uppercase", "lowercase": "text-transform: lowercase",
+    "capitalize": "text-transform: capitalize", "italic": "font-style: italic",
+    "underline": "text-decoration-line: underline", "line-through": "text-decoration-line: line-through",
+    "no-underline": "text-decoration-line: none",
+    "text-left": "text-align: left", "text-center": "text-align: center", "text-right": "text-align: right",
+    "font-mono": "font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace",
+    "cursor-pointer": "cursor: pointer", "cursor-not-allowed": "cursor: not-allowed",
+    "pointer-events-none": "pointer-events: none", "select-none": "user-select: none",
+    "resize-none": "resize: none", "outline-none": "outline: 2px solid transparent; outline-offset: 2px",
+    "border-solid": "border-style: solid", "border-dashed": "border-style: dashed",
+    "border-dotted": "border-style: dotted", "border-none": "border-style: none",
+    "aspect-square": "aspect-ratio: 1 / 1", "aspect-video": "aspect-ratio: 16 / 9",
+    "object-cover": "object-fit: cover", "list-disc": "list-style-type: disc",
+    "list-decimal": "list-style-type: decimal",
+    "min-h-screen": "min-height: 100vh", "h-screen": "height: 100vh", "w-screen": "width: 100vw",
+    "min-w-full": "min-width: 100%", "min-w-0": "min-width: 0px", "min-h-full": "min-height: 100%",
+    "transition": "transition-property: color, background-color, border-color, text-decoration-color, "
+                  "fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter; " + TRANSITION,
+    "transition-colors": "transition-property: color, background-color, border-color, "
+                         "text-decoration-color, fill, stroke; " + TRANSITION,
+    "transition-all": "transition-property: all; " + TRANSITION,
+    "sr-only": "position: absolute; width: 1px; height: 1px; padding: 0; margin: -1px; overflow: hidden; "
+               "clip: rect(0, 0, 0, 0); white-space: nowrap; border-width: 0",
+}
+
+PREFLIGHT = """*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }
+html { line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"; }
+body { margin: 0; line-height: inherit; }
+hr { height: 0; color: inherit; border-top-width: 1px; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse; }
+button, input, optgroup, select, textarea { font-family: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0; }
+button, select { text-transform: none; }
+button, [type='button'], [type='reset'], [type='submit'] { -webkit-appearance: button; background-color: transparent; background-image: none; }
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+fieldset { margin: 0; padding: 0; }
+ol, ul, menu { list-style: none; margin: 0; padding: 0; }
+textarea { resize: vertical; }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af; }
+button, [role="button"] { cursor: pointer; }
+:disabled { cursor: default; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+img, video { max-width: 100%; height: auto; }
+[hidden] { display: none; }
+"""
+
+CANDIDATE_RE = re.compile(r"[^<>\"'`\s]*[^<>\"'`\s:]")
+CLASS_ATTR_RE = re.compile(r"""class=(?:"([^"]*)"|'([^']*)')""")
+CHILD_SELECTOR = " > :not([hidden]) ~ :not([hidden])"
+
+
+def _color(value):
+    """`purple-600` or `black/50` -> CSS colour, None if not a palette colour"""
+    name, _, alpha = value.partition("/")
+    color = COLORS.get(name)
+    if color is None or not alpha:
+        return color
+    if not alpha.isdigit() or not color.startswith("#") or len(color) != 7:
+        return None
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgb({r} {g} {b} / {int(alpha) / 100:g})"
+
+
+def _sides(prefix, prop, value):
+    """p-4 / px-4 / pt-4 style side utilities"""
+    if prefix == "":
+        return f"{prop}: {value}"
+    return "; ".join(f"{prop}-{side}: {value}" for side in SIDES[prefix])
+
+
+def utility(name):
+    """Declarations for one base utility (no variants) as (declarations, child_selector)
+
+    Returns None for names that are not supported utilities.
+    """
+    if name in STATIC:
+        return STATIC[name], False
+
+    negative = name.startswith("-")
+    base = name[1:] if negative else name
+
+    m = re.fullmatch(r"([pm])([xytrbl]?)-(.+)", base)
+    if m and (m.group(3) in SPACING or (m.group(1), m.group(3), negative) == ("m", "auto", False)):
+        prop = "padding" if m.group(1) == "p" else "margin"
+        if negative and prop == "padding":
+            return None
+        value = SPACING.get(m.group(3), "auto")
+        if negative:
+            value = f"-{value}"
+        return _sides(m.group(2), prop, value), False
+
+    m = re.fullmatch(r"space-([xy])-(.+)", base)
+    if m and m.group(2) in SPACING:
+        side = "left" if m.group(1) == "x" else "top"
+        return f"margin-{side}: {SPACING[m.group(2)]}", True
+
+    m = re.fullmatch(r"gap(?:-([xy]))?-(.+)", base)
+    if m and m.group(2) in SPACING:
+        prop = {"x": "column-gap", "y": "row-gap", None: "gap"}[m.group(1)]
+        return f"{prop}: {SPACING[m.group(2)]}", False
+
+    m = re.fullmatch(r"(top|right|bottom|left)-(.+)", base)
+    if m and m.group(2) in SIZES:
+        value = SIZES[m.group(2)]
+        return f"{m.group(1)}: {'-' if negative else ''}{value}", False
+
+    if negative:
+        return None
+
+    m = re.fullmatch(r"(w|h|min-h|min-w)-(.+)", name)
+    if m and m.group(2) in SIZES:
+        prop = {"w": "width", "h": "height", "min-h": "min-height", "min-w": "min-width"}[m.group(1)]
+        return f"{prop}: {SIZES[m.group(2)]}", False
+
+    m = re.fullmatch(r"max-w-(.+)", name)
+    if m and m.group(1) in MAX_WIDTHS:
+        return f"max-width: {MAX_WIDTHS[m.group(1)]}", False
+
+    m = re.fullmatch(r"grid-cols-(\d+)", name)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return f"grid-template-columns: repeat({m.group(1)}, minmax(0, 1fr))", False
+
+    m = re.fullmatch(r"col-span-(\d+|full)", name)
+    if m:
+        span = "1 / -1" if m.group(1) == "full" else f"span {m.group(1)} / span {m.group(1)}"
+        return f"grid-column: {span}", False
+
+    m = re.fullmatch(r"z-(\d+)", name)
+    if m:
+        return f"z-index: {m.group(1)}", False
+
+    m = re.fullmatch(r"opacity-(\d+)", name)
+    if m and int(m.group(1)) <= 100:
+        return f"opacity: {int(m.group(1)) / 100:g}", False
+
+    m = re.fullmatch(r"text-(.+)", name)
+    if m:
+        if m.group(1) in FONT_SIZES:
+            size, line_height = FONT_SIZES[m.group(1)]
+            return f"font-size: {size}; line-height: {line_height}", False
+        color = _color(m.group(1))
+        if color:
+            return f"color: {color}", False
+        return None
+
+    m = re.fullmatch(r"font-(.+)", name)
+    if m and m.group(1) in FONT_WEIGHTS:
+        return f"font-weight: {FONT_WEIGHTS[m.group(1)]}", False
+
+    m = re.fullmatch(r"leading-(.+)", name)
+    if m and m.group(1) in LEADING:
+        return f"line-height: {LEADING[m.group(1)]}", False
+
+    m = re.fullmatch(r"tracking-(.+)", name)
+    if m and m.group(1) in TRACKING:
+        return f"letter-spacing: {TRACKING[m.group(1)]}", False
+
+    m = re.fullmatch(r"bg-(.+)", name)
+    if m:
+        direction = re.fullmatch(r"gradient-to-(\w+)", m.group(1))
+        if direction and direction.group(1) in GRADIENT_DIRECTIONS:
+            to = GRADIENT_DIRECTIONS[direction.group(1)]
+            return f"background-image: linear-gradient(to {to}, var(--tw-gradient-stops))", False
+        color = _color(m.group(1))
+        return (f"background-color: {color}", False) if color else None
+
+    m = re.fullmatch(r"(from|via|to)-(.+)", name)
+    if m:
+        color = _color(m.group(2))
+        if not color:
+            return None
+        if m.group(1) == "from":
+            return (f"--tw-gradient-from: {color}; --tw-gradient-to: rgb(255 255 255 / 0); "
+                    "--tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)"), False
+        if m.group(1) == "via":
+            return (f"--tw-gradient-to: rgb(255 255 255 / 0); "
+                    f"--tw-gradient-stops: var(--tw-gradient-from), {color}, var(--tw-gradient-to)"), False
+        return f"--tw-gradient-to: {color}", False
+
+    m = re.fullmatch(r"rounded(?:-([trbl]))?(?:-(.+))?", name)
+    if m and (m.group(2) or "") in RADII:
+        value = RADII[m.group(2) or ""]
+        if not m.group(1):
+            return f"border-radius: {value}", False
+        corners = {"t": ("top-left", "top-right"), "r": ("top-right", "bottom-right"),
+                   "b": ("bottom-right", "bottom-left"), "l": ("top-left", "bottom-left")}[m.group(1)]
+        return "; ".join(f"border-{c}-radius: {value}" for c in corners), False
+
+    m = re.fullmatch(r"shadow(?:-(.+))?", name)
+    if m and (m.group(1) or "") in SHADOWS:
+        return (f"--tw-shadow: {SHADOWS[m.group(1) or '']}; "
+                "box-shadow: var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)"), False
+
+    m = re.fullmatch(r"ring(?:-(\d+))?", name)
+    if m:
+        width = m.group(1) or "3"
+        return (f"--tw-ring-shadow: 0 0 0 {width}px var(--tw-ring-color, rgb(59 130 246 / 0.5)); "
+                "box-shadow: var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)"), False
+    m = re.fullmatch(r"ring-(.+)", name)
+    if m and _color(m.group(1)):
+        return f"--tw-ring-color: {_color(m.group(1))}", False
+
+    m = re.fullmatch(r"border(?:-([xytrbl]))?(?:-(0|2|4|8))?", name)
+    if m:
+        width = f"{m.group(2) or 1}px"
+        if not m.group(1):
+            return f"border-width: {width}", False
+        return "; ".join(f"border-{side}-width: {width}" for side in SIDES[m.group(1)]), False
+    m = re.fullmatch(r"border-(.+)", name)
+    if m and _color(m.group(1)):
+        return f"border-color: {_color(m.group(1))}", False
+
+    m = re.fullmatch(r"divide-([xy])(?:-(0|2|4|8))?", name)
+    if m:
+        side = "left" if m.group(1) == "x" else "top"
+        return f"border-{side}-width: {m.group(2) or 1}px", True
+    m = re.fullmatch(r"divide-(.+)", name)
+    if m and _color(m.group(1)):
+        return f"border-color: {_color(m.group(1))}", True
+
+    m = re.fullmatch(r"duration-(\d+)", name)
+    if m:
+        return f"transition-duration: {m.group(1)}ms", False
+
+    return None
+
+
+def _escape(name):
+    return re.sub(r"([^a-zA-Z0-9_-])", r"\\\1", name)
+
+
+def rule(class_name):
+    """Full CSS rule for a class with variants, as (media, order key, css), or None"""
+    *variants, base = class_name.split(":")
+    generated = utility(base)
+    if generated is None:
+        return None
+    declarations, child = generated
+    media = None
+    pseudo = ""
+    for variant in variants:
+        if variant in BREAKPOINTS and media is None:
+            media = variant
+        elif variant in PSEUDO_VARIANTS:
+            pseudo += PSEUDO_VARIANTS[variant]
+        else:
+            return None
+    selector = "." + _escape(class_name) + pseudo + (CHILD_SELECTOR if child else "")
+    # Line-height/letter-spacing must follow text-* so they win over its line-height
+    late = base.startswith(LATE_PREFIXES)
+    return media, (1 if pseudo else 0, late), f"{selector} {{ {declarations} }}"
+
+
+def extract_candidates(text):
+    """Every class-like token in a page, the same way Tailwind's scanner works"""
+    return set(CANDIDATE_RE.findall(text))
+
+
+def class_attribute_tokens(text):
+    tokens = set()
+    for double, single in CLASS_ATTR_RE.findall(text):
+        tokens.update((double or single).split())
+    return tokens
+
+
+def generate_css(candidates):
+    """Stylesheet for the supported candidates: preflight, utilities, variants, breakpoints"""
+    rules = []
+    for name in sorted(candidates):
+        generated = rule(name)
+        if generated is not None:
+            rules.append(generated)
+    breakpoint_order = list(BREAKPOINTS)
+    rules.sort(key=lambda r: (breakpoint_order.index(r[0]) + 1 if r[0] else 0, r[1], r[2]))
+
+    out = ["/* Generated by tailwind_css.py - do not edit */", PREFLIGHT]
+    current_media = None
+    for media, _, css in rules:
+        if media != current_media:
+            if current_media is not None:
+                out.append("}")
+            if media is not None:
+                out.append(f"@media (min-width: {BREAKPOINTS[media]}) {{")
+            current_media = media
+        out.append(css)
+    if current_media is not None:
+        out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def write_if_changed(path, text):
+    """Write text to path unless it already holds exactly that; True if written"""
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def build_index(pages):
+    """{page: text} -> ({class: [pages]}, all candidates, {unsupported class: [pages]})"""
+    index = {}
+    unsupported = {}
+    candidates = set()
+    for page, text in pages.items():
+        candidates |= extract_candidates(text)
+        for name in class_attribute_tokens(text):
+            target = index if rule(name) is not None else unsupported
+            target.setdefault(name, []).append(page)
+    return index, candidates, unsupported
+
+
+def link_stylesheet(text, href):
+    """Swap the CDN runtime for a local stylesheet link; None if the page can't be switched"""
+    if CDN_SCRIPT not in text or "tailwind.config" in text:
+        return None
+    return text.replace(CDN_SCRIPT, f'<link rel="stylesheet" href="{href}">')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an offline purged Tailwind stylesheet for mockups")
+    parser.add_argument("paths", nargs="+", help="HTML files or directories to scan")
+    parser.add_argument("-o", "--output", default=STYLESHEET_NAME)
+    parser.add_argument("--index", help="also write the class -> pages index as JSON")
+    parser.add_argument("--rewrite", action="store_true", help="point scanned pages at the stylesheet instead of the CDN")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.html"))) if os.path.isdir(path) else [path])
+    pages = {}
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            pages[path] = f.read()
+
+    index, candidates, unsupported = build_index(pages)
+    css = generate_css(candidates)
+    written = write_if_changed(args.output, css)
+    print(f"{args.output}: {len(index)} classes from {len(pages)} pages, "
+          f"{len(css) / 1024:.1f} KB{'' if written else ' (unchanged)'}")
+    if args.index:
+        write_if_changed(args.index, json.dumps(
+            {"classes": index, "unsupported": unsupported}, indent=2, sort_keys=True))
+    if unsupported:
+        print(f"Not generated (page CSS or unsupported, {len(unsupported)}): {' '.join(sorted(unsupported))}", file=sys.stderr)
+
+    if args.rewrite:
+        for path, text in pages.items():
+            href = os.path.relpath(args.output, os.path.dirname(path) or ".").replace(os.sep, "/")
+            linked = link_stylesheet(text, href)
+            if linked is None:
+                print(f"Skipped: {path} (no CDN script or inline tailwind.config)")
+            elif write_if_changed(path, linked):
+                print(f"Linked: {path}")
+
+
+if __name__ == "__main__":
+    main()
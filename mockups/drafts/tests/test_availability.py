@@ -0,0 +1,23 @@
+import re
+
+from availability import from_dataset, render_assignment, shift_crew
+from fixtures import Dataset
+
+
+def test_shift_crew_is_listed_as_assigned_not_busy(tmp_path):
+    ds = Dataset(0, {})
+    assignments = ds.table("ShiftAssignment")
+    shift = 0
+    rows = [assignments[i] for i in range(len(assignments)) if assignments[i].shiftId == shift]
+    crew = shift_crew(ds, shift)
+    assert set(crew) == {a.operatorId for a in rows if a.status != "CANCELLED"}
+    assert crew
+
+    path = tmp_path / "06.html"
+    render_assignment(ds, from_dataset(ds), shift, str(path), assigned=crew)
+    page = path.read_text(encoding="utf-8")
+    assert re.search(r"Assigned</dt>\s*<dd[^>]*>(\d+)<", page).group(1) == str(len(crew))
+    names = {ds.table("Operator")[op].name for op in crew}
+    for block in page.split('<div class="p-4 ')[1:]:
+        if any(name in block for name in names):
+            assert "Already booked" not in block and "✓ " in block
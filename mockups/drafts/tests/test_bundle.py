@@ -0,0 +1,50 @@
+import os
+import zipfile
+
+import bundle
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def contents(archive):
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def test_update_round_trip(tmp_path):
+    site = tmp_path / "site"
+    pages = {f"{n:02d}-page.html": f"<main>page {n}</main>\n".encode() * (n * 50 + 1) for n in range(1, 6)}
+    for name, data in pages.items():
+        write(str(site / name), data)
+    write(str(site / "css" / "tailwind.css"), b".p-4{padding:1rem}")
+    write(str(site / "01-page.html.gz"), b"sidecar")
+    archive = str(tmp_path / "site.zip")
+
+    stats = bundle.update(archive, bundle.collect(str(site), "site/", exclude=("*.gz",)))
+    assert (stats.added, stats.replaced, stats.removed) == (6, 0, 0)
+    expected = {f"site/{name}": data for name, data in pages.items()}
+    expected["site/css/tailwind.css"] = b".p-4{padding:1rem}"
+    assert contents(archive) == expected
+
+    # Nothing changed: the archive is left alone
+    mtime = os.stat(archive).st_mtime_ns
+    stats = bundle.update(archive, bundle.collect(str(site), "site/", exclude=("*.gz",)))
+    assert (stats.added, stats.replaced, stats.removed, stats.kept) == (0, 0, 0, 6)
+    assert os.stat(archive).st_mtime_ns == mtime
+
+    # Edit one page near the front, delete another and add a third
+    write(str(site / "02-page.html"), b"<main>edited</main>")
+    os.remove(str(site / "04-page.html"))
+    write(str(site / "06-page.html"), b"<main>new</main>")
+    stats = bundle.update(archive, bundle.collect(str(site), "site/", exclude=("*.gz",)))
+    assert (stats.added, stats.replaced, stats.removed) == (1, 1, 1)
+    expected["site/02-page.html"] = b"<main>edited</main>"
+    del expected["site/04-page.html"]
+    expected["site/06-page.html"] = b"<main>new</main>"
+    assert contents(archive) == expected
+
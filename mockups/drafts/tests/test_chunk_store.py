@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from chunk_store import ChunkStore
+
+
+def pages(seed):
+    """Two rounds of pages sharing a long head and nav, each with its own body"""
+    rng = random.Random(seed)
+    chrome = bytes(rng.randrange(32, 127) for _ in range(6000))
+    rounds = {}
+    for r in (1, 2):
+        for n in range(4):
+            body = bytes(rng.randrange(32, 127) for _ in range(rng.randrange(1000, 20000)))
+            rounds[f"round-{r}/{n:02d}.html"] = chrome + body + chrome[:500]
+    rounds["round-2/empty.css"] = b""
+    return rounds
+
+
+def test_round_trip_and_checkout(tmp_path):
+    root = str(tmp_path / "store")
+    source = pages(3)
+    with ChunkStore(root) as store:
+        for path, data in source.items():
+            store.put(path, data)
+        assert store.put("round-1/00.html", source["round-1/00.html"]) == 0
+        _, logical, distinct, stored, _ = store.stats()
+        assert logical == sum(map(len, source.values()))
+        assert distinct < logical - 6 * 5000  # the shared chrome is stored once
+        assert stored < distinct
+    with ChunkStore(root) as store:
+        assert {path: store.read(path) for path in store.pages} == source
+        assert store.verify() == []
+        count, total = store.checkout("round-2", str(tmp_path / "out"))
+    assert count == 5
+    for path, data in source.items():
+        if path.startswith("round-2/"):
+            assert (tmp_path / "out" / path.split("/", 1)[1]).read_bytes() == data
+
+
+def test_torn_tails_are_trimmed(tmp_path):
+    root = tmp_path / "store"
+    source = pages(5)
+    with ChunkStore(str(root)) as store:
+        for path, data in source.items():
+            store.put(path, data)
+    # An import killed mid-write: a partial chunk record and a partial recipe line
+    with open(root / "chunks.idx", "ab") as f:
+        f.write(b"\0" * 7)
+    with open(root / "pages.jsonl", "ab") as f:
+        f.write(b'{"path":"round-3/00.html","si')
+    with ChunkStore(str(root)) as store:
+        assert set(store.pages) == set(source)
+        assert store.verify() == []
+        store.put("round-3/00.html", b"<p>after</p>")
+    with ChunkStore(str(root)) as store:
+        assert store.read("round-3/00.html") == b"<p>after</p>"
+        assert store.verify() == []
+
+
+def test_older_format_is_refused(tmp_path):
+    (tmp_path / "chunks.idx").write_bytes(b"\0" * 28)
+    with pytest.raises(ValueError, match="format 1"):
+        ChunkStore(str(tmp_path))
@@ -0,0 +1,82 @@
+import random
+
+from conflicts import MAX_TRAVEL, Booking, ConflictEngine
+from travel_time import TravelMatrix
+
+PLACES = [(f"venue:{n}", 34.0 + n * 0.05, -118.3 + n * 0.07) for n in range(6)]
+
+
+def brute_force(bookings, travel):
+    """Every pair compared directly: overlaps anywhere, travel between consecutive bookings"""
+    expected = {}
+    timelines = {}
+    for booking in bookings:
+        timelines.setdefault(booking.resource, []).append(booking)
+    for line in timelines.values():
+        line.sort(key=lambda b: (b.start, b.id))
+        for i, a in enumerate(line):
+            for b in line[i + 1:]:
+                if b.start < a.end:
+                    expected["overlap", a.id, b.id] = min(a.end, b.end) - b.start
+        for a, b in zip(line, line[1:]):
+            gap = b.start - a.end
+            if 0 <= gap < MAX_TRAVEL and a.place != b.place and None not in (a.place, b.place):
+                if gap < int(travel.allowance([a.place], [b.place], [a.end])[0]):
+                    expected["travel", a.id, b.id] = gap
+    return expected
+
+
+def season(rng, count):
+    bookings = []
+    for n in range(count):
+        start = rng.randrange(0, 14 * 86400, 900)
+        bookings.append(Booking(n, ("operator", rng.randrange(12)), start, start + rng.randrange(1, 9) * 1800,
+                                place=rng.choice(PLACES)[0]))
+    return bookings
+
+
+def test_scan_matches_brute_force(tmp_path):
+    travel = TravelMatrix(str(tmp_path))
+    travel.add(PLACES)
+    bookings = season(random.Random(7), 600)
+    found = ConflictEngine(travel).load(bookings)
+    expected = brute_force(bookings, travel)
+    assert {c.key: c.seconds for c in found} == expected
+    assert {kind for kind, _, _ in expected} == {"overlap", "travel"}
+
+
+def test_moves_keep_the_conflict_set_exact(tmp_path):
+    travel = TravelMatrix(str(tmp_path))
+    travel.add(PLACES)
+    rng = random.Random(11)
+    bookings = season(rng, 300)
+    engine = ConflictEngine(travel)
+    engine.load(bookings)
+    for _ in range(200):
+        booking = rng.choice(bookings)
+        start = rng.randrange(0, 14 * 86400, 900)
+        before = set(engine.conflicts)
+        resolved, introduced = engine.move(booking.id, start, start + rng.randrange(1, 9) * 1800)
+        after = set(engine.conflicts)
+        assert {c.key for c in resolved} == before - after
+        assert {c.key for c in introduced} == after - before
+    assert {key: c.seconds for key, c in engine.conflicts.items()} == brute_force(bookings, travel)
+
+
+def test_adds_after_load_and_placeless_bookings(tmp_path):
+    travel = TravelMatrix(str(tmp_path))
+    travel.add(PLACES)
+    bookings = season(random.Random(5), 200)
+    for booking in bookings[::7]:
+        booking.place = None  # no venue: overlaps still count, travel never does
+    engine = ConflictEngine(travel)
+    engine.load(bookings)
+    first = bookings[0]
+    extra = [Booking(1000, ("vehicle", 0), 3600, 7200, PLACES[0][0]),  # a resource load() never saw
+             Booking(1001, ("vehicle", 0), 5400, 9000, PLACES[1][0]),
+             Booking(1002, first.resource, first.start, first.end + 60, PLACES[2][0])]
+    for booking in extra:
+        engine.add(booking)
+    assert {key: c.seconds for key, c in engine.conflicts.items()} == brute_force(bookings + extra, travel)
+    assert ("overlap", 1000, 1001) in engine.conflicts
+    assert {c.key for c in engine.scan()} == set(engine.conflicts)
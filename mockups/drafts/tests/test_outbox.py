@@ -0,0 +1,62 @@
+import asyncio
+
+import outbox
+from outbox import Outbox, SinkServer, build_message
+
+
+def queue(path, port, count):
+    box = Outbox(str(path), port=port, connections=4)
+    box.enqueue_many(
+        (f"sheet.{n}", f"op{n}@crew.test", build_message(f"sheet.{n}", outbox.SENDER, f"op{n}@crew.test",
+                                                         "Gig sheet", "text", "<p>html</p>"))
+        for n in range(count)
+    )
+    return box
+
+
+async def cancel_after(box, sent):
+    task = asyncio.create_task(box.run())
+    while not task.done() and box.stats["sent"] < sent:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    async with asyncio.timeout(5):  # the old run() could wait here forever
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_cancelled_run_stops_and_resumes(tmp_path):
+    async def scenario():
+        server = await SinkServer(fail_rate=0.1, seed=3).start()
+        box = queue(tmp_path / "q.sqlite", server.port, 300)
+        await cancel_after(box, 50)
+        box.close()
+        box = Outbox(str(tmp_path / "q.sqlite"), port=server.port, connections=4, backoff=0.01)
+        await box.run()
+        counts = box.counts()
+        box.close()
+        await server.stop()
+        return counts, server.received
+
+    counts, received = asyncio.run(scenario())
+    assert counts == {"sent": 300}
+    assert len(received) == 300
+
+
+def test_worker_stops_when_a_cancel_was_absorbed(tmp_path, monkeypatch):
+    # What wait_for did when the reply landed together with the cancel: the send completes
+    # and the CancelledError never reaches the worker
+    async def send(self, sender, recipient, data, on_commit=None):
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            pass
+
+    monkeypatch.setattr(outbox.SMTPConnection, "send", send)
+
+    async def scenario():
+        server = await SinkServer().start()
+        box = queue(tmp_path / "q.sqlite", server.port, 200)
+        await cancel_after(box, 20)
+        box.close()
+        await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+from payroll import DAY, NULL, Payroll
+
+HOUR = 3600
+
+
+def test_daily_overtime_split():
+    # Operator 0's day, listed out of order: 6h, a flat gig, 5h, then 3h; operator 1 works 9h the next day
+    pay = Payroll(
+        operator=[0, 0, 0, 1, 0],
+        event=[0, 0, 1, 1, 1],
+        start=[DAY + 14 * HOUR, DAY + 8 * HOUR, DAY + 7 * HOUR, 2 * DAY, DAY + 20 * HOUR],
+        hours=[500, 400, 600, 900, 300],
+        rate=[5000, NULL, 5000, 4000, 5000],
+        flat_rate=[NULL, 17500, NULL, NULL, NULL],
+    )
+    assert pay.regular.tolist() == [200, 0, 600, 800, 0]
+    assert pay.overtime.tolist() == [300, 0, 0, 100, 100]
+    assert pay.double.tolist() == [0, 0, 0, 0, 200]
+    assert pay.total.tolist() == [10000 + 22500, 17500, 30000, 32000 + 6000, 7500 + 20000]
+    assert pay.per_operator().tolist() == [32500 + 17500 + 30000 + 27500, 38000]
+    assert pay.per_event().tolist() == [32500 + 17500, 30000 + 38000 + 27500]
+    assert pay.line(0) == "$50/hr × 2h + OT $75/hr × 3h = $325.00"
+    assert pay.line(1) == "Flat Rate $175.00"
+
+
+def test_each_component_rounds_half_up():
+    pay = Payroll(operator=[0], event=[0], start=[0], hours=[150], rate=[3333], flat_rate=[NULL])
+    assert pay.total.tolist() == [5000]  # 49.995 -> 50.00
+
+
+def test_profile_rate_fills_missing_and_flags_negotiated():
+    pay = Payroll(operator=[0, 1], event=[0, 0], start=[0, 0], hours=[100, 100], rate=[NULL, 6000],
+                  flat_rate=[NULL, NULL], profile_rate=[4500, 5000])
+    assert pay.rate.tolist() == [4500, 6000]
+    assert pay.negotiated.tolist() == [False, True]
@@ -0,0 +1,42 @@
+import asyncio
+
+from png_cache import PngCache, asset_digests, linked_assets
+from rasterize import StubRenderer, rasterize_all
+
+PAGE = b"""<html><head>
+<link rel="stylesheet" href="tailwind.css">
+<link rel="stylesheet" href="https://cdn.example.com/fonts.css">
+<script src="js/app.js?v=2"></script>
+</head><body><a href="other.html">next</a><img src="data:image/png;base64,AAAA"></body></html>"""
+
+
+def test_linked_assets_are_local_files_only(tmp_path):
+    assert linked_assets(PAGE, str(tmp_path)) == [str(tmp_path / "js" / "app.js"), str(tmp_path / "tailwind.css")]
+
+
+def test_stylesheet_change_misses_the_cache(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "01.html").write_bytes(PAGE)
+    css = site / "tailwind.css"
+    css.write_text(".p-4{padding:1rem}")
+    jobs = [(str(site / "01.html"), str(tmp_path / "png" / "01.png"))]
+
+    def run():
+        cache = PngCache(str(tmp_path / "cache"))
+
+        async def go():
+            async with StubRenderer() as renderer:
+                return await rasterize_all(jobs, renderer, (160, 100), cache=cache)
+
+        assert asyncio.run(go())[0][2] is None
+        cache.save()
+        return cache.hits, cache.misses
+
+    assert run() == (0, 1)
+    assert run() == (1, 0)
+    before = asset_digests(PAGE, str(site))
+    css.write_text(".p-4{padding:1.5rem}")
+    assert asset_digests(PAGE, str(site)) != before
+    assert run() == (0, 1)
+    assert "js/app.js:missing" in before
@@ -0,0 +1,51 @@
+import gzip
+import hashlib
+import os
+
+from precompress import SIDECARS, PageWriter
+
+PAGE = b"<html>\n  <body>\n    <!-- note -->\n    <pre>  kept\n  as is</pre>\n  </body>\n</html>\n"
+
+
+def render(path, data=PAGE, previous=None, **options):
+    with PageWriter(str(path), previous=previous, **options) as out:
+        out.writelines([data[:20], data[20:]])  # split mid-tag, as streamed pages are
+    return out
+
+
+def test_minifies_and_writes_sidecars(tmp_path):
+    path = tmp_path / "page.html"
+    out = render(path)
+    data = path.read_bytes()
+    assert data == b"<html>\n<body>\n\n<pre>  kept\n  as is</pre>\n</body>\n</html>\n"
+    assert (out.size, out.digest, out.changed) == (len(data), hashlib.sha256(data).hexdigest(), True)
+    assert gzip.decompress((tmp_path / "page.html.gz").read_bytes()) == data
+    assert sorted(os.listdir(tmp_path)) == sorted(["page.html"] + [f"page.html{s}" for s in SIDECARS])
+
+
+def test_unchanged_page_is_not_rewritten(tmp_path):
+    path = tmp_path / "page.html"
+    first = render(path)
+    stamps = {name: os.stat(tmp_path / name).st_mtime_ns for name in os.listdir(tmp_path)}
+    os.utime(path, ns=(0, 1))  # so a rewrite would show even on a coarse clock
+    stamps["page.html"] = 1
+
+    again = render(path, previous=first.digest)
+    assert again.changed is False and again.digest == first.digest
+    assert {name: os.stat(tmp_path / name).st_mtime_ns for name in os.listdir(tmp_path)} == stamps
+
+    # A different page, or the same page without the digest it replaces, is written
+    assert render(path, PAGE.replace(b"kept", b"edit"), previous=first.digest).changed
+    assert render(path, previous=None).changed
+
+
+def test_missing_or_stale_sidecars_force_a_write(tmp_path):
+    path = tmp_path / "page.html"
+    first = render(path)
+    os.remove(tmp_path / "page.html.gz")
+    assert render(path, previous=first.digest).changed
+    assert (tmp_path / "page.html.gz").exists()
+
+    # Switching sidecars off removes the old ones rather than skipping
+    assert render(path, previous=first.digest, sidecars=False).changed
+    assert os.listdir(tmp_path) == ["page.html"]
@@ -0,0 +1,57 @@
+import os
+
+from page_index import Page
+from search_index import SearchIndex
+
+
+def site(tmp_path, bodies):
+    pages = []
+    for n, (title, body) in enumerate(bodies.items(), 1):
+        path = tmp_path / f"{n:02d}.html"
+        path.write_text(f"<html><head><title>{title}</title><style>.travel{{}}</style></head>"
+                        f"<body><main>{body}</main></body></html>", encoding="utf-8")
+        pages.append(Page(str(path), n, title))
+    return pages
+
+
+def titles(index, query):
+    return sorted(title for _, _, title, _, _ in index.search(query))
+
+
+def test_phrase_and_prefix_queries(tmp_path):
+    pages = site(tmp_path, {
+        "Travel Warnings": "<p>Rush hour: travel time 60-90 min</p>",
+        "Itinerary": "<p>Drive time estimate, then travel to the venue</p>",
+        "Packing List": "<p>Camera kit &amp; tripods for the venue</p>",
+    })
+    index = SearchIndex(str(tmp_path / "index"))
+    assert index.update(pages) == (3, 0)
+
+    assert titles(index, '"travel time"') == ["Travel Warnings"]
+    assert titles(index, "travel time") == ["Itinerary", "Travel Warnings"]
+    assert titles(index, "trav*") == ["Itinerary", "Travel Warnings"]
+    assert titles(index, "trip*") == ["Packing List"]
+    assert titles(index, "camera kit") == ["Packing List"]  # &amp; decodes to a non-word
+    assert titles(index, "tripod") == []  # whole words unless *
+    # The title is indexed, but a phrase never runs from it into the body
+    assert titles(index, "warnings") == ["Travel Warnings"]
+    assert titles(index, '"warnings rush"') == []
+
+
+def test_update_reads_only_changes_and_survives_reopen(tmp_path):
+    pages = site(tmp_path, {"One": "<p>alpha beta</p>", "Two": "<p>gamma</p>"})
+    root = str(tmp_path / "index")
+    index = SearchIndex(root)
+    index.update(pages)
+    assert index.update(pages) == (0, 0)
+
+    with open(pages[1].path, "a", encoding="utf-8") as f:
+        f.write("<p>alpha delta</p>")
+    os.utime(pages[1].path, ns=(0, os.stat(pages[1].path).st_mtime_ns + 1))
+    assert index.update(pages) == (1, 0)
+    assert titles(index, "alpha") == ["One", "Two"]
+    assert index.update(pages[:1]) == (0, 1)
+
+    reopened = SearchIndex(root)
+    assert titles(reopened, "alpha") == ["One"]
+    assert titles(reopened, "gamma") == []
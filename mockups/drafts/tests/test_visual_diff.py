@@ -0,0 +1,46 @@
+import numpy as np
+
+from visual_diff import diff_images, pad_to, tile_hashes
+
+
+def screenshot(height=96, width=128, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def test_identical_pair_has_no_changed_tiles():
+    img = screenshot()
+    assert not (tile_hashes(img, 32) != tile_hashes(img.copy(), 32)).any()
+    stats, mask = diff_images(img, img.copy())
+    assert (stats["tiles"], stats["changed_tiles"], stats["changed_pixels"], stats["bbox"]) == (12, 0, 0, None)
+    assert mask is None
+
+
+def test_changed_region_marks_exactly_its_tiles():
+    before = screenshot()
+    after = before.copy()
+    after[40:50, 60:70] = 255 - after[40:50, 60:70]  # straddles tiles (1, 1) and (1, 2)
+    changed = tile_hashes(before, 32) != tile_hashes(after, 32)
+    assert list(zip(*np.nonzero(changed))) == [(1, 1), (1, 2)]
+    # A tile size whose bytes are not whole 64-bit words takes the widening path
+    changed = tile_hashes(before[:90, :125], 5) != tile_hashes(after[:90, :125], 5)
+    assert list(zip(*np.nonzero(changed))) == [(8, 12), (8, 13), (9, 12), (9, 13)]
+
+    stats, mask = diff_images(before, after)
+    assert stats["changed_tiles"] == 2
+    assert stats["bbox"] == [60, 40, 70, 50]
+    assert stats["changed_pixels"] == int(mask.sum()) <= 100
+    assert mask.shape == after.shape[:2] and not mask[:40].any() and not mask[50:].any()
+
+
+def test_size_mismatch_is_padded_and_counted():
+    before = screenshot()
+    after = np.concatenate([before, np.full((20, 128, 3), 255, dtype=np.uint8)])
+    padded = pad_to(before, 128, 128)
+    assert padded.shape == (128, 128, 3)
+    assert (padded[:96] == before).all() and (padded[96:] == (255, 0, 255)).all()
+
+    stats, mask = diff_images(before, after)
+    assert stats["size_before"] == [128, 96] and stats["size_after"] == [128, 116]
+    assert stats["tiles"] == 16 and stats["changed_tiles"] == 4  # the new bottom row of tiles
+    assert stats["bbox"] == [0, 96, 128, 116]
+    assert mask.shape == (116, 128) and mask[96:].all() and not mask[:96].any()
@@ -0,0 +1,686 @@
+#!/usr/bin/env python3
+"""Cached travel-time matrix for venue and home-to-venue drive estimates
+
+Base drive minutes between every pair of known locations live in a
+memory-mapped uint16 matrix on disk, keyed by location ID. Adding locations
+computes only the new rows and columns (great-circle distance x road factor,
+vectorized over all existing locations); the file grows by doubling, copying
+the existing block instead of recomputing it.
+
+Queries are batched: ranges(origins, destinations, times) looks up base
+minutes for many legs at once and applies time-of-day congestion multipliers
+to get "25-40 min" style ranges.
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from page_helpers import clock, column, write_page
+from page_template import CompiledTemplate, Repeat
+
+CACHE_DIR = ".travel-cache"
+MATRIX_NAME = "minutes.u16"
+INDEX_NAME = "locations.json"
+ROAD_FACTOR = 1.3
+AVERAGE_KMH = 40
+# Parking and walking in, added to every leg between different places
+OVERHEAD_MINUTES = 5
+EARTH_KM = 6371.0
+ROW_BATCH = 512
+
+# (first hour, last hour, low multiplier, high multiplier, label) per day type
+CONGESTION = {
+    "weekday": [
+        (0, 6, 1.0, 1.1, None),
+        (6, 10, 1.3, 1.9, "morning rush hour"),
+        (10, 11, 1.1, 1.3, None),
+        (11, 14, 1.2, 1.5, "lunch hour traffic"),
+        (14, 15, 1.1, 1.3, None),
+        (15, 19, 1.4, 2.0, "rush hour traffic"),
+        (19, 24, 1.05, 1.25, None),
+    ],
+    "weekend": [
+        (0, 8, 1.0, 1.1, None),
+        (8, 11, 1.1, 1.5, "weekend morning traffic"),
+        (11, 18, 1.15, 1.4, "traffic variable"),
+        (18, 24, 1.05, 1.25, None),
+    ],
+}
+
+
+def _congestion_tables():
+    """[day type, hour] -> low/high multiplier arrays and label lists (0 = weekday)"""
+    low = np.ones((2, 24), dtype=np.float32)
+    high = np.ones((2, 24), dtype=np.float32)
+    labels = [[None] * 24, [None] * 24]
+    for row, name in enumerate(("weekday", "weekend")):
+        for first, last, lo, hi, label in CONGESTION[name]:
+            low[row, first:last] = lo
+            high[row, first:last] = hi
+            labels[row][first:last] = [label] * (last - first)
+    return low, high, labels
+
+
+LOW, HIGH, LABELS = _congestion_tables()
+
+
+def day_type(times):
+    """0 for weekdays, 1 for weekends (epoch day 0 was a Thursday)"""
+    weekday = (np.asarray(times, dtype=np.int64) // 86400 + 3) % 7
+    return (weekday >= 5).astype(np.intp)
+
+
+def hour_slot(when):
+    """day type * 24 + hour of day for one departure time (the allowance_table() index)"""
+    return ((when // 86400 + 3) % 7 >= 5) * 24 + when % 86400 // 3600
+
+
+def congested(base, days, hours):
+    """(low, high) minutes for base minutes under congestion, rounded out to 5 minutes"""
+    base = np.asarray(base).astype(np.float32)
+    low = np.floor(base * LOW[days, hours] / 5) * 5
+    high = np.ceil(base * HIGH[days, hours] / 5) * 5
+    return low.astype(np.int32), np.maximum(high, low).astype(np.int32)
+
+
+def drive_minutes(lat1, lng1, lat2, lng2):
+    """Free-flow minutes between broadcastable arrays of coordinates"""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lng1, lat2, lng2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    km = 2 * EARTH_KM * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+    minutes = km * ROAD_FACTOR / AVERAGE_KMH * 60
+    return np.where(km > 0.05, np.ceil(minutes) + OVERHEAD_MINUTES, 0)
+
+
+class TravelMatrix:
+    """Memory-mapped base drive minutes between locations, keyed by location ID"""
+
+    def __init__(self, root=CACHE_DIR, capacity=256):
+        self.root = root
+        self.ids = []
+        self.coords = np.zeros((0, 2), dtype=np.float64)
+        self.capacity = capacity
+        index_path = os.path.join(root, INDEX_NAME)
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            self.ids = index["ids"]
+            self.coords = np.array(index["coords"], dtype=np.float64).reshape(-1, 2)
+            self.capacity = index["capacity"]
+            matrix_path = os.path.join(root, MATRIX_NAME)
+            if not os.path.exists(matrix_path) or os.path.getsize(matrix_path) != self.capacity ** 2 * 2:
+                # Interrupted while growing: the index no longer describes the matrix
+                self.ids, self.coords = [], np.zeros((0, 2), dtype=np.float64)
+        self._index = {location: i for i, location in enumerate(self.ids)}
+        os.makedirs(root, exist_ok=True)
+        self.matrix = self._open(self.capacity)
+
+    def _open(self, capacity, path=None):
+        path = path or os.path.join(self.root, MATRIX_NAME)
+        mode = "r+" if os.path.exists(path) and os.path.getsize(path) == capacity * capacity * 2 else "w+"
+        return np.memmap(path, dtype=np.uint16, mode=mode, shape=(capacity, capacity))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, location):
+        return location in self._index
+
+    def index(self, location):
+        return self._index[location]
+
+    def indexes(self, locations):
+        return np.fromiter((self._index[location] for location in locations), dtype=np.intp)
+
+    def _grow(self, needed, known):
+        """Reallocate for `needed` locations, keeping the first `known` rows and columns"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        tmp = os.path.join(self.root, MATRIX_NAME + ".tmp")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        grown = self._open(capacity, tmp)
+        grown[:known, :known] = self.matrix[:known, :known]
+        grown.flush()
+        del self.matrix, grown
+        os.replace(tmp, os.path.join(self.root, MATRIX_NAME))
+        self.capacity = capacity
+        self.matrix = self._open(capacity)
+
+    def add(self, locations):
+        """Register [(id, lat, lng), ...]; returns how many rows were (re)computed.
+
+        Known IDs with unchanged coordinates cost nothing; new or moved
+        locations get their row and column computed against every location.
+        """
+        changed = []
+        new_coords = []
+        known = len(self.ids)
+        for location, lat, lng in locations:
+            i = self._index.get(location)
+            if i is None:
+                i = self._index[location] = len(self.ids)
+                self.ids.append(location)
+                new_coords.append((lat, lng))
+                changed.append(i)
+            elif (self.coords[i] != (lat, lng)).any():
+                self.coords[i] = (lat, lng)
+                changed.append(i)
+        if new_coords:
+            self.coords = np.concatenate([self.coords, np.array(new_coords, dtype=np.float64)])
+        if not changed:
+            return 0
+        self._grow(len(self.ids), known)
+        n = len(self.ids)
+        lat, lng = self.coords[:, 0], self.coords[:, 1]
+        for start in range(0, len(changed), ROW_BATCH):
+            rows = np.array(changed[start:start + ROW_BATCH], dtype=np.intp)
+            block = drive_minutes(lat[rows, None], lng[rows, None], lat[None, :], lng[None, :])
+            block = np.minimum(block, np.iinfo(np.uint16).max).astype(np.uint16)
+            self.matrix[rows, :n] = block
+            self.matrix[:n, rows] = block.T
+        return len(changed)
+
+    def minutes(self, origins, destinations):
+        """Base minutes for paired legs (sequences of location IDs of equal length)"""
+        return self.matrix[self.indexes(origins), self.indexes(destinations)]
+
+    def block(self, origins, destinations):
+        """Base minutes from every origin to every destination, as an origins x destinations array"""
+        return self.matrix[np.ix_(self.indexes(origins), self.indexes(destinations))]
+
+    def ranges(self, origins, destinations, times):
+        """(low, high) minutes per leg, rounded out to 5 minutes, for departures at `times`"""
+        base = self.minutes(origins, destinations)
+        times = np.broadcast_to(np.asarray(times, dtype=np.int64), base.shape)
+        return congested(base, day_type(times), (times % 86400) // 3600)
+
+    def allowance(self, origins, destinations, times):
+        """Seconds to allow per leg: the top of its ranges() estimate.
+
+        The travel warnings flag a leg when the gap is shorter than this, and the
+        conflict engine and solver use the same bound.
+        """
+        return self.ranges(origins, destinations, times)[1].astype(np.int64) * 60
+
+    def allowance_table(self, locations):
+        """allowance() between `locations` for every departure hour, as nested lists
+
+        Indexed [hour_slot(departure)][origin][destination], for callers that check
+        many legs one at a time.
+        """
+        base = self.block(locations, locations)
+        slots = np.arange(48)
+        _, high = congested(base[None], (slots // 24)[:, None, None], (slots % 24)[:, None, None])
+        return (high.astype(np.int64) * 60).tolist()
+
+    def save(self):
+        self.matrix.flush()
+        tmp = os.path.join(self.root, INDEX_NAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"capacity": self.capacity, "ids": self.ids, "coords": self.coords.tolist()}, f)
+        os.replace(tmp, os.path.join(self.root, INDEX_NAME))
+
+
+def traffic_label(when):
+    """Congestion note for a departure time, e.g. 'rush hour traffic' (or None)"""
+    return LABELS[int(day_type(when))][int(when) % 86400 // 3600]
+
+
+def format_range(low, high):
+    if high <= 0:
+        return "same venue"
+    return f"{low}-{high} min" if low != high else f"{low} min"
+
+
+def venue_id(name):
+    return f"venue:{name}"
+
+
+def home_id(operator):
+    return f"home:{operator}"
+
+
+def venue_locations(ds):
+    """[(id, lat, lng), ...] for every event venue of a fixture Dataset"""
+    events = ds.table("Event")
+    venues = {
+        (name, lat, lng)
+        for name, lat, lng in zip(
+            (events.strings[i] for i in events.column("venueName")),
+            events.column("venueLat"), events.column("venueLng"),
+        )
+    }
+    return [(venue_id(name), lat, lng) for name, lat, lng in sorted(venues)]
+
+
+def home_locations(ds, operators=None):
+    """[(id, lat, lng), ...] for operator homes (all of them by default); homeless operators are skipped"""
+    table = ds.table("Operator")
+    lats, lngs = table.column("homeLat"), table.column("homeLng")
+    if operators is None:
+        operators = range(len(lats))
+    return [(home_id(i), lats[i], lngs[i]) for i in operators if lats[i] == lats[i]]
+
+
+def register_venues(matrix, ds):
+    """Add every event venue from a fixture Dataset"""
+    return matrix.add(venue_locations(ds))
+
+
+def register_fixtures(matrix, ds):
+    """Add every event venue and operator home from a fixture Dataset"""
+    return matrix.add(venue_locations(ds) + home_locations(ds))
+
+
+def busiest_day(ds):
+    """Start (epoch seconds) of the day with the most shift starts"""
+    days = column(ds.table("Shift"), "startTime") // 86400
+    return int(np.bincount(days - days.min()).argmax() + days.min()) * 86400
+
+
+def operator_days(ds, day):
+    """{operator: [(start, end, shift, assignment), ...]} for shifts starting on `day`, sorted"""
+    shifts, assignments = ds.table("Shift"), ds.table("ShiftAssignment")
+    starts, ends = column(shifts, "startTime"), column(shifts, "endTime")
+    shift_ids = column(assignments, "shiftId")
+    on_day = np.nonzero((starts[shift_ids] >= day) & (starts[shift_ids] < day + 86400))[0]
+    cancelled = ds.enums["ShiftAssignmentStatus"].index("CANCELLED")
+    status, operators = assignments.column("status"), assignments.column("operatorId")
+    days, seen = {}, set()
+    for i in on_day.tolist():
+        shift = shift_ids[i]
+        # Duplicate rows for one operator and shift are one booking, as in the conflict engine
+        if status[i] == cancelled or (shift, operators[i]) in seen:
+            continue
+        seen.add((shift, operators[i]))
+        days.setdefault(operators[i], []).append((int(starts[shift]), int(ends[shift]), int(shift), i))
+    for bookings in days.values():
+        bookings.sort()
+    return days
+
+
+def plan_legs(ds, matrix, days):
+    """Every leg of every operator's day, resolved with one batched ranges() call.
+
+    Returns {operator: [leg, ...]} where a leg is a dict with from/to location
+    IDs, departure time, low/high minutes, available minutes and a traffic label.
+    """
+    events, shifts = ds.table("Event"), ds.table("Shift")
+    venue_names, shift_events = events.column("venueName"), shifts.column("eventId")
+
+    def venue(shift):
+        return venue_id(events.strings[venue_names[shift_events[shift]]])
+
+    legs = []
+    for operator, bookings in days.items():
+        home = home_id(operator)
+        if home not in matrix:
+            home = None
+        first = bookings[0]
+        if home:
+            legs.append((operator, home, venue(first[2]), first[0] - 3600, None))
+        for (_, end, shift, _), (start, _, next_shift, _) in zip(bookings, bookings[1:]):
+            legs.append((operator, venue(shift), venue(next_shift), end, (start - end) // 60))
+        if home:
+            last = bookings[-1]
+            legs.append((operator, venue(last[2]), home, last[1], None))
+    if not legs:
+        return {}
+    low, high = matrix.ranges([leg[1] for leg in legs], [leg[2] for leg in legs], [leg[3] for leg in legs])
+    planned = {}
+    for (operator, origin, destination, depart, available), lo, hi in zip(legs, low.tolist(), high.tolist()):
+        planned.setdefault(operator, []).append({
+            "from": origin, "to": destination, "depart": depart, "low": lo, "high": hi,
+            "available": available, "traffic": traffic_label(depart) if hi else None,
+        })
+    return planned
+
+
+def assess(legs):
+    """'critical', 'caution' or 'info' for an operator's day, plus the reasons"""
+    level, reasons = "info", []
+    for leg in legs:
+        if leg["available"] is not None and leg["available"] < 0:
+            level = "critical"
+            reasons += [f"Shifts overlap by {_hours(-leg['available'])}", "Impossible to attend both shifts"]
+        elif leg["available"] is not None and leg["available"] < leg["high"]:
+            level = "critical"
+            reasons += [f"Only {_hours(leg['available'])} between shifts",
+                        f"{format_range(leg['low'], leg['high'])} travel time required",
+                        "High risk of late arrival", "Consider: reassign or adjust times"]
+        elif leg["traffic"] and leg["high"] - leg["low"] >= 15 and level == "info":
+            level = "caution"
+            reasons.append(f"{leg['traffic'].capitalize()} on this route")
+    return level, reasons
+
+
+WARNINGS_PAGE = CompiledTemplate('''
+        <div class="mb-6">
+            <h2 class="text-2xl font-bold text-gray-900">Travel Time Analysis</h2>
+            <p class="text-gray-600 mt-1">{day} • {summary}</p>
+        </div>
+
+        <div class="space-y-6">{cards}
+        </div>
+''')
+WARNING_CARD = CompiledTemplate('''
+            <div class="bg-white rounded-lg shadow p-6 border-l-4 {border}">
+                <div class="flex items-start justify-between">
+                    <div>
+                        <div class="flex items-center mb-2">
+                            <div class="w-10 h-10 {avatar} rounded-full flex items-center justify-center font-semibold mr-3">{initials}</div>
+                            <div>
+                                <div class="font-semibold text-gray-900">{name}</div>
+                                <div class="text-sm text-gray-600">{subtitle}</div>
+                            </div>
+                        </div>
+
+                        <div class="ml-13 mt-3 space-y-2 text-sm">{stops}
+                        </div>
+
+                        <div class="mt-3 p-3 {box}">
+                            <div class="text-sm {tone}">
+                                <div class="font-medium">{headline}</div>{reasons}
+                            </div>
+                        </div>
+                    </div>{action}
+                </div>
+            </div>
+''')
+LEVEL_STYLES = {
+    "critical": ("border-red-400", "bg-red-50 border border-red-200 rounded", "text-red-700", "🔴 Alert: Very tight schedule"),
+    "caution": ("border-yellow-400", "bg-yellow-50 rounded", "text-yellow-700", "🟡 Caution: Traffic possible"),
+    "info": ("border-blue-400", "bg-blue-50 rounded", "text-blue-700", "🔵 Info: Reasonable schedule"),
+}
+AVATARS = ["bg-purple-200 text-purple-700", "bg-pink-200 text-pink-700", "bg-blue-200 text-blue-700"]
+RESOLVE = (b'\n                    <button class="px-4 py-2 border border-red-300 bg-red-50 text-red-700 '
+           b'rounded-lg text-sm hover:bg-red-100">Resolve Conflict</button>')
+
+
+def _place(location, ds):
+    kind, _, name = location.partition(":")
+    if kind == "home":
+        return f"🏠 Home ({html.escape(ds.table('Operator')[int(name)].homeAddress or 'unknown')})"
+    return f"📍 {html.escape(name)}"
+
+
+def _stops(ds, bookings, legs):
+    """Alternating place and travel lines for one operator's day"""
+    lines = []
+    leg_iter = iter(legs)
+    leg = next(leg_iter, None)
+    if leg and leg["from"].startswith("home:"):
+        lines.append(_place(leg["from"], ds))
+        lines.append(f'<div class="ml-4 text-gray-600">↓ {_leg_text(leg)}</div>')
+        leg = next(leg_iter, None)
+    for n, (start, end, _, _) in enumerate(bookings):
+        where = leg["from"] if leg and not leg["from"].startswith("home:") else None
+        if where is None:
+            where = legs[-1]["from"] if legs else "venue:?"
+        lines.append(f"{_place(where, ds)} ({clock(start)} - {clock(end)} shift)")
+        if leg and n < len(bookings) - 1:
+            lines.append(f'<div class="ml-4 text-gray-600">↓ {_leg_text(leg)}</div>')
+            leg = next(leg_iter, None)
+    return "".join(
+        f"\n                            {line if line.startswith('<div') else f'<div>{line}</div>'}" for line in lines
+    )
+
+
+def _leg_text(leg):
+    if not leg["high"]:
+        gap = leg["available"]
+        return f"({_hours(gap)} break, same venue)" if gap and gap > 0 else "(same venue)"
+    text = format_range(leg["low"], leg["high"])
+    return f"{text} ({leg['traffic']})" if leg["traffic"] else text
+
+
+def _day_label(day):
+    return datetime.fromtimestamp(day, timezone.utc).strftime("%A, %B %d").replace(" 0", " ")
+
+
+def render_travel_warnings(ds, matrix, day, path, limit=50):
+    """25-travel-time-warnings for every operator working on `day`, tightest schedules first"""
+    days = operator_days(ds, day)
+    planned = plan_legs(ds, matrix, days)
+    order = {"critical": 0, "caution": 1, "info": 2}
+    assessed = sorted(
+        ((assess(planned.get(operator, [])), operator) for operator in days),
+        key=lambda item: (order[item[0][0]], item[1]),
+    )
+    operators = ds.table("Operator")
+    counts = {level: sum(1 for (lvl, _), _ in assessed if lvl == level) for level in order}
+
+    def cards():
+        for (level, reasons), operator in assessed[:limit]:
+            person = operators[operator]
+            border, box, tone, headline = LEVEL_STYLES[level]
+            bookings = days[operator]
+            yield WARNING_CARD.bind(
+                border=border, avatar=AVATARS[operator % len(AVATARS)],
+                initials="".join(part[0] for part in person.name.split()[:2]),
+                name=html.escape(person.name),
+                subtitle=f"{len(bookings)} shift{'s' if len(bookings) != 1 else ''}, "
+                         f"{clock(bookings[0][0])} - {clock(bookings[-1][1])}",
+                stops=_stops(ds, bookings, planned.get(operator, [])),
+                box=box, tone=tone, headline=headline,
+                reasons="".join(f'\n                                <div class="text-xs mt-1">• {html.escape(r)}</div>'
+                                for r in reasons),
+                action=RESOLVE if level == "critical" else b"",
+            )
+
+    write_page(path, "Travel Time Warnings", WARNINGS_PAGE.bind(
+        day=_day_label(day),
+        summary=f"{len(days)} operators • {counts['critical']} critical, {counts['caution']} caution",
+        cards=Repeat(cards()),
+    ))
+    return len(days)
+
+
+ITINERARY_PAGE = CompiledTemplate('''
+        <div class="max-w-3xl mx-auto">
+            <h2 class="text-2xl font-bold text-gray-900 mb-6">Travel Itinerary - {name}</h2>
+
+            <div class="bg-white rounded-lg shadow p-6">
+                <div class="space-y-6">{steps}
+                </div>
+
+                <div class="mt-6 pt-6 border-t border-gray-200">
+                    <div class="text-sm text-gray-600">
+                        <div class="font-semibold text-gray-900 mb-2">Summary</div>
+                        <div>Total Work Time: {work}</div>
+                        <div>Total Travel Time: ~{travel}</div>
+                        <div>Estimated Day Length: {length}</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+''')
+ITINERARY_STEP = CompiledTemplate('''
+                    <div class="flex items-start">
+                        <div class="text-3xl mr-4">{icon}</div>
+                        <div class="flex-1">
+                            <div class="font-semibold text-gray-900">{heading}</div>{body}
+                        </div>
+                    </div>
+''')
+
+
+def _hours(minutes):
+    hours, minutes = divmod(int(minutes), 60)
+    if not minutes:
+        return f"{hours} hour{'s' if hours != 1 else ''}"
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes} min"
+
+
+def _traffic_note(leg):
+    if not leg["traffic"]:
+        return ""
+    colour, badge = ("text-red-600", "🔴 Alert") if "rush" in leg["traffic"] else ("text-yellow-600", "🟡 Caution")
+    return f'\n                                <div class="{colour} mt-1">{badge}: {leg["traffic"].capitalize()}</div>'
+
+
+def render_itinerary(ds, matrix, operator, day, path):
+    """19-gig-sheet-travel-itinerary for one operator's day"""
+    bookings = operator_days(ds, day).get(operator)
+    if not bookings:
+        raise ValueError(f"operator {operator} has no shifts on {_day_label(day)}")
+    legs = plan_legs(ds, matrix, {operator: bookings})[operator]
+    person = ds.table("Operator")[operator]
+    events, shifts, assignments = ds.table("Event"), ds.table("Shift"), ds.table("ShiftAssignment")
+    home = legs[0] if legs and legs[0]["from"].startswith("home:") else None
+    between = [leg for leg in legs if leg["available"] is not None]
+    steps = []
+    if home:
+        leave = bookings[0][0] - home["high"] * 60
+        steps.append(ITINERARY_STEP.bind(
+            icon="🏠", heading=f"{clock(leave)} - Leave Home",
+            body=f'\n                            <div class="text-sm text-gray-600">{html.escape(person.homeAddress or "")}</div>'
+                 f'\n                            <div class="mt-2 text-sm">'
+                 f'\n                                <div class="text-gray-600">↓ {_leg_text(home)}</div>{_traffic_note(home)}'
+                 f'\n                            </div>',
+        ))
+    for n, (start, end, shift, assignment) in enumerate(bookings):
+        event = events[shifts[shift].eventId]
+        job = assignments[assignment]
+        hours = (end - start) / 3600
+        if job.payType == "FLAT":
+            pay = f"Flat Rate ${job.flatRate / 100:,.0f}"
+        else:
+            pay = f"${job.hourlyRate / 100:,.0f}/hr × {hours:g}h = ${job.hourlyRate * hours / 100:,.0f}"
+        steps.append(ITINERARY_STEP.bind(
+            icon="📍", heading=f"{clock(start)} - Shift {n + 1} ({job.role.title()})",
+            body=f'\n                            <div class="text-sm text-gray-600">{html.escape(event.venueName)}</div>'
+                 f'\n                            <div class="text-sm text-gray-600">{html.escape(event.venueAddress)}</div>'
+                 f'\n                            <div class="mt-2 p-3 bg-blue-50 rounded">'
+                 f'\n                                <div class="text-sm text-blue-900">Work: {clock(start)} - {clock(end)} ({_hours((end - start) // 60)})</div>'
+                 f'\n                                <div class="text-sm text-blue-700">Pay: {pay}</div>'
+                 f'\n                            </div>',
+        ))
+        if n < len(between):
+            leg = between[n]
+            gap = leg["available"]
+            if gap < 0:
+                text = f"Overlaps the next shift by {_hours(-gap)}"
+                icon = "⚠️"
+            elif leg["high"]:
+                text = f"{_hours(gap)} to travel • {_leg_text(leg)}"
+                icon = "🚗"
+            else:
+                text = f"{_hours(gap)} break" if gap else "No break"
+                icon = "⏸️"
+            steps.append(ITINERARY_STEP.bind(
+                icon=icon, heading=f"{clock(end)} - {'Travel' if leg['high'] else 'Break'}",
+                body=f'\n                            <div class="text-sm text-gray-600">{text}</div>'
+                     + ('\n                            <div class="text-red-600 text-sm mt-1">🔴 Alert: Not enough time to get there</div>'
+                        if leg["high"] and gap < leg["high"] else ""),
+            ))
+    last = legs[-1] if legs and legs[-1]["to"].startswith("home:") else None
+    if last:
+        steps.append(ITINERARY_STEP.bind(
+            icon="🏠", heading=f"{clock(bookings[-1][1])} - Head Home",
+            body=f'\n                            <div class="text-sm text-gray-600">↓ {_leg_text(last)}</div>'
+                 + _traffic_note(last).replace("mt-1", "text-sm mt-1"),
+        ))
+
+    work = sum(end - start for start, end, _, _ in bookings) // 60
+    travel = sum((leg["low"] + leg["high"]) // 2 for leg in legs)
+    length = (bookings[-1][1] - bookings[0][0]) // 60 + sum(
+        (leg["low"] + leg["high"]) // 2 for leg in (home, last) if leg)
+    write_page(path, "Travel Itinerary", ITINERARY_PAGE.bind(
+        name=html.escape(person.name), steps=Repeat(steps),
+        work=_hours(work), travel=_hours(travel), length=_hours(length),
+    ))
+    return len(bookings)
+
+
+def bench(matrix, count, seed=0):
+    """Time a bulk load of `count` random LA-area locations, then one incremental venue"""
+    rng = np.random.default_rng(seed)
+    lat = 34.05 + rng.uniform(-0.5, 0.5, count)
+    lng = -118.25 + rng.uniform(-0.6, 0.6, count)
+    start = time.perf_counter()
+    matrix.add((f"bench:{i}", a, b) for i, (a, b) in enumerate(zip(lat.tolist(), lng.tolist())))
+    loaded = time.perf_counter()
+    matrix.add([(f"bench:new:{len(matrix)}", 34.1, -118.3)])
+    added = time.perf_counter()
+    ids = matrix.ids
+    picks = rng.integers(0, len(ids), size=(2, 100_000))
+    origins, destinations = [ids[i] for i in picks[0]], [ids[i] for i in picks[1]]
+    when = rng.integers(1_740_000_000, 1_760_000_000, size=100_000)
+    queried = time.perf_counter()
+    matrix.ranges(origins, destinations, when)
+    done = time.perf_counter()
+    print(f"{count} locations in {loaded - start:.2f}s, +1 venue in {(added - loaded) * 1000:.1f} ms, "
+          f"100k leg ranges in {(done - queried) * 1000:.0f} ms; matrix {matrix.capacity}^2 "
+          f"({matrix.capacity ** 2 * 2 / 2 ** 20:.0f} MB on disk)")
+
+
+def main(argv=None):
+    from fixtures import Dataset, parse_count
+
+    parser = argparse.ArgumentParser(description="Build or query the cached travel-time matrix")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--seed", type=int, default=0, help="fixture seed for --fixtures")
+    parser.add_argument("--fixtures", action="store_true", help="register fixture venues and operator homes")
+    parser.add_argument("--count", type=parse_count, action="append", default=[], metavar="MODEL=N",
+                        help="fixture row counts")
+    parser.add_argument("--render", metavar="DIR", help="write the travel warnings and itinerary pages for --day")
+    parser.add_argument("--day", help="YYYY-MM-DD to render (default: the busiest fixture day)")
+    parser.add_argument("--operator", type=int, help="operator for the itinerary page (default: busiest that day)")
+    parser.add_argument("--bench", type=int, metavar="N", help="time adding N random locations and batch queries")
+    parser.add_argument("legs", nargs="*", metavar="FROM:TO", help="location ID pairs to query, e.g. home:3:venue:Alex Theatre")
+    parser.add_argument("--at", type=int, default=None, help="departure time (epoch seconds) for the queried legs")
+    args = parser.parse_args(argv)
+
+    matrix = TravelMatrix(args.cache_dir)
+    if args.fixtures or args.render:
+        ds = Dataset(args.seed, dict(args.count))
+        computed = register_fixtures(matrix, ds)
+        print(f"{len(matrix)} locations ({computed} computed)")
+    if args.bench:
+        bench(matrix, args.bench, args.seed)
+    if args.legs:
+        pairs = []
+        for leg in args.legs:
+            parts = leg.split(":")
+            pairs.append((":".join(parts[:2]), ":".join(parts[2:])))
+        when = args.at if args.at is not None else int(time.time())
+        try:
+            low, high = matrix.ranges([a for a, _ in pairs], [b for _, b in pairs], when)
+        except KeyError as e:
+            sys.exit(f"Unknown location: {e.args[0]}")
+        for (a, b), lo, hi in zip(pairs, low, high):
+            label = traffic_label(when) if hi else None
+            print(f"{a} -> {b}: {format_range(lo, hi)}" + (f" ({label})" if label else ""))
+    if args.render:
+        if args.day:
+            day = int(datetime.strptime(args.day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+        else:
+            day = busiest_day(ds)
+        path = os.path.join(args.render, "25-travel-time-warnings.html")
+        people = render_travel_warnings(ds, matrix, day, path)
+        print(f"Created: {path} ({people} operators on {_day_label(day)})")
+        operator = args.operator
+        if operator is None:
+            days = operator_days(ds, day)
+            operator = max(sorted(days), key=lambda op: len(days[op]), default=None)
+        if operator is not None:
+            path = os.path.join(args.render, "19-gig-sheet-travel-itinerary.html")
+            render_itinerary(ds, matrix, operator, day, path)
+            print(f"Created: {path} (operator {operator})")
+    matrix.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Visual regression diffs between two sets of mockup screenshots
+
+Each screenshot is cut into square tiles and every tile is reduced to a
+64-bit hash in one vectorized pass. Tiles whose hashes match are skipped;
+only changed tiles get the perceptual (YIQ colour distance) comparison.
+Writes a highlighted diff PNG for every pair that changed plus summary.json.
+
+Decoding uses Pillow when it is installed and falls back to png_io.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from png_io import decode_png, encode_png
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Max YIQ delta between two colours (black vs white); thresholds scale it
+MAX_YIQ_DELTA = 35215.0
+_rng = np.random.default_rng(0x5EED)
+_TILE_WEIGHTS = {}
+
+
+def load_rgb(path):
+    """PNG -> HxWx3 uint8 array (alpha composited onto white)"""
+    if Image is not None:
+        with Image.open(path) as im:
+            if im.mode in ("RGBA", "LA", "P"):
+                im = im.convert("RGBA")
+            else:
+                im = im.convert("RGB")
+            arr = np.asarray(im)
+    else:
+        with open(path, "rb") as f:
+            width, height, channels, pixels = decode_png(f.read())
+        arr = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, channels)
+        if channels in (1, 2):
+            grey = arr[..., :1]
+            arr = np.concatenate([grey, grey, grey] + ([arr[..., 1:]] if channels == 2 else []), axis=-1)
+    if arr.shape[-1] == 4:
+        alpha = arr[..., 3:].astype(np.float32) / 255
+        arr = (arr[..., :3] * alpha + 255 * (1 - alpha)).astype(np.uint8)
+    return np.ascontiguousarray(arr)
+
+
+def pad_to(img, height, width, fill=(255, 0, 255)):
+    """Pad to height x width; padding is magenta so size changes always count as changed"""
+    h, w, _ = img.shape
+    if (h, w) == (height, width):
+        return img
+    out = np.empty((height, width, 3), dtype=np.uint8)
+    out[:h, :w] = img
+    out[h:] = fill
+    out[:h, w:] = fill
+    return out
+
+
+def tiles_view(img, tile):
+    """(rows, cols, tile, tile, 3) view of an image padded to whole tiles"""
+    h, w, _ = img.shape
+    return img.reshape(h // tile, tile, w // tile, tile, 3).swapaxes(1, 2)
+
+
+def tile_hashes(img, tile):
+    """One uint64 per tile: tile bytes as 64-bit words dotted with fixed odd weights"""
+    rows, cols = img.shape[0] // tile, img.shape[1] // tile
+    words = tile * tile * 3
+    tiles = np.ascontiguousarray(tiles_view(img, tile)).reshape(rows, cols, words)
+    if words % 8 == 0:
+        tiles = tiles.view(np.uint64)
+    else:
+        tiles = tiles.astype(np.uint64)
+    n = tiles.shape[-1]
+    weights = _TILE_WEIGHTS.get(n)
+    if weights is None:
+        weights = _TILE_WEIGHTS[n] = _rng.integers(1, 2 ** 63, size=n, dtype=np.uint64) | np.uint64(1)
+    with np.errstate(over="ignore"):
+        return (tiles * weights).sum(axis=-1, dtype=np.uint64)
+
+
+def yiq_delta(a, b):
+    """Perceptual colour distance per pixel (the YIQ metric used by pixelmatch)"""
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    d = a - b
+    y = d @ np.array([0.29889531, 0.58662247, 0.11448223], dtype=np.float32)
+    i = d @ np.array([0.59597799, -0.27417610, -0.32180189], dtype=np.float32)
+    q = d @ np.array([0.21147017, -0.52261711, 0.31114694], dtype=np.float32)
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def diff_images(before, after, tile=32, threshold=0.1):
+    """Compare two HxWx3 arrays; returns (stats dict, changed-pixel mask or None)"""
+    height = -(-max(before.shape[0], after.shape[0]) // tile) * tile
+    width = -(-max(before.shape[1], after.shape[1]) // tile) * tile
+    a = pad_to(before, height, width)
+    b = pad_to(after, height, width)
+
+    changed_tiles = tile_hashes(a, tile) != tile_hashes(b, tile)
+    stats = {
+        "size_before": list(before.shape[:2][::-1]),
+        "size_after": list(after.shape[:2][::-1]),
+        "tiles": int(changed_tiles.size),
+        "changed_tiles": int(changed_tiles.sum()),
+        "changed_pixels": 0,
+        "changed_ratio": 0.0,
+        "bbox": None,
+    }
+    if not stats["changed_tiles"]:
+        return stats, None
+
+    tile_rows, tile_cols = np.nonzero(changed_tiles)
+    ta = tiles_view(a, tile)[tile_rows, tile_cols]
+    tb = tiles_view(b, tile)[tile_rows, tile_cols]
+    differs = yiq_delta(ta, tb) > MAX_YIQ_DELTA * threshold * threshold
+
+    mask = np.zeros((height, width), dtype=bool)
+    mask_tiles = mask.reshape(height // tile, tile, width // tile, tile).swapaxes(1, 2)
+    mask_tiles[tile_rows, tile_cols] = differs
+
+    count = int(differs.sum())
+    stats["changed_pixels"] = count
+    stats["changed_ratio"] = round(count / (before.shape[0] * before.shape[1] or 1), 6)
+    if count:
+        ys, xs = np.nonzero(mask)
+        stats["bbox"] = [int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1]
+    return stats, mask[:after.shape[0], :after.shape[1]] if count else None
+
+
+def highlight(after, mask):
+    """Faded greyscale of the new screenshot with changed pixels in red"""
+    grey = after.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    faded = (255 - (255 - grey) * 0.3).astype(np.uint8)
+    out = np.repeat(faded[..., None], 3, axis=2)
+    out[mask] = (230, 30, 30)
+    return out
+
+
+def compare_pair(job):
+    """Worker: diff one (name, before, after, diff_png, tile, threshold) job"""
+    name, before_path, after_path, diff_path, tile, threshold = job
+    try:
+        with open(before_path, "rb") as f:
+            before_bytes = f.read()
+        with open(after_path, "rb") as f:
+            if f.read() == before_bytes:
+                # Byte-identical files (e.g. served from the PNG cache) need no decode at all
+                return name, {"identical": True, "changed_pixels": 0}, None
+        after = load_rgb(after_path)
+        stats, mask = diff_images(load_rgb(before_path), after, tile, threshold)
+        if mask is not None:
+            image = highlight(after, mask)
+            os.makedirs(os.path.dirname(diff_path) or ".", exist_ok=True)
+            with open(diff_path, "wb") as f:
+                f.write(encode_png(image.shape[1], image.shape[0], (row.tobytes() for row in image), level=1))
+            stats["diff"] = diff_path
+        return name, stats, None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def pair_up(before, after):
+    """Match PNGs by path relative to each root (or a single pair of files)"""
+    if os.path.isfile(before) and os.path.isfile(after):
+        return [(os.path.basename(after), before, after)], [], []
+    def index(root):
+        return {
+            os.path.relpath(p, root): p
+            for p in glob.glob(os.path.join(root, "**", "*.png"), recursive=True)
+        }
+    old, new = index(before), index(after)
+    pairs = [(name, old[name], new[name]) for name in sorted(old.keys() & new.keys())]
+    return pairs, sorted(old.keys() - new.keys()), sorted(new.keys() - old.keys())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two sets of mockup screenshots")
+    parser.add_argument("before", help="PNG file or directory of PNGs")
+    parser.add_argument("after", help="PNG file or directory of PNGs")
+    parser.add_argument("-o", "--out-dir", default="png-diff")
+    parser.add_argument("--tile", type=int, default=32, help="tile edge in pixels")
+    parser.add_argument("--threshold", type=float, default=0.1, help="per-pixel colour tolerance, 0-1")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    pairs, removed, added = pair_up(args.before, args.after)
+    jobs = [
+        (name, b, a, os.path.join(args.out_dir, os.path.splitext(name)[0] + ".diff.png"), args.tile, args.threshold)
+        for name, b, a in pairs
+    ]
+    start = time.perf_counter()
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(compare_pair, jobs))
+    else:
+        results = [compare_pair(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    summary = {"pages": {}, "removed": removed, "added": added, "errors": {}}
+    changed = 0
+    for name, stats, error in results:
+        if error:
+            summary["errors"][name] = error
+            print(f"Failed: {name} ({error})")
+        elif stats["changed_pixels"]:
+            changed += 1
+            summary["pages"][name] = stats
+            print(f"Changed: {name} ({stats['changed_tiles']}/{stats['tiles']} tiles, "
+                  f"{stats['changed_ratio']:.2%} of pixels)")
+        else:
+            summary["pages"][name] = stats
+    os.makedirs(args.out_dir, exist_ok=True)
+    with open(os.path.join(args.out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+
+    print(f"\n{changed} of {len(pairs)} screenshots changed in {elapsed:.2f}s"
+          f" ({len(added)} added, {len(removed)} removed)")
+    if summary["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
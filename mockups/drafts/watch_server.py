@@ -0,0 +1,184 @@
+"""Watch mode: poll sources, rebuild incrementally, live-reload open browser tabs
+
+Sources are polled with os.scandir/stat (no extra dependencies). A burst of
+saves is debounced into a single rebuild, and the pages it rewrote are pushed
+over Server-Sent Events to every open tab, which reloads only if it is
+showing one of them (or the shared stylesheet changed).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RELOAD_PATH = "/__livereload"
+BOOT_ID = str(time.time_ns())
+RELOAD_SCRIPT = b"""<script>(function () {
+    var boot = null;
+    var es = new EventSource("%s");
+    es.addEventListener("hello", function (e) {
+        if (boot !== null && boot !== e.data) location.reload();
+        boot = e.data;
+    });
+    es.onmessage = function (e) {
+        var changed = JSON.parse(e.data);
+        var page = decodeURIComponent(location.pathname.split("/").pop()) || "index.html";
+        if (changed.indexOf(page) >= 0 || changed.indexOf("tailwind.css") >= 0) location.reload();
+    };
+})();</script>
+""" % RELOAD_PATH.encode()
+
+
+class ReloadHub:
+    """Hands the latest list of changed files to every waiting SSE client"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.version = 0
+        self.changed = []
+
+    def publish(self, changed):
+        with self._cond:
+            self.version += 1
+            self.changed = list(changed)
+            self._cond.notify_all()
+
+    def wait(self, seen, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != seen, timeout)
+            return self.version, self.changed
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    hub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self.stream_events()
+        elif self.path.split("?")[0].endswith((".html", "/")):
+            self.send_html()
+        else:
+            super().do_GET()
+
+    def send_html(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        marker = body.rfind(b"</body>")
+        body = body[:marker] + RELOAD_SCRIPT + body[marker:] if marker >= 0 else body + RELOAD_SCRIPT
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        seen = self.hub.version
+        try:
+            self.wfile.write(f"retry: 250\nevent: hello\ndata: {BOOT_ID}\n\n".encode())
+            self.wfile.flush()
+            while True:
+                version, changed = self.hub.wait(seen, timeout=15)
+                if version == seen:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    seen = version
+                    self.wfile.write(f"data: {json.dumps(changed)}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def snapshot(paths):
+    """{path: (size, mtime_ns)} for the watched files and the files in watched dirs"""
+    state = {}
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        state[entry.path] = (st.st_size, st.st_mtime_ns)
+        else:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_size, st.st_mtime_ns)
+    return state
+
+
+def wait_for_change(paths, last, interval=0.05, debounce=0.05):
+    """Block until `paths` change, then until they stay quiet for `debounce` seconds"""
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        if current != last:
+            break
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < debounce:
+        time.sleep(interval / 2)
+        latest = snapshot(paths)
+        if latest != current:
+            current = latest
+            quiet_since = time.monotonic()
+    changed = {p for p in current.keys() | last.keys() if current.get(p) != last.get(p)}
+    return current, changed
+
+
+def serve(directory, hub, port):
+    handler = partial(LiveReloadHandler, directory=directory)
+    LiveReloadHandler.hub = hub
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch_and_serve(rebuild, watched, port=8000, directory="."):
+    """Serve `directory` and call rebuild() -> [changed files] whenever `watched` changes.
+
+    A rebuild that raises is reported and skipped; the server and the watch keep going.
+
+    Editing a watched .py file (the generator holding base_template) restarts
+    the process; open tabs reconnect, see a new boot id and reload.
+    """
+    hub = ReloadHub()
+    serve(directory, hub, port)
+    print(f"\nServing {os.path.abspath(directory)} at http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    state = snapshot(watched)
+    try:
+        while True:
+            state, changed = wait_for_change(watched, state)
+            if any(path.endswith(".py") for path in changed):
+                print("Generator changed, restarting...")
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            start = time.perf_counter()
+            try:
+                rebuilt = rebuild()
+            except Exception as e:
+                # Usually a half-saved or malformed source; keep serving and wait for the next save
+                print(f"Build failed: {type(e).__name__}: {e}")
+                continue
+            print(f"Rebuilt {len(rebuilt)} file(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+            if rebuilt:
+                hub.publish(rebuilt)
+    except KeyboardInterrupt:
+        pass